@@ -0,0 +1,61 @@
+# ===================== BENCHMARK: GRÁFICO DO PDF =====================
+# Compara o gráfico vetorial (reportlab.graphics) com o PNG do matplotlib em
+# diferentes dpi: tempo de renderização do gráfico, tempo total da proposta e
+# tamanho final do PDF.
+#
+# Uso: python benchmarks/bench_grafico.py [--n 10]
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CENARIOS = [("vetor", None), ("png", 100), ("png", 150), ("png", 300)]
+
+
+def _logo_local():
+    from PIL import Image as PILImage
+    caminho = os.path.join(tempfile.mkdtemp(prefix="bench_logo_"), "logo.png")
+    PILImage.new("RGB", (800, 200), "white").save(caminho)
+    return caminho
+
+
+def _mediana(funcao, n):
+    tempos, retorno = [], None
+    for _ in range(n):
+        inicio = time.perf_counter()
+        retorno = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), retorno
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=10, help="repetições por cenário")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("CDB_LOGO_PATH", _logo_local())
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from motor_calculo import EntradaSimulacao
+    from proposta_pdf import _renderizar_grafico, criar_pdf_perfeito, montar_proposta
+
+    entrada = EntradaSimulacao(500000.0, "CDB Pós-fixado (% do CDI)", datetime.date(2025, 1, 2),
+                               datetime.date(2030, 1, 2), perc_cdi=110.0)
+    proposta = montar_proposta("CLI_001", "João Silva", "Assessor", datetime.date(2025, 1, 2), entrada)
+    criar_pdf_perfeito(proposta)  # aquecimento (imports, fontes, template, logo)
+
+    print(f"{'gráfico':<10}{'dpi':>6}{'gráfico (ms)':>15}{'PDF (ms)':>12}{'PDF (KB)':>11}")
+    for modo, dpi in CENARIOS:
+        t_grafico, _ = _mediana(lambda: _renderizar_grafico(proposta, modo, dpi), args.n)
+        t_pdf, pdf = _mediana(lambda: criar_pdf_perfeito(proposta, modo_grafico=modo, dpi=dpi), args.n)
+        print(f"{modo:<10}{dpi or '-':>6}{t_grafico * 1000:>15.1f}{t_pdf * 1000:>12.1f}{len(pdf) / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
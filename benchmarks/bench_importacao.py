@@ -0,0 +1,80 @@
+# ===================== BENCHMARK: PARTIDA A FRIO (python -X importtime) =====================
+# Mede o tempo de importação de cada ponto de entrada em um processo novo e
+# verifica que as dependências pesadas só são carregadas no caminho que as usa.
+#
+# Orçamento do caminho sem interface (motor_calculo): ORCAMENTO_MS abaixo, e
+# nenhuma importação de numpy, matplotlib, reportlab, PIL, requests ou streamlit.
+# grafico e proposta_pdf/lote_propostas não podem carregar matplotlib ao serem
+# importados (só na primeira renderização).
+#
+# Uso: python benchmarks/bench_importacao.py [--n 5]
+#      (sai com código 1 se algum orçamento ou restrição for violado)
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PESADOS = ("numpy", "matplotlib", "reportlab", "PIL", "requests", "streamlit", "pandas", "pyarrow")
+
+# modulo -> (orçamento em ms, dependências pesadas permitidas)
+CENARIOS = {
+    "motor_calculo": (40, ()),
+    "calendario": (10, ()),
+    "moeda": (10, ()),
+    "nomes_arquivo": (10, ()),       # nome do download na página, sem reportlab
+    "lote_propostas": (80, ()),      # multiprocessing/logging da stdlib
+    "servidor_api": (120, ()),       # asyncio da stdlib
+    "grafico": (40, ()),
+    "calculadora_cli": (60, ()),
+    "motor_lote": (150, ("numpy",)),
+    "proposta_pdf": (400, ("reportlab", "PIL")),  # o próprio reportlab importa PIL
+}
+
+
+# Executa "import modulo" em um processo novo; devolve (ms cumulativos, pacotes pesados carregados)
+def medir(modulo):
+    saida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    ).stderr
+    total_us, carregados = None, set()
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        _, cumulativo, nome = linha.split("|")
+        nome = nome.strip()
+        if nome.split(".")[0] in PESADOS:
+            carregados.add(nome.split(".")[0])
+        if nome == modulo:
+            total_us = int(cumulativo)
+    return total_us / 1000, carregados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=5, help="processos por módulo (mediana)")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    print(f"{'módulo':<16}{'mediana (ms)':>14}{'orçamento':>11}  pesados carregados")
+    for modulo, (orcamento, permitidos) in CENARIOS.items():
+        medidas = [medir(modulo) for _ in range(args.n)]
+        mediana = statistics.median(ms for ms, _ in medidas)
+        carregados = set().union(*(c for _, c in medidas))
+        proibidos = carregados - set(permitidos)
+        print(f"{modulo:<16}{mediana:>14.1f}{orcamento:>11}  {', '.join(sorted(carregados)) or '-'}")
+        if mediana > orcamento:
+            falhas.append(f"{modulo}: {mediana:.1f} ms acima do orçamento de {orcamento} ms")
+        if proibidos:
+            falhas.append(f"{modulo}: importa {', '.join(sorted(proibidos))} na partida")
+
+    for falha in falhas:
+        print(f"FALHA  {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
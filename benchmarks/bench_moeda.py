@@ -0,0 +1,65 @@
+# ===================== BENCHMARK: FORMATAÇÃO E LEITURA DE REAIS =====================
+# Compara a vazão de moeda.brl / brl_lote com a formatação antiga (f-string +
+# três .replace por valor) e mede ler_brl e mascara_brl sobre os textos gerados.
+# As propriedades de ida e volta (brl -> ler_brl -> mascara_brl) ficam em tests/test_moeda.py.
+#
+# Uso: python benchmarks/bench_moeda.py [--n 200000] [--seed 0]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moeda import brl, brl_lote, ler_brl, mascara_brl  # noqa: E402
+
+
+def _antigo(v):
+    return f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _valores(n, rng):
+    # magnitudes de centavos a bilhões, com sinal; casos de borda no início
+    valores = [0.0, -0.0, 0.01, -0.01, 0.005, 999.995, 1e15, -1234567.891]
+    while len(valores) < n:
+        valores.append(round(rng.uniform(-1, 1) * 10 ** rng.randint(0, 12), rng.choice((0, 1, 2, 3, 6))))
+    return valores
+
+
+def _medir(funcao, repeticoes=5):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200_000, help="valores por medida")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    valores = _valores(args.n, rng)
+    textos = [brl(v) for v in valores]
+
+    medidas = [
+        ("formatação antiga", lambda: [_antigo(v) for v in valores]),
+        ("brl", lambda: [brl(v) for v in valores]),
+        ("brl_lote", lambda: brl_lote(valores)),
+        ("brl(casas=0)", lambda: [brl(v, 0) for v in valores]),
+        ("ler_brl", lambda: [ler_brl(t) for t in textos]),
+        ("ler_brl(decimal)", lambda: [ler_brl(t, decimal=True) for t in textos]),
+        ("mascara_brl", lambda: [mascara_brl(t) for t in textos]),
+    ]
+    print(f"{'operação':<22}{'ns/valor':>10}{'valores/s':>14}")
+    for nome, funcao in medidas:
+        duracao = _medir(funcao)
+        print(f"{nome:<22}{duracao / args.n * 1e9:>10.0f}{args.n / duracao:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# ===================== BENCHMARK: MODO RÁPIDO x MODO PRECISO =====================
+# Carteira aleatória (tipos, valores, prazos e taxas variados) simulada em três caminhos:
+#   rapido            motor_lote.simular_lote em float64 (sem arredondamentos)
+#   preciso (lote)    motor_lote.simular_lote(modo="preciso"), centavos em float64
+#   preciso (Decimal) motor_preciso.simular_decimal posição a posição (referência)
+#
+# Mede a vazão de cada caminho e, contra a referência Decimal, a diferença por
+# campo: maior diferença, média, fração de posições com 1 centavo ou mais de
+# diferença e a diferença no total da carteira.
+#
+# Uso: python benchmarks/bench_precisao.py [--n 1000000] [--n-decimal 20000] [--seed 0]
+#      (sai com código 1 se o lote preciso divergir da referência em mais de --tolerancia das posições)
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CAMPOS = ("montante_bruto", "iof", "ir", "montante_liquido")
+
+
+def carteira_aleatoria(n, seed):
+    import numpy as np
+    from motor_calculo import TIPOS_INVESTIMENTO
+
+    rng = np.random.default_rng(seed)
+    aplicacao = np.datetime64("2025-01-02") + rng.integers(0, 365, n)
+    return {
+        # valores digitados em centavos, de R$ 1 mil a R$ 5 milhões
+        "valor_investido": rng.integers(100_000, 500_000_000, n) / 100,
+        "tipo_investimento": rng.integers(0, len(TIPOS_INVESTIMENTO), n),
+        "data_aplicacao": aplicacao,
+        # inclui prazos curtos (faixa do IOF) e longos
+        "data_vencimento": aplicacao + np.where(rng.random(n) < 0.1, rng.integers(1, 31, n), rng.integers(31, 3650, n)),
+        "taxa_anual": rng.integers(800, 1800, n) / 100,
+        "perc_cdi": rng.integers(9000, 13000, n) / 100,
+        "taxa_cdi": rng.integers(1000, 1600, n) / 100,
+    }
+
+
+def _entradas(carteira, indices):
+    from motor_calculo import TIPOS_INVESTIMENTO, EntradaSimulacao
+    for i in indices:
+        yield EntradaSimulacao(
+            valor_investido=float(carteira["valor_investido"][i]),
+            tipo_investimento=TIPOS_INVESTIMENTO[carteira["tipo_investimento"][i]],
+            data_aplicacao=carteira["data_aplicacao"][i].item(),
+            data_vencimento=carteira["data_vencimento"][i].item(),
+            taxa_anual=float(carteira["taxa_anual"][i]),
+            perc_cdi=float(carteira["perc_cdi"][i]),
+            taxa_cdi=float(carteira["taxa_cdi"][i]),
+        )
+
+
+def _lote(carteira, modo, indices=None):
+    from motor_lote import simular_lote
+    colunas = carteira if indices is None else {k: v[indices] for k, v in carteira.items()}
+    return simular_lote(colunas["valor_investido"], colunas["tipo_investimento"], colunas["data_aplicacao"],
+                        colunas["data_vencimento"], taxa_anual=colunas["taxa_anual"],
+                        perc_cdi=colunas["perc_cdi"], taxa_cdi=colunas["taxa_cdi"], modo=modo)
+
+
+def _cronometrar(funcao):
+    inicio = time.perf_counter()
+    retorno = funcao()
+    return retorno, time.perf_counter() - inicio
+
+
+def _diferencas(nome, resultado, referencia):
+    import numpy as np
+    print(f"\n{nome} x preciso (Decimal)")
+    print(f"{'campo':<18}{'maior dif.':>14}{'dif. média':>14}{'>= 1 centavo':>15}{'dif. no total':>16}")
+    divergentes = np.zeros(len(resultado), dtype=bool)
+    for campo in CAMPOS:
+        diferenca = getattr(resultado, campo) - referencia[campo]
+        absoluta = np.abs(diferenca)
+        # diferenças abaixo de meio centavo são ruído de float64 (valores iguais no centavo)
+        centavo = absoluta >= 0.005
+        divergentes |= centavo
+        print(f"{campo:<18}{absoluta.max():>14.4f}{absoluta.mean():>14.6f}{centavo.mean():>14.2%}{diferenca.sum():>16.2f}")
+    return divergentes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1_000_000, help="posições nos modos vetorizados")
+    parser.add_argument("--n-decimal", type=int, default=20_000, help="posições (amostra) na referência Decimal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerancia", type=float, default=0.0,
+                        help="fração de posições em que o lote preciso pode divergir da referência")
+    args = parser.parse_args(argv)
+
+    import numpy as np
+    from motor_preciso import simular_decimal
+
+    carteira = carteira_aleatoria(args.n, args.seed)
+    _lote(carteira, "rapido", np.arange(10))  # aquecimento (calendário e tabela compilada)
+
+    _, t_rapido = _cronometrar(lambda: _lote(carteira, "rapido"))
+    _, t_preciso = _cronometrar(lambda: _lote(carteira, "preciso"))
+
+    amostra = np.random.default_rng(args.seed + 1).choice(args.n, size=min(args.n_decimal, args.n), replace=False)
+    entradas = list(_entradas(carteira, amostra))
+    decimais, t_decimal = _cronometrar(lambda: [simular_decimal(e) for e in entradas])
+    referencia = {campo: np.array([float(getattr(r, campo)) for r in decimais]) for campo in CAMPOS}
+
+    print(f"{'caminho':<20}{'posições':>12}{'tempo':>10}{'posições/s':>14}")
+    for nome, n, duracao in (("rapido", args.n, t_rapido), ("preciso (lote)", args.n, t_preciso),
+                             ("preciso (Decimal)", len(amostra), t_decimal)):
+        print(f"{nome:<20}{n:>12,}{duracao:>9.3f}s{n / duracao:>14,.0f}")
+
+    _diferencas("rapido", _lote(carteira, "rapido", amostra), referencia)
+    divergentes = _diferencas("preciso (lote)", _lote(carteira, "preciso", amostra), referencia)
+
+    fracao = divergentes.mean()
+    print(f"\nLote preciso diverge da referência em {divergentes.sum()} de {len(amostra)} posições ({fracao:.4%})")
+    if fracao > args.tolerancia:
+        print(f"FALHA  acima da tolerância ({args.tolerancia:.4%})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
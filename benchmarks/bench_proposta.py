@@ -0,0 +1,75 @@
+# ===================== BENCHMARK: TEMPLATE DA PROPOSTA =====================
+# Mede o tempo por proposta de criar_pdf_perfeito:
+#   "sem template" -> limpa o template antes de cada PDF (estilos, TableStyles e
+#                     parágrafos fixos refeitos a cada proposta, como antes)
+#   "com template" -> template montado uma vez e reaproveitado
+# O gráfico é pré-renderizado e o logo vem de um arquivo local, para isolar o
+# custo de montagem do PDF.
+#
+# Uso: python benchmarks/bench_proposta.py [--n 50]
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _logo_local():
+    from PIL import Image as PILImage
+    caminho = os.path.join(tempfile.mkdtemp(prefix="bench_logo_"), "logo.png")
+    PILImage.new("RGB", (800, 200), "white").save(caminho)
+    return caminho
+
+
+def _medir(funcao, n):
+    tempos = []
+    for _ in range(n):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), min(tempos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50, help="propostas por cenário")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("CDB_LOGO_PATH", _logo_local())
+
+    from PIL import Image as PILImage
+    from motor_calculo import EntradaSimulacao
+    from proposta_pdf import criar_pdf_perfeito, limpar_template, montar_proposta, obter_template
+
+    entrada = EntradaSimulacao(500000.0, "CDB Pré-fixado", datetime.date(2025, 1, 2), datetime.date(2027, 1, 4), taxa_anual=14.5)
+    proposta = montar_proposta("CLI_001", "João Silva", "Assessor", datetime.date(2025, 1, 2), entrada)
+
+    png = BytesIO()
+    PILImage.new("RGB", (1800, 900), "white").save(png, format="PNG")
+    png = png.getvalue()
+
+    def sem_template():
+        limpar_template()
+        criar_pdf_perfeito(proposta, BytesIO(png))
+
+    def com_template():
+        criar_pdf_perfeito(proposta, BytesIO(png))
+
+    criar_pdf_perfeito(proposta, BytesIO(png))  # aquecimento (imports, fontes, logo)
+    mediana_sem, min_sem = _medir(sem_template, args.n)
+    obter_template()
+    mediana_com, min_com = _medir(com_template, args.n)
+
+    print(f"{'cenário':<14}{'mediana (ms)':>14}{'mínimo (ms)':>14}")
+    print(f"{'sem template':<14}{mediana_sem * 1000:>14.2f}{min_sem * 1000:>14.2f}")
+    print(f"{'com template':<14}{mediana_com * 1000:>14.2f}{min_com * 1000:>14.2f}")
+    print(f"ganho por proposta: {(1 - mediana_com / mediana_sem) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
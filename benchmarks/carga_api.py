@@ -0,0 +1,109 @@
+# ===================== TESTE DE CARGA: SERVIÇO HTTP =====================
+# Dispara requisições concorrentes (conexões keep-alive) contra o servidor_api
+# em localhost e reporta latência p50/p99 e requisições por segundo.
+# Cliente HTTP/1.1 mínimo sobre asyncio, sem dependências externas.
+#
+# Uso (com o servidor no ar: uvicorn servidor_api:app --port 8000):
+#   python benchmarks/carga_api.py --rota /simulate --conexoes 32 --segundos 10
+#   python benchmarks/carga_api.py --rota /proposal.pdf --conexoes 8 --variar
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+CORPO_PADRAO = {
+    "valor_investido": 500000.0,
+    "tipo_investimento": "CDB Pós-fixado (% do CDI)",
+    "data_aplicacao": "2025-01-02",
+    "data_vencimento": "2030-01-02",
+    "perc_cdi": 110.0,
+    "codigo_cliente": "CLI_001",
+    "nome_cliente": "João Silva",
+    "nome_assessor": "Assessor",
+}
+
+
+def _corpo(rota, indice, variar):
+    corpo = dict(CORPO_PADRAO)
+    if variar:
+        # Entradas distintas: mede o custo real, sem coalescência
+        corpo["valor_investido"] += indice
+    if rota == "/simulate/batch":
+        return {"posicoes": [corpo] * 100}
+    return corpo
+
+
+async def _requisicao(leitor, escritor, host, rota, corpo):
+    dados = json.dumps(corpo).encode()
+    escritor.write(
+        f"POST {rota} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(dados)}\r\n\r\n".encode() + dados
+    )
+    await escritor.drain()
+    status = int((await leitor.readline()).split()[1])
+    tamanho = 0
+    while True:
+        linha = await leitor.readline()
+        if linha in (b"\r\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        if nome.strip().lower() == "content-length":
+            tamanho = int(valor)
+    await leitor.readexactly(tamanho)
+    return status
+
+
+async def _cliente(host, porta, rota, fim, variar, latencias, erros, contador):
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    try:
+        while time.perf_counter() < fim:
+            contador[0] += 1
+            corpo = _corpo(rota, contador[0], variar)
+            inicio = time.perf_counter()
+            status = await _requisicao(leitor, escritor, host, rota, corpo)
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                erros.append(status)
+    finally:
+        escritor.close()
+
+
+async def executar(host, porta, rota, conexoes, segundos, variar):
+    latencias, erros, contador = [], [], [0]
+    inicio = time.perf_counter()
+    fim = inicio + segundos
+    await asyncio.gather(*(
+        _cliente(host, porta, rota, fim, variar, latencias, erros, contador) for _ in range(conexoes)
+    ))
+    duracao = time.perf_counter() - inicio
+    latencias.sort()
+    percentil = lambda p: latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000 if latencias else 0.0
+    return {
+        "rota": rota,
+        "conexoes": conexoes,
+        "requisicoes": len(latencias),
+        "erros": len(erros),
+        "rps": round(len(latencias) / duracao, 1),
+        "p50_ms": round(percentil(0.50), 2),
+        "p99_ms": round(percentil(0.99), 2),
+        "media_ms": round(statistics.fmean(latencias) * 1000, 2) if latencias else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--rota", default="/simulate", choices=["/simulate", "/simulate/batch", "/proposal.pdf"])
+    parser.add_argument("--conexoes", type=int, default=32, help="clientes concorrentes")
+    parser.add_argument("--segundos", type=float, default=10.0, help="duração do teste")
+    parser.add_argument("--variar", action="store_true", help="uma entrada diferente por requisição")
+    args = parser.parse_args(argv)
+
+    resumo = asyncio.run(executar(args.host, args.porta, args.rota, args.conexoes, args.segundos, args.variar))
+    print(json.dumps(resumo, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
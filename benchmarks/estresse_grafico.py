@@ -0,0 +1,144 @@
+# ===================== ESTRESSE: GRÁFICOS EM SESSÕES SIMULTÂNEAS =====================
+# Simula N sessões do Streamlit (uma thread cada) pedindo gráficos ao mesmo
+# tempo, cada uma com a própria simulação, e verifica:
+#   imagens   o PNG de cada sessão é idêntico (sha256) ao renderizado em série
+#             para a mesma entrada: nada de título, série ou eixo de outra sessão
+#   memória   RSS do processo estável entre as rodadas (após o aquecimento) e
+#             nenhuma matplotlib.figure.Figure viva ao fim de cada rodada
+#
+# Uso: python benchmarks/estresse_grafico.py [--sessoes 50] [--rodadas 4] [--limite-mb 25]
+#      (sai com código 1 se alguma imagem divergir ou a memória crescer além de --limite-mb)
+# A mesma verificação de imagens, com poucas threads, roda no pytest (tests/test_grafico.py).
+import argparse
+import datetime
+import gc
+import hashlib
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Uma simulação diferente por sessão (tipo, valor, prazo e taxa variam)
+def _sessoes(n):
+    from motor_calculo import TIPOS_INVESTIMENTO, EntradaSimulacao, projetar_rentabilidade, simular
+
+    sessoes = []
+    for i in range(n):
+        aplicacao = datetime.date(2025, 1, 2) + datetime.timedelta(days=7 * i)
+        entrada = EntradaSimulacao(
+            valor_investido=10_000.0 * (i + 1),
+            tipo_investimento=TIPOS_INVESTIMENTO[i % len(TIPOS_INVESTIMENTO)],
+            data_aplicacao=aplicacao,
+            data_vencimento=aplicacao + datetime.timedelta(days=365 + 90 * i),
+            taxa_anual=10.0 + i % 7,
+            perc_cdi=95.0 + i,
+            taxa_cdi=12.0 + (i % 5) / 2,
+        )
+        resultado = simular(entrada)
+        sessoes.append((entrada, resultado, projetar_rentabilidade(entrada, resultado)))
+    return sessoes
+
+
+# Página (fundo do tema) e PDF (título preto) alternados entre as sessões
+def _renderizar(i, sessao):
+    from grafico import grafico_png, grafico_png_tela
+    if i % 2:
+        return grafico_png(*sessao, dpi=100).getvalue()
+    return grafico_png_tela(*sessao, dpi=100)
+
+
+def _hash(png):
+    return hashlib.sha256(png).hexdigest()
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource  # fora do Linux: pico de memória (só cresce)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _figuras_vivas():
+    from matplotlib.figure import Figure
+    gc.collect()
+    return sum(isinstance(objeto, Figure) for objeto in gc.get_objects())
+
+
+# Todas as sessões liberadas juntas por uma barreira; devolve (hashes, erros, segundos)
+def _rodada(sessoes):
+    barreira = threading.Barrier(len(sessoes))
+    hashes = [None] * len(sessoes)
+    erros = []
+
+    def sessao(i):
+        barreira.wait()
+        try:
+            hashes[i] = _hash(_renderizar(i, sessoes[i]))
+        except Exception as exc:  # noqa: BLE001  (o erro vira falha do estresse)
+            erros.append(f"sessão {i}: {exc!r}")
+
+    threads = [threading.Thread(target=sessao, args=(i,), name=f"sessao-{i}") for i in range(len(sessoes))]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return hashes, erros, time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessoes", type=int, default=50, help="sessões (threads) simultâneas")
+    parser.add_argument("--rodadas", type=int, default=4, help="rodadas com todas as sessões")
+    parser.add_argument("--limite-mb", type=float, default=25.0,
+                        help="crescimento máximo do RSS entre a primeira e a última rodada")
+    args = parser.parse_args(argv)
+
+    import metricas
+    metricas.ativar()
+
+    sessoes = _sessoes(args.sessoes)
+    inicio = time.perf_counter()
+    referencia = [_hash(_renderizar(i, s)) for i, s in enumerate(sessoes)]
+    t_serie = time.perf_counter() - inicio
+    if len(set(referencia)) != len(referencia):
+        print("FALHA  entradas distintas geraram imagens iguais (o teste não distinguiria sessões)")
+        return 1
+
+    falhas = []
+    memoria = []
+    print(f"{'rodada':<8}{'tempo (s)':>10}{'gráficos/s':>12}{'RSS (MB)':>10}{'figuras vivas':>15}{'divergentes':>13}")
+    print(f"{'série':<8}{t_serie:>10.2f}{len(sessoes) / t_serie:>12.1f}{_rss_mb():>10.1f}{_figuras_vivas():>15}{'-':>13}")
+    metricas.zerar()
+    for rodada in range(1, args.rodadas + 1):
+        hashes, erros, duracao = _rodada(sessoes)
+        divergentes = [i for i, (h, r) in enumerate(zip(hashes, referencia)) if h != r]
+        vivas = _figuras_vivas()
+        memoria.append(_rss_mb())
+        print(f"{rodada:<8}{duracao:>10.2f}{len(sessoes) / duracao:>12.1f}{memoria[-1]:>10.1f}{vivas:>15}{len(divergentes):>13}")
+        falhas += erros
+        if divergentes:
+            falhas.append(f"rodada {rodada}: imagem diferente da renderização em série nas sessões {divergentes[:10]}")
+        if vivas:
+            falhas.append(f"rodada {rodada}: {vivas} figura(s) ainda viva(s)")
+
+    espera = metricas.instantaneo()["etapas"].get("grafico.trava")
+    if espera:
+        print(f"\nEspera pela trava: média {espera['media_ms']:.1f} ms, máxima {espera['max_ms']:.1f} ms")
+    crescimento = memoria[-1] - memoria[0]
+    print(f"RSS da primeira à última rodada: {crescimento:+.1f} MB")
+    if crescimento > args.limite_mb:
+        falhas.append(f"memória cresceu {crescimento:.1f} MB (limite {args.limite_mb} MB)")
+
+    for falha in falhas:
+        print(f"FALHA  {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+# ===================== SUÍTE DE BENCHMARKS (CAMINHOS QUENTES) =====================
+# Mede os caminhos da proposta em um único processo e grava o resultado em JSON,
+# para comparar execuções ao longo do tempo:
+#   calculo.*     simular, simular_decimal (modo preciso) e calcular_impostos (caminho escalar)
+#   projecao.*    projetar_rentabilidade (laço mensal) e projetar_curvas diária
+#   grafico.*     grafico_png em 100, 150 e 300 dpi
+#   pdf.*         criar_pdf_perfeito de ponta a ponta (logo em arquivo local)
+#   lote.*        simular_lote com 100 mil posições (vazão)
+#   carteira.*    simulação e projeção consolidada de 500 posições
+#   historico.*   busca por cliente em um histórico SQLite com 50 mil simulações
+#
+# Cada caso roda um aquecimento e depois `repeticoes` amostras; cada amostra
+# executa a função `numero` vezes (calibrado para ~0,1 s por amostra) e registra
+# o tempo por chamada.
+#
+# Uso:
+#   python benchmarks/suite.py                       # grava benchmarks/resultados/<data>_<commit>.json
+#   python benchmarks/suite.py -k grafico pdf        # só casos cujo nome contém algum dos filtros
+#   python benchmarks/suite.py --comparar base.json  # compara com uma execução anterior
+#                                                    # (sai com código 1 se algum caso piorar além de --tolerancia)
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+DIRETORIO_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+TEMPO_AMOSTRA = 0.1  # segundos por amostra na calibração
+
+CASOS = {}
+
+
+# Registra um caso: `preparar()` roda uma vez fora da medição e devolve a função medida.
+# `itens` (opcional) é o número de unidades processadas por chamada, para reportar vazão.
+def caso(nome, itens=1):
+    def registrar(preparar):
+        CASOS[nome] = (preparar, itens)
+        return preparar
+    return registrar
+
+
+def _entrada(tipo="CDB Pós-fixado (% do CDI)"):
+    from motor_calculo import EntradaSimulacao
+    return EntradaSimulacao(500000.0, tipo, datetime.date(2025, 1, 2), datetime.date(2030, 1, 2),
+                            taxa_anual=14.5, perc_cdi=110.0)
+
+
+def _logo_local():
+    from PIL import Image as PILImage
+    caminho = os.path.join(tempfile.mkdtemp(prefix="bench_logo_"), "logo.png")
+    PILImage.new("RGB", (800, 200), "white").save(caminho)
+    return caminho
+
+
+# ===================== CASOS =====================
+
+@caso("calculo.simular_pos")
+def _():
+    from motor_calculo import simular
+    entrada = _entrada()
+    return lambda: simular(entrada)
+
+
+@caso("calculo.simular_pre")
+def _():
+    from motor_calculo import simular
+    entrada = _entrada("CDB Pré-fixado")
+    return lambda: simular(entrada)
+
+
+@caso("calculo.simular_decimal")
+def _():
+    from motor_preciso import simular_decimal
+    entrada = _entrada()
+    return lambda: simular_decimal(entrada)
+
+
+@caso("calculo.calcular_impostos")
+def _():
+    from motor_calculo import calcular_impostos
+    return lambda: calcular_impostos(400, 12345.67, "CDB Pré-fixado")
+
+
+@caso("projecao.projetar_rentabilidade")
+def _():
+    from motor_calculo import projetar_rentabilidade, simular
+    entrada = _entrada()
+    resultado = simular(entrada)
+    return lambda: projetar_rentabilidade(entrada, resultado)
+
+
+@caso("projecao.curvas_diarias")
+def _():
+    from motor_projecao import projetar_curvas
+    entrada = _entrada()
+    return lambda: projetar_curvas(entrada, "diaria")
+
+
+def _caso_grafico(dpi):
+    def preparar():
+        import matplotlib
+        matplotlib.use("Agg")
+        from grafico import grafico_png
+        from motor_calculo import projetar_rentabilidade, simular
+        entrada = _entrada()
+        resultado = simular(entrada)
+        projecao = projetar_rentabilidade(entrada, resultado)
+        return lambda: grafico_png(entrada, resultado, projecao, dpi=dpi)
+    return preparar
+
+
+for _dpi in (100, 150, 300):
+    caso(f"grafico.png_{_dpi}dpi")(_caso_grafico(_dpi))
+
+
+def _caso_pdf(modo, dpi):
+    def preparar():
+        os.environ.setdefault("CDB_LOGO_PATH", _logo_local())
+        import matplotlib
+        matplotlib.use("Agg")
+        from proposta_pdf import criar_pdf_perfeito, montar_proposta
+
+        entrada = _entrada()
+        proposta = montar_proposta("CLI_001", "João Silva", "Assessor", datetime.date(2025, 1, 2), entrada)
+        return lambda: criar_pdf_perfeito(proposta, modo_grafico=modo, dpi=dpi)
+    return preparar
+
+
+caso("pdf.proposta_vetor")(_caso_pdf("vetor", None))
+caso("pdf.proposta_png_300dpi")(_caso_pdf("png", 300))
+
+
+@caso("lote.simular_lote_100k", itens=100_000)
+def _():
+    import numpy as np
+    from motor_calculo import TIPOS_INVESTIMENTO
+    from motor_lote import simular_lote
+
+    n = 100_000
+    rng = np.random.default_rng(0)
+    aplicacao = np.datetime64("2025-01-02") + rng.integers(0, 365, n)
+    vencimento = aplicacao + rng.integers(1, 3650, n)
+    valores = rng.uniform(1e3, 1e6, n)
+    tipos = rng.integers(0, len(TIPOS_INVESTIMENTO), n)
+    return lambda: simular_lote(valores, tipos, aplicacao, vencimento, taxa_anual=12.0, perc_cdi=110.0)
+
+
+@caso("carteira.500_posicoes", itens=500)
+def _():
+    from carteira import montar_carteira, projetar_carteira, simular_carteira
+    from motor_calculo import TIPOS_INVESTIMENTO, EntradaSimulacao
+
+    inicio = datetime.date(2025, 1, 2)
+    posicoes = [
+        (f"P{i}", EntradaSimulacao(10000.0 + i, TIPOS_INVESTIMENTO[i % 4], inicio + datetime.timedelta(days=i),
+                                   inicio + datetime.timedelta(days=180 + 7 * i), taxa_anual=12.0, perc_cdi=105.0))
+        for i in range(500)
+    ]
+    return lambda: projetar_carteira(simular_carteira(montar_carteira(posicoes)))
+
+
+@caso("historico.buscar_cliente")
+def _():
+    from historico import Historico
+    from motor_calculo import simular
+
+    historico = Historico(os.path.join(tempfile.mkdtemp(prefix="bench_historico_"), "historico.sqlite3"))
+    entrada = _entrada()
+    resultado = simular(entrada)
+    for i in range(50_000):
+        historico.salvar(f"CLI_{i % 5000:04d}", "Cliente", f"Assessor {i % 40}", datetime.date(2025, 1, 2)
+                         + datetime.timedelta(days=i // 5000), entrada, resultado)
+    historico.descarregar()
+    return lambda: historico.buscar(codigo_cliente="CLI_0042", limite=30)
+
+
+# ===================== EXECUÇÃO =====================
+
+def _calibrar(funcao):
+    numero = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(numero):
+            funcao()
+        if time.perf_counter() - inicio >= TEMPO_AMOSTRA or numero >= 100_000:
+            return numero
+        numero *= 10
+
+
+def medir(nome, repeticoes):
+    preparar, itens = CASOS[nome]
+    funcao = preparar()
+    funcao()  # aquecimento (imports, caches, fontes)
+    numero = _calibrar(funcao)
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(numero):
+            funcao()
+        amostras.append((time.perf_counter() - inicio) / numero)
+    mediana = statistics.median(amostras)
+    return {
+        "mediana_s": mediana,
+        "minimo_s": min(amostras),
+        "desvio_s": statistics.stdev(amostras) if len(amostras) > 1 else 0.0,
+        "repeticoes": repeticoes,
+        "numero": numero,
+        "itens_por_s": itens / mediana if mediana else None,
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _formatar_tempo(segundos):
+    if segundos >= 1:
+        return f"{segundos:.3f} s"
+    if segundos >= 1e-3:
+        return f"{segundos * 1e3:.2f} ms"
+    return f"{segundos * 1e6:.1f} µs"
+
+
+# Compara com uma execução anterior; devolve os casos que pioraram além da tolerância
+def comparar(resultados, caminho_base, tolerancia):
+    with open(caminho_base, encoding="utf-8") as f:
+        base = json.load(f)["casos"]
+    regressoes = []
+    print(f"\n{'caso':<34}{'base':>12}{'atual':>12}{'razão':>9}")
+    for nome, atual in resultados.items():
+        if nome not in base:
+            continue
+        razao = atual["mediana_s"] / base[nome]["mediana_s"]
+        marca = ""
+        if razao > 1 + tolerancia:
+            regressoes.append(nome)
+            marca = "  PIOROU"
+        elif razao < 1 - tolerancia:
+            marca = "  melhorou"
+        print(f"{nome:<34}{_formatar_tempo(base[nome]['mediana_s']):>12}"
+              f"{_formatar_tempo(atual['mediana_s']):>12}{razao:>9.2f}{marca}")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks dos caminhos quentes da proposta.")
+    parser.add_argument("-k", nargs="*", default=None, help="filtros por nome de caso")
+    parser.add_argument("--repeticoes", type=int, default=7, help="amostras por caso")
+    parser.add_argument("--saida", default=None, help="arquivo JSON (padrão: benchmarks/resultados/<data>_<commit>.json)")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="piora relativa aceita na comparação")
+    args = parser.parse_args(argv)
+
+    nomes = [n for n in CASOS if not args.k or any(filtro in n for filtro in args.k)]
+    resultados = {}
+    print(f"{'caso':<34}{'mediana':>12}{'mínimo':>12}{'vazão (itens/s)':>18}")
+    for nome in nomes:
+        r = resultados[nome] = medir(nome, args.repeticoes)
+        vazao = f"{r['itens_por_s']:,.0f}" if r["itens_por_s"] else "-"
+        print(f"{nome:<34}{_formatar_tempo(r['mediana_s']):>12}{_formatar_tempo(r['minimo_s']):>12}{vazao:>18}")
+
+    commit = _commit()
+    agora = datetime.datetime.now()
+    documento = {
+        "data": agora.isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "casos": resultados,
+    }
+    saida = args.saida
+    if saida is None:
+        os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+        saida = os.path.join(DIRETORIO_RESULTADOS, f"{agora:%Y%m%d-%H%M%S}_{commit or 'sem-commit'}.json")
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(documento, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {saida}")
+
+    if args.comparar:
+        regressoes = comparar(resultados, args.comparar, args.tolerancia)
+        if regressoes:
+            print(f"FALHA  {len(regressoes)} caso(s) acima da tolerância: {', '.join(regressoes)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
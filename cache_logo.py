@@ -0,0 +1,194 @@
+# ===================== CACHE DO LOGO (MEMÓRIA + DISCO) =====================
+# O logo do PDF era baixado a cada proposta. Aqui ele é buscado uma única vez,
+# guardado em memória e em disco (com TTL e revalidação por ETag) e, se a rede
+# falhar, a cópia em cache continua sendo usada.
+#
+# Variáveis de ambiente:
+#   CDB_LOGO_PATH       arquivo local do logo (dispensa totalmente a rede)
+#   CDB_LOGO_URL        URL alternativa do logo
+#   CDB_LOGO_CACHE_DIR  diretório do cache em disco
+#   CDB_LOGO_TTL        validade do cache em segundos (padrão: 24h)
+#   CDB_LOGO_TIMEOUT    timeout da requisição HTTP em segundos (padrão: 5)
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from io import BytesIO
+
+import metricas
+
+URL_LOGO_WHITE = "https://ik.imagekit.io/aufhkvnry/logo-traders__bg-white.png"
+
+TTL_PADRAO = 24 * 60 * 60
+TIMEOUT_PADRAO = 5
+
+# Bytes da imagem + proporção (altura / largura) já calculada
+LogoAsset = namedtuple("LogoAsset", ["dados", "proporcao"])
+
+_memoria = {}  # url -> (LogoAsset, etag, buscado_em)
+_trava = threading.Lock()
+_revalidando = set()
+
+
+def _diretorio_cache():
+    return os.environ.get("CDB_LOGO_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "calculadora_cdb_cache")
+
+
+def _ttl():
+    try:
+        return float(os.environ.get("CDB_LOGO_TTL", TTL_PADRAO))
+    except ValueError:
+        return TTL_PADRAO
+
+
+def _timeout():
+    try:
+        return float(os.environ.get("CDB_LOGO_TIMEOUT", TIMEOUT_PADRAO))
+    except ValueError:
+        return TIMEOUT_PADRAO
+
+
+def _caminhos(url):
+    chave = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    base = os.path.join(_diretorio_cache(), f"logo_{chave}")
+    return base + ".img", base + ".json"
+
+
+def _calcular_proporcao(dados):
+    # PIL só é usado aqui, uma vez por download, para ler o tamanho da imagem
+    from PIL import Image as PILImage
+    largura, altura = PILImage.open(BytesIO(dados)).size
+    return altura / largura
+
+
+def _ler_disco(url):
+    caminho_img, caminho_meta = _caminhos(url)
+    try:
+        with open(caminho_meta, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(caminho_img, "rb") as f:
+            dados = f.read()
+        proporcao = float(meta["proporcao"])
+    except (OSError, ValueError, KeyError, TypeError):
+        # Metadados ilegíveis ou incompletos: como se não houvesse cache
+        return None
+    return LogoAsset(dados, proporcao), meta.get("etag"), meta.get("buscado_em", 0.0)
+
+
+def _gravar_disco(url, asset, etag, buscado_em):
+    caminho_img, caminho_meta = _caminhos(url)
+    try:
+        os.makedirs(os.path.dirname(caminho_img), exist_ok=True)
+        # Grava em arquivo temporário e renomeia, para nunca deixar um cache pela metade
+        tmp_img = caminho_img + ".tmp"
+        with open(tmp_img, "wb") as f:
+            f.write(asset.dados)
+        os.replace(tmp_img, caminho_img)
+        tmp_meta = caminho_meta + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": etag, "buscado_em": buscado_em, "proporcao": asset.proporcao}, f)
+        os.replace(tmp_meta, caminho_meta)
+    except OSError:
+        # Cache em disco é opcional: sem permissão de escrita seguimos só com a memória
+        pass
+
+
+def _buscar(url, em_cache):
+    import requests
+
+    asset_antigo, etag = (em_cache[0], em_cache[1]) if em_cache else (None, None)
+    headers = {"If-None-Match": etag} if (etag and asset_antigo is not None) else {}
+    response = requests.get(url, headers=headers, timeout=_timeout())
+    agora = time.time()
+    if response.status_code == 304 and asset_antigo is not None:
+        # Conteúdo não mudou: apenas renova a validade
+        resultado = (asset_antigo, etag, agora)
+    else:
+        response.raise_for_status()
+        asset = LogoAsset(response.content, _calcular_proporcao(response.content))
+        resultado = (asset, response.headers.get("ETag"), agora)
+
+    with _trava:
+        _memoria[url] = resultado
+    _gravar_disco(url, *resultado)
+    return resultado[0]
+
+
+def _revalidar_em_segundo_plano(url, em_cache):
+    with _trava:
+        if url in _revalidando:
+            return
+        _revalidando.add(url)
+
+    def tarefa():
+        try:
+            _buscar(url, em_cache)
+        except Exception:
+            # Falha de rede: a cópia antiga continua valendo até a próxima tentativa
+            pass
+        finally:
+            with _trava:
+                _revalidando.discard(url)
+
+    threading.Thread(target=tarefa, name="revalida-logo", daemon=True).start()
+
+
+def _carregar_arquivo_local(caminho):
+    with _trava:
+        em_cache = _memoria.get(caminho)
+    if em_cache is not None:
+        metricas.contar("logo.cache.acerto")
+        return em_cache[0]
+    metricas.contar("logo.cache.falta")
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    asset = LogoAsset(dados, _calcular_proporcao(dados))
+    with _trava:
+        _memoria[caminho] = (asset, None, time.time())
+    return asset
+
+
+# Retorna o logo (bytes + proporção). Só bloqueia na rede quando não existe
+# nenhuma cópia em cache; cópias vencidas são servidas enquanto a revalidação
+# (If-None-Match) acontece em segundo plano.
+def obter_logo(url=None):
+    caminho_local = os.environ.get("CDB_LOGO_PATH")
+    if caminho_local:
+        return _carregar_arquivo_local(caminho_local)
+
+    url = url or os.environ.get("CDB_LOGO_URL") or URL_LOGO_WHITE
+
+    with _trava:
+        em_cache = _memoria.get(url)
+    if em_cache is None:
+        em_cache = _ler_disco(url)
+        if em_cache is not None:
+            with _trava:
+                _memoria[url] = em_cache
+
+    if em_cache is None:
+        metricas.contar("logo.cache.falta")
+        with metricas.etapa("logo.download"):
+            return _buscar(url, None)
+
+    metricas.contar("logo.cache.acerto")
+    if time.time() - em_cache[2] > _ttl():
+        _revalidar_em_segundo_plano(url, em_cache)
+    return em_cache[0]
+
+
+# Aquece o cache (ex.: na inicialização do app ou de um worker)
+def pre_carregar_logo(url=None):
+    try:
+        return obter_logo(url)
+    except Exception:
+        return None
+
+
+# Descarta o cache em memória (o cache em disco é mantido)
+def limpar_cache_memoria():
+    with _trava:
+        _memoria.clear()
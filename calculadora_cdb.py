@@ -1,127 +1,128 @@
 import streamlit as st
 import datetime
 from dateutil.relativedelta import relativedelta
-import base64
-from io import BytesIO
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from reportlab.lib.pagesizes import A4
-# Garante que todos os componentes são importados
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, HRFlowable, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import mm
-import requests
-from PIL import Image as PILImage
-from io import BytesIO as PIOBytesIO 
-import re
-
-# ===================== CONFIGURAÇÃO DE CORES (TEMA CLARO PADRÃO) =====================
-URL_LOGO_WHITE = "https://ik.imagekit.io/aufhkvnry/logo-traders__bg-white.png"
-TEXTO_PRINCIPAL_ST = "#222222"  # Preto/Escuro para títulos no Streamlit
-TEXTO_SECUNDARIO_ST = "#666666" # Cinza escuro para textos menores
-FUNDO_GRAFICO = "white"         # Fundo Gráfico Claro
-COR_EIXO_GRAFICO = "#333333"    # Cor de Eixo Gráfico Claro
-
-VERDE_DESTAQUE = '#2E8B57'      # Cor de destaque (Verde)
-# COR SOLICITADA PARA O TÍTULO DA TABELA DE RESULTADO FINAL
-AZUL_TABELA_PDF = colors.HexColor("#864df4") 
-
-
-# ===================== FUNÇÕES DE CÁLCULO DE IMPOSTOS (NOVO) =====================
-
-# Tabela IOF (percentual de desconto por dia)
-iof_tab_valores = [0.96,0.93,0.90,0.86,0.83,0.80,0.76,0.73,0.70,0.66,0.63,0.60,0.56,0.53,0.50,
-                   0.46,0.43,0.40,0.36,0.33,0.30,0.26,0.23,0.20,0.16,0.13,0.10,0.06,0.03,0.00] # 30 dias (index 0 é o dia 1)
-
-# Tabela Regressiva de IR para Renda Fixa
-def obter_aliquota_ir(dias):
-    if dias <= 180:
-        return 0.225
-    elif dias <= 360:
-        return 0.20
-    elif dias <= 720:
-        return 0.175
-    else:
-        return 0.15
-
-# Função principal que calcula IR e IOF baseado no tipo de investimento
-def calcular_impostos(prazo_dias, rendimento_bruto, tipo_investimento):
-    
-    # 1. Isenção de LCI/LCA: Isentos de IR e IOF para Pessoas Físicas.
-    if tipo_investimento in ("LCI", "LCA"):
-        # Retorna IR, IOF e Alíquota IR (zero)
-        return 0.0, 0.0, 0.0
-        
-    # 2. Imposto sobre Operações Financeiras (IOF) - Apenas CDBs/LC
-    iof_valor = 0.0
-    if prazo_dias < 30:
-        # Pega a alíquota de IOF
-        aliquota_iof = iof_tab_valores[prazo_dias - 1] # Index 0 é o dia 1
-        iof_valor = rendimento_bruto * aliquota_iof
-        
-    # Rendimento que serve de base para o IR (Rendimento Bruto - IOF)
-    rendimento_apos_iof = rendimento_bruto - iof_valor
-    
-    # 3. Imposto de Renda (IR)
-    aliquota_ir = obter_aliquota_ir(prazo_dias)
-    ir_valor = rendimento_apos_iof * aliquota_ir
-    
-    return ir_valor, iof_valor, aliquota_ir
-
-
-# ===================== FUNÇÃO PARA LOGO COM PROPORÇÃO CORRETA =====================
-# Função refeita para ser mais robusta ao carregar a imagem, usando o objeto Image do ReportLab
-def carregar_logo():
-    # Usando a URL do logo com fundo branco (padrão do tema claro)
-    url = URL_LOGO_WHITE 
-    response = requests.get(url)
-    img_pil = PILImage.open(PIOBytesIO(response.content))
-    largura, altura = img_pil.size
-    proporcao = altura / largura
-    largura_desejada = 200 
-    altura_calculada = largura_desejada * proporcao
-    
-    # Retorna o objeto Image do ReportLab
-    return Image(PIOBytesIO(response.content), width=largura_desejada, height=altura_calculada)
-
-# ===================== FUNÇÃO DE FORMATAÇÃO MONETÁRIA =====================
-def formatar_moeda(valor_str):
-    valor_limpo = re.sub(r'[^\d,]', '', valor_str)
-    
-    if ',' in valor_limpo:
-        partes = valor_limpo.split(',')
-        if len(partes) > 2:
-            valor_limpo = partes[0] + ',' + partes[1]
-        
-    valor_sem_pontos = valor_limpo.replace('.', '')
-    
-    if not valor_sem_pontos:
-        return "0,00"
-
-    try:
-        if ',' in valor_sem_pontos:
-            inteiro, decimal = valor_sem_pontos.split(',')
-            decimal = decimal[:2] 
-            decimal = decimal.ljust(2, '0') 
-            valor_float = float(f"{inteiro}.{decimal}")
-        else:
-            valor_float = float(valor_sem_pontos)
-
-        return f"{valor_float:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    except ValueError:
-        return valor_str 
-
-def desformatar_moeda(valor_formatado):
-    valor_float_str = valor_formatado.replace('R$', '').replace('.', '').replace(',', '.')
-    try:
-        return float(valor_float_str)
-    except ValueError:
-        return 0.0
+import importlib.util
+import logging
+from cache_logo import URL_LOGO_WHITE
+from motor_calculo import (
+    TAXA_CDI_MERCADO, TIPOS_INVESTIMENTO, TIPOS_ISENTOS,
+    EntradaSimulacao, projetar_rentabilidade,
+)
+from motor_preciso import MODO_PADRAO, MODOS_NUMERICOS, simular_modo
+from cenarios import csv_bytes, grade_cenarios, parquet_bytes
+from curva_cdi import curva_disponivel
+from historico import abrir_historico, chave_simulacao
+import metricas
+from moeda import brl, ler_brl, mascara_brl, numero_br
+from nomes_arquivo import arquivo_carteira, arquivo_proposta
+from tema import TEXTO_PRINCIPAL_ST, TEXTO_SECUNDARIO_ST, VERDE_DESTAQUE
 
 # ===================== CONFIGURAÇÃO =====================
 st.set_page_config(page_title="Traders Corretora - CDB/LCI/LCA", layout="centered")
 
+# ===================== CACHE DE RESULTADOS E ARTEFATOS =====================
+# matplotlib (grafico) e reportlab (proposta_pdf) são importados na primeira
+# renderização, não na abertura da página.
+# Cálculo e gráfico são chaveados só pela EntradaSimulacao: editar nome do
+# cliente/assessor não refaz a projeção nem o gráfico. O PDF inclui os dados
+# do cliente na chave, então baixar a mesma proposta de novo não re-renderiza;
+# os bytes só são gerados no clique do download (data como callable).
+CACHE_MAX_ENTRADAS = 128
+CACHE_TTL = "1h"
+
+# Contadores de acesso/falta dos caches (métricas): a falta é contada dentro da
+# função em cache, que só executa quando o valor não está no cache
+def acessar_cache(nome, funcao, *args):
+    metricas.contar(f"cache.{nome}.acesso")
+    return funcao(*args)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRADAS, ttl=CACHE_TTL, show_spinner=False)
+def simular_cache(entrada, modo):
+    metricas.contar("cache.simulacao.falta")
+    with metricas.etapa("calculo.simular"):
+        resultado = simular_modo(entrada, modo)
+    with metricas.etapa("calculo.projecao"):
+        return resultado, projetar_rentabilidade(entrada, resultado)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRADAS, ttl=CACHE_TTL, show_spinner=False)
+def grafico_cache(entrada, modo):
+    from grafico import grafico_png_tela
+    metricas.contar("cache.grafico.falta")
+    resultado, projecao = acessar_cache("simulacao", simular_cache, entrada, modo)
+    with metricas.etapa("grafico.tela"):
+        return grafico_png_tela(entrada, resultado, projecao)
+
+@st.cache_data(max_entries=32, ttl=CACHE_TTL, show_spinner=False)
+def pdf_cache(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, modo):
+    from proposta_pdf import DadosProposta, criar_pdf_perfeito
+    metricas.contar("cache.pdf.falta")
+    # Proposta já gerada antes (inclusive em outra sessão): bytes do histórico, sem re-renderizar
+    salvo = abrir_historico().pdf(chave_simulacao(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, modo))
+    if salvo is not None:
+        metricas.contar("historico.pdf.acerto")
+        return salvo
+    resultado, projecao = acessar_cache("simulacao", simular_cache, entrada, modo)
+    proposta = DadosProposta(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, resultado, projecao)
+    with metricas.etapa("pdf.total"):
+        return criar_pdf_perfeito(proposta)
+
+# Simulação inversa (taxa necessária, prazo até o alvo e gross-up) da entrada atual.
+# O prazo é uma bisseção com várias passadas do simular_lote: só roda quando a
+# entrada ou o alvo mudam.
+@st.cache_data(max_entries=CACHE_MAX_ENTRADAS, ttl=CACHE_TTL, show_spinner=False)
+def inversa_cache(entrada, alvo):
+    from motor_inverso import prazo_para_alvo, taxa_equivalente, taxa_para_alvo
+    metricas.contar("cache.inversa.falta")
+    pos_fixado = "Pós-fixado" in entrada.tipo_investimento
+    taxa_atual = entrada.perc_cdi if pos_fixado else entrada.taxa_anual
+    destino = "CDB Pré-fixado" if entrada.tipo_investimento in TIPOS_ISENTOS else "LCI"
+    with metricas.etapa("calculo.inversa"):
+        taxa_alvo = float(taxa_para_alvo(entrada.valor_investido, entrada.tipo_investimento, entrada.data_aplicacao,
+                                         entrada.data_vencimento, alvo, taxa_cdi=entrada.taxa_cdi))
+        prazo_alvo = int(prazo_para_alvo(entrada.valor_investido, entrada.tipo_investimento, entrada.data_aplicacao, alvo,
+                                         taxa_anual=entrada.taxa_anual, perc_cdi=entrada.perc_cdi,
+                                         taxa_cdi=entrada.taxa_cdi)[()])
+        taxa_destino = float(taxa_equivalente(taxa_atual, entrada.tipo_investimento, destino, entrada.data_aplicacao,
+                                              entrada.data_vencimento, taxa_cdi=entrada.taxa_cdi))
+    return taxa_alvo, prazo_alvo, destino, taxa_destino
+
+@st.cache_data(max_entries=16, ttl=CACHE_TTL, show_spinner=False)
+def grade_cache(prazos, taxas_pre, taxas_pos, data_aplicacao, taxa_cdi):
+    import numpy as np
+    prazos = np.linspace(*prazos).round().astype(int)
+    taxas = {tipo: np.linspace(*(taxas_pos if "Pós-fixado" in tipo else taxas_pre)) for tipo in TIPOS_INVESTIMENTO}
+    return grade_cenarios(prazos, taxas, data_aplicacao=data_aplicacao, taxa_cdi=taxa_cdi)
+
+# Carteira: todas as posições em uma passada vetorizada (carteira.simular_carteira)
+@st.cache_data(max_entries=16, ttl=CACHE_TTL, show_spinner=False)
+def carteira_cache(linhas, cdi_historico):
+    from carteira import montar_carteira, projetar_carteira, simular_carteira
+    from exportacao import posicoes
+    metricas.contar("cache.carteira.falta")
+    with metricas.etapa("carteira.simular"):
+        resultado = simular_carteira(montar_carteira(posicoes(linhas), cdi_historico))
+        return resultado, projetar_carteira(resultado)
+
+@st.cache_data(max_entries=16, ttl=CACHE_TTL, show_spinner=False)
+def grafico_carteira_cache(linhas, cdi_historico):
+    from grafico import grafico_carteira_png_tela
+    _, projecao = carteira_cache(linhas, cdi_historico)
+    return grafico_carteira_png_tela(projecao.como_projecao())
+
+@st.cache_data(max_entries=16, ttl=CACHE_TTL, show_spinner=False)
+def pdf_carteira_cache(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, linhas, cdi_historico):
+    from proposta_pdf import DadosPropostaCarteira, criar_pdf_carteira
+    metricas.contar("cache.pdf_carteira.falta")
+    resultado, projecao = carteira_cache(linhas, cdi_historico)
+    proposta = DadosPropostaCarteira(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, resultado, projecao.como_projecao())
+    with metricas.etapa("pdf.carteira"):
+        return criar_pdf_carteira(proposta)
+
+@st.cache_data(max_entries=16, ttl=CACHE_TTL, show_spinner=False)
+def exportar_grade_cache(grade_args, formato):
+    grade = grade_cache(*grade_args)
+    return parquet_bytes(grade) if formato == "parquet" else csv_bytes(grade)
+
 # ===================== LOGO + TÍTULO (Streamlit Display) =====================
 st.markdown(
     f"""<div style="text-align: center; margin: 10px 0;">
@@ -135,7 +136,7 @@ st.markdown(f"<p style='text-align: center; color: {TEXTO_SECUNDARIO_ST}; font-s
 st.markdown("---")
 
 # ===================== PARÂMETROS E ESTADOS INICIAIS =====================
-taxa_cdi_mercado = 14.90 
+taxa_cdi_mercado = TAXA_CDI_MERCADO 
 taxa_cdi = taxa_cdi_mercado 
 perc_cdi = 0.0
 taxa_anual = 0.0
@@ -143,55 +144,80 @@ taxa_anual = 0.0
 if 'valor_input' not in st.session_state:
     st.session_state['valor_input'] = "500.000,00"
 
+# Simulação carregada do histórico (sidebar): vira o valor padrão dos campos
+# abaixo. Cada carga muda a geração nas chaves dos campos, então todos voltam
+# ao padrão (o valor carregado), mesmo os que o usuário já tinha editado.
+recuperado = st.session_state.get("simulacao_recuperada", {})
+geracao = st.session_state.get("geracao_recuperada", 0)
+def campo(nome):
+    return f"{nome}_{geracao}" if geracao else nome
+
+def carregar_simulacao(chave):
+    registro = abrir_historico().obter(chave)
+    if registro is None:
+        return
+    st.session_state["simulacao_recuperada"] = {
+        "codigo_cliente": registro.codigo_cliente, "nome_cliente": registro.nome_cliente,
+        "nome_assessor": registro.assessor, "data_simulacao": registro.data_simulacao,
+        "modo": registro.modo, **vars(registro.entrada),
+    }
+    st.session_state['valor_input'] = numero_br(registro.entrada.valor_investido)
+    st.session_state["geracao_recuperada"] = st.session_state.get("geracao_recuperada", 0) + 1
+
 # ===================== DADOS DA SIMULAÇÃO (AJUSTADOS) =====================
 st.subheader("Dados da Simulação")
 c1, c2 = st.columns(2)
 
 with c1:
     # NOVO: CÓDIGO DO CLIENTE
-    codigo_cliente = st.text_input("Código do Cliente", "CLI_001") 
+    codigo_cliente = st.text_input("Código do Cliente", recuperado.get("codigo_cliente", "CLI_001"), key=campo("codigo_cliente"))
     
-    nome_cliente = st.text_input("Nome do Cliente", "João Silva")
-    nome_assessor = st.text_input("Nome do Assessor", "Seu Nome")
+    nome_cliente = st.text_input("Nome do Cliente", recuperado.get("nome_cliente", "João Silva"), key=campo("nome_cliente"))
+    nome_assessor = st.text_input("Nome do Assessor", recuperado.get("nome_assessor", "Seu Nome"), key=campo("nome_assessor"))
 
     valor_investido_str = st.text_input(
         label="Valor investido", 
         value=st.session_state['valor_input'], 
         placeholder="Digite o valor (Ex: 500000,00)",
-        key="valor_bruto_input"
+        key=campo("valor_bruto_input")
     )
     
-    valor_formatado_display = formatar_moeda(valor_investido_str)
+    valor_formatado_display = mascara_brl(valor_investido_str)
     
     if valor_investido_str != valor_formatado_display:
         st.session_state['valor_input'] = valor_formatado_display
     
-    valor_investido = desformatar_moeda(valor_formatado_display)
+    valor_investido = ler_brl(valor_formatado_display)
     
     # Cor de destaque (Verde)
     st.markdown(f"<h3 style='color:{VERDE_DESTAQUE}'>R$ {st.session_state['valor_input']}</h3>", unsafe_allow_html=True)
     
 with c2:
-    data_simulacao = st.date_input("Data da Simulação", datetime.date.today(), format="DD/MM/YYYY")
+    data_simulacao = st.date_input("Data da Simulação", recuperado.get("data_simulacao", datetime.date.today()), format="DD/MM/YYYY",
+                                   key=campo("data_simulacao"))
     
     # ATUALIZADO: Incluir LCI e LCA
     tipo_investimento = st.selectbox(
         "Tipo de Ativo", 
-        ["CDB Pré-fixado", "CDB Pós-fixado (% do CDI)", "LCI", "LCA"]
+        TIPOS_INVESTIMENTO,
+        index=TIPOS_INVESTIMENTO.index(recuperado.get("tipo_investimento", TIPOS_INVESTIMENTO[0])),
+        key=campo("tipo_investimento"),
     )
+    # Taxas do histórico só valem para o mesmo tipo de ativo
+    taxas_recuperadas = recuperado if recuperado.get("tipo_investimento") == tipo_investimento else {}
 
     # Input de Taxa 
     if "Pós-fixado" in tipo_investimento:
-        taxa_cdi = st.number_input("Taxa CDI anual (Benchmark) (%)", value=taxa_cdi_mercado, step=0.05)
-        perc_cdi = st.number_input("Percentual do CDI (%)", value=125.0, step=1.0)
-        taxa_anual = taxa_cdi * (perc_cdi / 100)
-        dias_ano = 252
+        taxa_cdi = st.number_input("Taxa CDI anual (Benchmark) (%)", value=taxas_recuperadas.get("taxa_cdi", taxa_cdi_mercado), step=0.05,
+                                   key=campo("taxa_cdi"))
+        perc_cdi = st.number_input("Percentual do CDI (%)", value=taxas_recuperadas.get("perc_cdi", 125.0), step=1.0,
+                                   key=campo("perc_cdi"))
     else: # Pré-fixado, LCI ou LCA
         taxa_label = f"Taxa anual ({tipo_investimento}) (%)"
         # Ajusta o valor padrão de LCI/LCA, que tendem a ser menores que o CDB devido à isenção
-        default_rate = 14.00 if tipo_investimento in ("LCI", "LCA") else 17.00
-        taxa_anual = st.number_input(taxa_label, value=default_rate, step=0.05)
-        dias_ano = 360
+        default_rate = 14.00 if tipo_investimento in TIPOS_ISENTOS else 17.00
+        taxa_anual = st.number_input(taxa_label, value=taxas_recuperadas.get("taxa_anual", default_rate), step=0.05,
+                                     key=campo(f"taxa_anual_{tipo_investimento}"))
         perc_cdi = 0.0
 
 st.markdown("---")
@@ -200,112 +226,66 @@ st.markdown("---")
 with st.expander("Preferências do Investimento", expanded=True):
     col1, col2 = st.columns(2)
     with col1:
-        data_aplicacao = st.date_input("Data da aplicação", datetime.date.today(), format="DD/MM/YYYY")
+        data_aplicacao = st.date_input("Data da aplicação", recuperado.get("data_aplicacao", datetime.date.today()), format="DD/MM/YYYY",
+                                       key=campo("data_aplicacao"))
     with col2:
-        data_vencimento = st.date_input("Data do resgate", data_aplicacao + relativedelta(months=+12), format="DD/MM/YYYY")
-
-# ===================== CÁLCULOS PRINCIPAIS (ATUALIZADO) =====================
-if valor_investido <= 0: st.warning("Valor investido deve ser maior que zero."); st.stop()
+        data_vencimento = st.date_input("Data do resgate", recuperado.get("data_vencimento", data_aplicacao + relativedelta(months=+12)), format="DD/MM/YYYY",
+                                        key=campo("data_vencimento"))
 
-prazo_meses = (data_vencimento.year - data_aplicacao.year)*12 + (data_vencimento.month - data_aplicacao.month)
-if data_vencimento.day < data_aplicacao.day: prazo_meses -= 1
-prazo_dias = (data_vencimento - data_aplicacao).days
-if prazo_dias <= 0: st.error("Data de resgate deve ser posterior"); st.stop()
+    # CDI realizado (curva importada com curva_cdi.py); após o fim da série vale a taxa CDI informada
+    cdi_historico = False
+    if curva_disponivel():
+        cdi_historico = st.checkbox("Usar CDI histórico (Pós-fixado e benchmark)", value=recuperado.get("cdi_historico", False),
+                                    key=campo("cdi_historico"))
 
-# Cálculo do Montante Bruto (igual para todos)
-taxa_diaria = (1 + taxa_anual/100)**(1/dias_ano) - 1
-montante_bruto = valor_investido * (1 + taxa_diaria)**prazo_dias
-rendimento_bruto = montante_bruto - valor_investido # RENTABILIDADE BRUTA
+    # Modo preciso: arredondamentos de custódia (taxa diária em 8 casas, valores truncados no centavo)
+    modo_numerico = st.radio("Cálculo", MODOS_NUMERICOS, index=MODOS_NUMERICOS.index(recuperado.get("modo", MODO_PADRAO)), horizontal=True, key=campo("modo_numerico"),
+                             format_func={"rapido": "Rápido (estimativa)", "preciso": "Preciso (conciliação com extrato)"}.get)
 
-# CÁLCULO DOS IMPOSTOS (USA FUNÇÃO REFATORADA)
-ir, iof, aliquota_ir = calcular_impostos(prazo_dias, rendimento_bruto, tipo_investimento)
+# ===================== CÁLCULOS PRINCIPAIS (ATUALIZADO) =====================
+if valor_investido <= 0: st.warning("Valor investido deve ser maior que zero."); st.stop()
 
-impostos_totais = ir + iof
-montante_liquido = montante_bruto - impostos_totais
-rendimento_liquido = montante_liquido - valor_investido # RENTABILIDADE LÍQUIDA
+if (data_vencimento - data_aplicacao).days <= 0: st.error("Data de resgate deve ser posterior"); st.stop()
+
+# O cálculo fica no motor_calculo (mesmo núcleo usado fora do Streamlit)
+entrada = EntradaSimulacao(
+    valor_investido=valor_investido,
+    tipo_investimento=tipo_investimento,
+    data_aplicacao=data_aplicacao,
+    data_vencimento=data_vencimento,
+    taxa_anual=taxa_anual,
+    perc_cdi=perc_cdi,
+    taxa_cdi=taxa_cdi,
+    cdi_historico=cdi_historico,
+)
+resultado, projecao = acessar_cache("simulacao", simular_cache, entrada, modo_numerico)
 
-# ===================== CÁLCULOS BENCHMARKS =====================
-taxa_cdi_anual = taxa_cdi / 100 
-taxa_poupanca_anual = 0.0617
-taxa_cdi_diaria_corrida = (1 + taxa_cdi_anual)**(1/365) - 1
-taxa_poupanca_diaria_corrida = (1 + taxa_poupanca_anual)**(1/365) - 1
+montante_bruto = resultado.montante_bruto
+ir, aliquota_ir = resultado.ir, resultado.aliquota_ir
+impostos_totais = resultado.impostos_totais
+montante_liquido = resultado.montante_liquido
+rendimento_liquido = resultado.rendimento_liquido # RENTABILIDADE LÍQUIDA
 
 # ===================== GRÁFICO (Streamlit) =====================
 st.markdown("### Projeção da Rentabilidade")
-datas_graf, bruto_graf = [], []
-bruto_cdi_graf, bruto_poupanca_graf = [], [] 
-data_temp = data_aplicacao
-
-for m in range(prazo_meses + 1):
-    dias = (data_temp - data_aplicacao).days
-    if m == 0: dias = 0
-    if m == prazo_meses: dias = prazo_dias
-        
-    mont = valor_investido * (1 + taxa_diaria)**dias
-    
-    datas_graf.append(data_temp)
-    bruto_graf.append(mont)
-    
-    mont_cdi = valor_investido * (1 + taxa_cdi_diaria_corrida)**dias
-    mont_poupanca = valor_investido * (1 + taxa_poupanca_diaria_corrida)**dias
-    
-    bruto_cdi_graf.append(mont_cdi)
-    bruto_poupanca_graf.append(mont_poupanca)
-    
-    data_temp += relativedelta(months=1)
-    if data_temp > data_vencimento:
-        data_temp = data_vencimento
-        
-if data_vencimento not in datas_graf:
-    datas_graf.append(data_vencimento)
-    bruto_graf.append(montante_bruto)
-    
-    bruto_cdi_graf.append(valor_investido * (1 + taxa_cdi_diaria_corrida)**prazo_dias)
-    bruto_poupanca_graf.append(valor_investido * (1 + taxa_poupanca_diaria_corrida)**prazo_dias)
-
-# Plotagem com tema claro
-fig, ax = plt.subplots(figsize=(12, 6))
-fig.set_facecolor(FUNDO_GRAFICO) 
-ax.set_facecolor(FUNDO_GRAFICO)
-ax.tick_params(axis='x', colors=COR_EIXO_GRAFICO)
-ax.tick_params(axis='y', colors=COR_EIXO_GRAFICO)
-ax.yaxis.label.set_color(COR_EIXO_GRAFICO)
-ax.title.set_color(TEXTO_PRINCIPAL_ST)
-
-ax.plot(datas_graf, bruto_graf, label=f"{tipo_investimento} Bruto", color="#6B48FF", linewidth=2, alpha=0.9)
-ax.plot(datas_graf, bruto_cdi_graf, label="Benchmark: CDI", color="#FF5733", linestyle="--", linewidth=1.5)
-ax.plot(datas_graf, bruto_poupanca_graf, label="Benchmark: Poupança", color="#337AFF", linestyle=":", linewidth=1.5)
-
-ax.set_title("Projeção da Rentabilidade Bruta vs. Benchmarks", fontsize=16, pad=20)
-ax.set_ylabel("Valor em R$")
-ax.legend(fontsize=10, loc='upper left', facecolor=FUNDO_GRAFICO, edgecolor=COR_EIXO_GRAFICO, labelcolor=COR_EIXO_GRAFICO)
-ax.grid(True, alpha=0.3)
-ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-
-# ANOTAÇÕES DE VALORES FINAIS NO GRÁFICO (cor adaptativa)
-dados_finais = [
-    (montante_bruto, "#6B48FF", "Ativo"),
-    (bruto_cdi_graf[-1], "#FF5733", "CDI"),
-    (bruto_poupanca_graf[-1], "#337AFF", "Poupança"),
-]
-
-brl_anot = lambda v: f"R$ {v:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-for valor, cor, nome in dados_finais:
-    ax.annotate(brl_anot(valor),
-                xy=(data_vencimento, valor),
-                xytext=(5, 0),
-                textcoords='offset points',
-                color=TEXTO_PRINCIPAL_ST, 
-                fontsize=9,
-                fontweight='bold',
-                ha='left',
-                va='center')
-    
 
-plt.xticks(rotation=0, ha='center')
-plt.tight_layout()
-st.pyplot(fig)
+# Plotagem com tema claro (PNG em cache; a figura é fechada após renderizar)
+st.image(acessar_cache("grafico", grafico_cache, entrada, modo_numerico), use_container_width=True)
+
+# Números da projeção (bruto, CDI, poupança, IOF/IR acumulados e líquido), gerados só no clique
+with st.expander("Exportar projeção (CSV / Parquet)", expanded=False):
+    from exportacao import projecao_bytes
+    from motor_projecao import GRANULARIDADES
+    granularidade = st.selectbox("Granularidade", GRANULARIDADES, index=GRANULARIDADES.index("mensal"),
+                                 format_func={"diaria": "Diária", "util": "Dias úteis", "mensal": "Mensal"}.get)
+    e1, e2 = st.columns(2)
+    e1.download_button("Baixar CSV", lambda: projecao_bytes(entrada, granularidade, "csv"),
+                       file_name=f"projecao_{codigo_cliente}.csv", mime="text/csv", use_container_width=True)
+    if importlib.util.find_spec("pyarrow"):
+        e2.download_button("Baixar Parquet", lambda: projecao_bytes(entrada, granularidade, "parquet"),
+                           file_name=f"projecao_{codigo_cliente}.parquet", mime="application/octet-stream", use_container_width=True)
+    else:
+        e2.caption("Exportação em Parquet requer o pacote pyarrow")
 
 # ===================== RESULTADO FINAL (STREAMLIT) =====================
 st.markdown("---")
@@ -320,13 +300,12 @@ st.markdown("---") # Separador visual
 
 # Exibição simplificada no Streamlit (mantendo o formato original de 3 colunas)
 col1, col2, col3 = st.columns(3)
-brl = lambda v: f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 col1.metric("Valor Bruto", brl(montante_bruto))
 col2.metric("Impostos", brl(impostos_totais)) # Usa a variável consolidada
 col3.metric("Valor Líquido", brl(montante_liquido), delta=brl(rendimento_liquido))
 
 # NOVO: Mensagem de isenção/tributação
-if tipo_investimento in ("LCI", "LCA"):
+if tipo_investimento in TIPOS_ISENTOS:
     st.markdown(
         f"<p style='text-align:center; color:{VERDE_DESTAQUE}; font-size:14px;'>* **Isenção de Imposto de Renda e IOF:** Ativos de LCI/LCA são isentos para Pessoa Física.</p>",
         unsafe_allow_html=True
@@ -342,429 +321,267 @@ else:
         unsafe_allow_html=True
     )
 
+# ===================== TAXA NECESSÁRIA / EQUIVALENTE (SIMULAÇÃO INVERSA) =====================
+with st.expander("Taxa necessária e equivalência entre produtos", expanded=False):
+    # O corpo do expander roda mesmo fechado: o cálculo só acontece com o toggle ligado
+    if st.toggle("Calcular taxa necessária e equivalência", value=False, key="inversa_ativa"):
+        pos_fixado = "Pós-fixado" in tipo_investimento
+        unidade = "% do CDI" if pos_fixado else "% a.a."
+        alvo_str = st.text_input("Valor líquido desejado no resgate", numero_br(montante_liquido * 1.05))
+        alvo = ler_brl(mascara_brl(alvo_str))
+        taxa_alvo, prazo_alvo, destino, taxa_destino = acessar_cache("inversa", inversa_cache, entrada, alvo)
+
+        if taxa_alvo == taxa_alvo:  # não é NaN
+            st.markdown(f"Taxa necessária para **{brl(alvo)}** líquidos no resgate: **{taxa_alvo:.2f} {unidade}**")
+        else:
+            st.markdown("Valor líquido desejado não é atingível nesse prazo.")
+
+        taxa_atual = perc_cdi if pos_fixado else taxa_anual
+        if prazo_alvo > 0:
+            st.markdown(f"Com a taxa atual ({taxa_atual:.2f} {unidade}), o alvo é atingido em **{prazo_alvo} dias** "
+                        f"({(data_aplicacao + datetime.timedelta(days=prazo_alvo)).strftime('%d/%m/%Y')}).")
+
+        # Gross-up entre isento e tributado para o mesmo prazo
+        st.markdown(f"{tipo_investimento} a {taxa_atual:.2f} {unidade} equivale a **{destino} a {taxa_destino:.2f}% a.a.** no mesmo prazo.")
+
+
+# ===================== GRADE DE CENÁRIOS (PRAZO x TAXA) =====================
+with st.expander("Grade de cenários: rentabilidade líquida por prazo e taxa", expanded=False):
+    # Só calcula quando ligado: a página segue leve para quem não usa a grade
+    if st.toggle("Calcular grade", value=False, key="grade_ativa"):
+        g1, g2, g3 = st.columns(3)
+        with g1:
+            prazo_min, prazo_max = st.slider("Prazo (dias)", 1, 3650, (30, 1800))
+            n_pontos = st.slider("Pontos por eixo", 10, 200, 200, step=10)
+        with g2:
+            taxa_pre_min, taxa_pre_max = st.slider("Taxa anual Pré/LCI/LCA (%)", 1.0, 30.0, (8.0, 20.0), step=0.25)
+        with g3:
+            perc_min, perc_max = st.slider("% do CDI (Pós-fixado)", 50.0, 200.0, (80.0, 130.0), step=1.0)
+
+        grade_args = ((prazo_min, prazo_max, n_pontos), (taxa_pre_min, taxa_pre_max, n_pontos),
+                      (perc_min, perc_max, n_pontos), data_aplicacao, taxa_cdi)
+        grade = grade_cache(*grade_args)
+        tipo_grade = st.selectbox("Produto", TIPOS_INVESTIMENTO, index=TIPOS_INVESTIMENTO.index(tipo_investimento), key="tipo_grade")
+        from grafico import heatmap_cenarios_png
+        st.image(heatmap_cenarios_png(grade, tipo_grade), use_container_width=True)
+
+        import pandas as pd
+        indice_tipo = grade.tipos.index(tipo_grade)
+        st.dataframe(pd.DataFrame(grade.tabela(tipo_grade), index=pd.Index(grade.prazos_dias, name="prazo_dias"),
+                                  columns=[f"{t:.2f}" for t in grade.taxas[indice_tipo]]).round(2))
+
+        # Arquivos gerados só no clique (data como callable), não a cada rerun
+        d1, d2 = st.columns(2)
+        d1.download_button("Exportar grade (CSV)", lambda: exportar_grade_cache(grade_args, "csv"),
+                           file_name="grade_cenarios.csv", mime="text/csv", use_container_width=True)
+        if importlib.util.find_spec("pyarrow"):
+            d2.download_button("Exportar grade (Parquet)", lambda: exportar_grade_cache(grade_args, "parquet"),
+                               file_name="grade_cenarios.parquet", mime="application/octet-stream", use_container_width=True)
+        else:
+            d2.caption("Exportação em Parquet requer o pacote pyarrow")
 
-# ===================== GERAR PNG DO GRÁFICO (FUNDO BRANCO PARA PDF) =====================
-def grafico_png():
-    # Salva o gráfico com fundo branco para o PDF
-    buf = BytesIO()
-    current_title = ax.get_title()
-    
-    # Temporariamente ajusta o fundo do plot para branco antes de salvar para o PDF
-    fig.set_facecolor('white') 
-    ax.set_facecolor('white')
-    ax.tick_params(axis='x', colors='#333333')
-    ax.tick_params(axis='y', colors='#333333')
-    ax.yaxis.label.set_color('#333333')
-    ax.title.set_color('#000000')
-    ax.legend(fontsize=10, loc='upper left', facecolor='white', edgecolor='#333333', labelcolor='#333333')
-
-    plt.savefig(buf, format='png', dpi=300, bbox_inches='tight', facecolor='white') 
-    
-    # Restaura as cores originais do gráfico para a exibição no Streamlit
-    fig.set_facecolor(FUNDO_GRAFICO) 
-    ax.set_facecolor(FUNDO_GRAFICO)
-    ax.tick_params(axis='x', colors=COR_EIXO_GRAFICO)
-    ax.tick_params(axis='y', colors=COR_EIXO_GRAFICO)
-    ax.yaxis.label.set_color(COR_EIXO_GRAFICO)
-    ax.title.set_color(TEXTO_PRINCIPAL_ST)
-    ax.legend(fontsize=10, loc='upper left', facecolor=FUNDO_GRAFICO, edgecolor=COR_EIXO_GRAFICO, labelcolor=COR_EIXO_GRAFICO)
-    
-    buf.seek(0)
-    return buf
-
-# ===================== PDF GERAÇÃO (Tema Claro com 4 Colunas no Resultado Final) =====================
-def criar_pdf_perfeito():
-    # 1. Configuração do Documento
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=15*mm, bottomMargin=15*mm, leftMargin=15*mm, rightMargin=15*mm)
-    story = []
-    
-    # 2. Estilos Personalizados (Branco/Padrão para o PDF)
-    styles = getSampleStyleSheet()
-    
-    # Cores fixas para PDF (Tema Claro)
-    styles.add(ParagraphStyle(name='TitlePDF', fontSize=18, fontName='Helvetica-Bold', alignment=1, spaceAfter=7*mm, textColor=colors.HexColor('#000000')))
-    styles.add(ParagraphStyle(name='SubTitlePDF', fontSize=10, alignment=1, textColor=colors.HexColor('#666666'), spaceAfter=10*mm)) 
-    styles.add(ParagraphStyle(name='SectionTitle', fontSize=10, fontName='Helvetica-Bold', spaceAfter=5*mm, textColor=colors.HexColor('#333333'), alignment=0)) 
-    styles.add(ParagraphStyle(name='DataLabel', fontSize=9, fontName='Helvetica', textColor=colors.HexColor('#666666'), alignment=0))
-    styles.add(ParagraphStyle(name='DataValue', fontSize=11, fontName='Helvetica-Bold', textColor=colors.HexColor('#333333'), alignment=0))
-    styles.add(ParagraphStyle(name='Footer', fontSize=9, alignment=1, textColor=colors.HexColor('#666666')))
-    styles.add(ParagraphStyle(name='PrefValue', fontSize=12, fontName='Helvetica-Bold', textColor=colors.HexColor('#333333'), alignment=0, spaceBefore=3)) 
-    
-    styles.add(ParagraphStyle(name='ResumoStyle',
-        fontName='Helvetica',
-        fontSize=11, 
-        textColor=colors.black,
-        alignment=1, 
-        spaceBefore=5,
-        spaceAfter=5
-    ))
-    styles.add(ParagraphStyle(name='FundamentosStyle', 
-        fontName='Helvetica',
-        fontSize=9, 
-        textColor=colors.HexColor('#444444'),
-        alignment=4, 
-        spaceBefore=5,
-        spaceAfter=5
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='Disclaimer', 
-        fontSize=7, 
-        fontName='Helvetica-Oblique', 
-        alignment=4, 
-        textColor=colors.HexColor('#666666'), 
-        spaceBefore=3*mm, 
-        spaceAfter=0*mm
-    ))
-    
-    # ESTILO DO TÍTULO DE RESULTADO FINAL: Usando margens spaceBefore/spaceAfter para forçar altura vertical
-    styles.add(ParagraphStyle(
-        name='ResultTitleLarge', 
-        fontSize=13, 
-        fontName='Helvetica-Bold', 
-        alignment=1, 
-        textColor=colors.white, 
-        backColor=AZUL_TABELA_PDF, # Cor #864df4 mantida
-        leftPadding=15, 
-        rightPadding=15, 
-        topPadding=0, # REMOVIDO
-        bottomPadding=0, # REMOVIDO
-        spaceBefore=12, # AUMENTADO PARA FORÇAR MAIS ESPAÇO ACIMA DO TEXTO
-        spaceAfter=12, # AUMENTADO PARA FORÇAR MAIS ESPAÇO ABAIXO DO TEXTO
-    ))
-    
-    brl_pdf = lambda v: f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    
-    # 3. Logo (Sempre usando o logo BG-WHITE no PDF)
-    # Chamando a função para carregar o logo de forma robusta
-    logo = carregar_logo()
-    logo.hAlign = 'CENTER'
-    story.append(logo)
-    story.append(Spacer(1, 10*mm)) 
-    
-    # 4. Título Principal
-    
-    titulo_pdf = "Simulação de Investimento - CDB / LCI / LCA"
-    subtitulo_pdf = "Projeção personalizada considerando IR, IOF e Isenções"
-    
-    story.append(Paragraph(titulo_pdf, styles['TitlePDF']))
-    story.append(Paragraph(subtitulo_pdf, styles['SubTitlePDF']))
-    
-    story.append(HRFlowable(width="100%", thickness=0.5, lineCap='round', color=colors.lightgrey, spaceBefore=5, spaceAfter=10))
+# ===================== BOTÃO PDF =====================
+# Download binário direto (um clique): o PDF é gerado no clique, fica em
+# pdf_cache e não trafega pela página a cada rerun. on_click="ignore" evita
+# rerun da página após o download.
+# O callable roda fora do script (comandos st.* ali são ignorados): a falha é
+# registrada na sessão e relançada, para o botão acusar o erro no navegador, e
+# a mensagem aparece abaixo do botão na próxima execução da página.
+log = logging.getLogger("calculadora_cdb")
+erros_download = st.session_state.setdefault("erros_download", {})
+
+def gerar_download(nome, gerar):
+    def gerar_protegido():
+        erros_download.pop(nome, None)
+        try:
+            return gerar()
+        except Exception as e:
+            log.exception("Falha ao gerar %s", nome)
+            erros_download[nome] = f"Ocorreu um erro ao gerar o PDF: {e}"
+            raise
+    return gerar_protegido
+
+def mostrar_erro_download(nome):
+    mensagem = erros_download.pop(nome, None)
+    if mensagem:
+        st.error(mensagem)
+
+# Cada download fica registrado no histórico (fora do pdf_cache, que só
+# executa quando o PDF não está em cache); o blob só é gravado na primeira vez
+def baixar_proposta():
+    pdf = acessar_cache("pdf", pdf_cache, codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, modo_numerico)
+    historico = abrir_historico()
+    chave = chave_simulacao(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, modo_numerico)
+    historico.salvar(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, resultado, modo_numerico,
+                     pdf=None if historico.tem_pdf(chave) else pdf)
+    return pdf
 
-    # 5. DADOS DA SIMULAÇÃO (ATUALIZADO)
-    story.append(Paragraph("DADOS DA SIMULAÇÃO", styles['SectionTitle']))
-    
-    # Determina o rótulo da taxa e IR para o PDF
-    if "Pós-fixado" in tipo_investimento:
-        taxa_retorno_pdf = f"{perc_cdi:.2f}% do CDI"
+st.markdown("---")
+st.download_button(
+    "BAIXAR PROPOSTA PREMIUM",
+    gerar_download("pdf", baixar_proposta),
+    file_name=arquivo_proposta(tipo_investimento, nome_cliente),
+    mime="application/pdf",
+    type="primary",
+    on_click="ignore",
+    use_container_width=True,
+)
+mostrar_erro_download("pdf")
+
+# ===================== HISTÓRICO (SIDEBAR) =====================
+# Simulações salvas (botão abaixo ou ao gerar o PDF) ficam no SQLite local do
+# historico.py; a busca usa os índices por cliente e assessor. O PDF salvo é
+# servido direto do banco, sem re-renderizar.
+def rotulo_registro(registro):
+    ativo = registro.entrada.tipo_investimento.replace(" (% do CDI)", "")
+    pdf = " · PDF" if registro.tem_pdf else ""
+    return f"{registro.criado_em:%d/%m/%Y %H:%M} · {registro.codigo_cliente} · {ativo} · {brl(registro.entrada.valor_investido)}{pdf}"
+
+with st.sidebar:
+    st.subheader("Histórico de simulações")
+    historico = abrir_historico()
+    if st.button("Salvar simulação atual", use_container_width=True):
+        historico.salvar(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, resultado, modo_numerico)
+        historico.descarregar()  # salvamento explícito: já aparece na lista abaixo
+        st.toast("Simulação salva no histórico")
+
+    filtro_cliente = st.text_input("Código do cliente", codigo_cliente)
+    filtro_assessor = st.text_input("Assessor", "")
+    with metricas.etapa("historico.buscar"):
+        registros = historico.buscar(codigo_cliente=filtro_cliente.strip(), assessor=filtro_assessor.strip(), limite=30)
+
+    if not registros:
+        st.caption("Nenhuma simulação salva para este filtro.")
     else:
-        taxa_retorno_pdf = f"{taxa_anual:.2f}% a.a."
-        
-    aliquota_ir_display = f"{aliquota_ir * 100:.1f}%" if aliquota_ir > 0 else "ISENTO"
-    
-    data_formatada = [
-        # NOVO: Código do Cliente e Ativo Simulado
-        [Paragraph("Código do Cliente", styles['DataLabel']), 
-         Paragraph(codigo_cliente, styles['DataValue']), 
-         Paragraph("Ativo Simulado", styles['DataLabel']), 
-         Paragraph(tipo_investimento, styles['DataValue'])],
-         
-        [Paragraph("Nome do cliente", styles['DataLabel']), 
-         Paragraph(nome_cliente, styles['DataValue']), 
-         Paragraph("Data da simulação", styles['DataLabel']), 
-         Paragraph(data_simulacao.strftime('%d/%m/%Y'), styles['DataValue'])],
-        
-        [Paragraph("Valor investido", styles['DataLabel']), 
-         Paragraph(brl_pdf(valor_investido), styles['DataValue']), 
-         Paragraph("Taxa de Retorno", styles['DataLabel']), 
-         Paragraph(taxa_retorno_pdf, styles['DataValue'])],
-         
-        [Paragraph("IR Aplicado", styles['DataLabel']), # NOVO
-         Paragraph(aliquota_ir_display, styles['DataValue']), 
-         Paragraph("Benchmark CDI", styles['DataLabel']), 
-         Paragraph(f"{taxa_cdi:.2f}% a.a.", styles['DataValue'])]
-    ]
-    
-    total_width = A4[0] - 30*mm 
-    colWidths = [total_width * 0.22, total_width * 0.28, total_width * 0.22, total_width * 0.28] 
-    t_dados = Table(data_formatada, colWidths=colWidths)
-    
-    t_dados.hAlign = 'LEFT' 
-
-    t_dados.setStyle(TableStyle([
-        ('GRID', (0,0), (-1,-1), 0.5, colors.lightgrey),
-        ('LEFTPADDING', (0,0), (-1,-1), 10),
-        ('RIGHTPADDING', (0,0), (-1,-1), 5),
-        ('TOPPADDING', (0,0), (-1,-1), 5),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 5),
-        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-    ]))
-    story.append(t_dados)
-    
-    story.append(Spacer(1, 5*mm)) 
-
-    story.append(HRFlowable(width="100%", thickness=0.5, lineCap='round', color=colors.lightgrey, spaceBefore=5, spaceAfter=10))
-    
-    # 6. PREFERÊNCIAS DO INVESTIMENTO (ATUALIZADO)
-    story.append(Paragraph("PREFERÊNCIAS DO INVESTIMENTO", styles['SectionTitle']))
-    
-    icone_data_app = Paragraph("<font face='ZapfDingbats' size='10' color='#1e3a8a'>d</font>", styles['DataLabel'])
-    icone_data_venc = Paragraph("<font face='ZapfDingbats' size='10' color='#1e3a8a'>d</font>", styles['DataLabel'])
-    icone_consideracoes = Paragraph("<font face='ZapfDingbats' size='10' color='#1e3a8a'>I</font>", styles['DataLabel'])
-    
-    # ATUALIZADO: Considerações
-    consideracoes_texto = "Isento de IR/IOF" if tipo_investimento in ("LCI", "LCA") else "IR, IOF"
-    
-    prefs_data = [
-        [icone_data_app, Paragraph("Data da Aplicação", styles['DataLabel']), 
-         icone_data_venc, Paragraph("Data do Vencimento", styles['DataLabel']), 
-         icone_consideracoes, Paragraph("Considerações", styles['DataLabel'])],
-        
-        [Spacer(1,1), Paragraph(data_aplicacao.strftime('%d/%m/%Y'), styles['PrefValue']), 
-         Spacer(1,1), Paragraph(data_vencimento.strftime('%d/%m/%Y'), styles['PrefValue']), 
-         Spacer(1,1), Paragraph(consideracoes_texto, styles['PrefValue'])]
-    ]
-    
-    largura_pref = total_width / 3
-    colWidths_prefs = [8*mm, largura_pref - 8*mm, 8*mm, largura_pref - 8*mm, 8*mm, largura_pref - 8*mm]
-    
-    t_prefs = Table(prefs_data, colWidths=colWidths_prefs)
-    t_prefs.hAlign = 'LEFT'
-    
-    t_prefs.setStyle(TableStyle([
-        ('GRID', (0,0), (1,1), 0.5, colors.lightgrey), 
-        ('GRID', (2,0), (3,1), 0.5, colors.lightgrey), 
-        ('GRID', (4,0), (5,1), 0.5, colors.lightgrey), 
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-        ('LEFTPADDING', (0,0), (-1,-1), 5),
-        ('RIGHTPADDING', (0,0), (-1,-1), 2),
-        ('TOPPADDING', (0,0), (-1,-1), 5),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 5),
-        ('VALIGN', (0,0), (0,1), 'TOP'),
-        ('VALIGN', (2,0), (2,1), 'TOP'),
-        ('VALIGN', (4,0), (4,1), 'TOP'),
-    ]))
-    
-    story.append(t_prefs)
-    
-    story.append(HRFlowable(width="100%", thickness=0.5, lineCap='round', color=colors.lightgrey, spaceBefore=10, spaceAfter=10)) 
-
-    # 7. RESUMO DA OPERAÇÃO
-    story.append(Paragraph("RESUMO DA OPERAÇÃO", styles['SectionTitle'])) 
-    
-    meses = prazo_meses 
-    
-    valor_liquido_formatado = f"<b><font color='{VERDE_DESTAQUE}'>{brl_pdf(montante_liquido)}</font></b>" 
-    
-    taxa_retorno_resumo = taxa_retorno_pdf
-    
-    resumo_texto = f"Com um investimento inicial de {brl_pdf(valor_investido)} em um ativo de {tipo_investimento} com taxa de {taxa_retorno_resumo} por um período de {meses} meses, o valor líquido será de {valor_liquido_formatado}."
-
-    resumo_paragrafo = Paragraph(resumo_texto, styles['ResumoStyle'])
-
-    t_resumo = Table([[resumo_paragrafo]], colWidths=[total_width])
-    t_resumo.hAlign = 'CENTER'
-
-    t_resumo.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,-1), colors.white),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('INNERPADDING', (0,0), (-1,-1), 0), 
-        ('LEFTPADDING', (0,0), (-1,-1), 0),
-        ('RIGHTPADDING', (0,0), (-1,-1), 0),
-    ]))
-
-    story.append(t_resumo)
-    
-    story.append(Spacer(1, 5*mm)) 
-
-    # 8. RESULTADO FINAL (4 Colunas com Ajustes de Fonte/Espaçamento)
-    
-    # Dados que incluem o principal
-    valor_final_bruto = montante_bruto 
-    valor_final_liquido = montante_liquido 
-    # Já temos o valor de impostos_totais calculado
-    impostos_totais_display = impostos_totais
-
-    resultado_completo = [
-        # Linha 1: Título principal. Usa o spaceBefore/spaceAfter do estilo.
-        [Paragraph("<b>RESULTADO FINAL</b>", styles['ResultTitleLarge']), 
-         "", 
-         "",
-         ""],
-        
-        # Linha 2: Cabeçalho das 4 colunas
-        ["VALOR INVESTIDO", "VALOR BRUTO", "IMPOSTOS", "VALOR LÍQUIDO"], 
-        
-        # Linha 3: Valores das 4 colunas
-        [brl_pdf(valor_investido), 
-         brl_pdf(valor_final_bruto), 
-         brl_pdf(impostos_totais_display), 
-         brl_pdf(valor_final_liquido)],
-    ]
-    
-    colWidths_4 = [total_width/4] * 4
-    t_res_final = Table(resultado_completo, colWidths=colWidths_4)
-    t_res_final.hAlign = 'CENTER'
-
-    t_res_final.setStyle(TableStyle([
-        # Título principal (RESULTADO FINAL)
-        ('SPAN', (0,0), (3,0)), 
-        ('BACKGROUND', (0,0), (3,0), AZUL_TABELA_PDF), # Cor #864df4 mantida
-        ('LINEBELOW', (0,0), (3,0), 1, colors.white), 
-        ('VALIGN', (0,0), (3,0), 'MIDDLE'), # Garante alinhamento vertical
-        
-        # Cabeçalho das 4 colunas (Fonte e Padding ajustados para caber)
-        ('BACKGROUND', (0,1), (3,1), AZUL_TABELA_PDF), 
-        ('TEXTCOLOR', (0,1), (3,1), colors.white),
-        ('FONTSIZE', (0,1), (3,1), 9), 
-        ('FONTNAME', (0,1), (3,1), 'Helvetica-Bold'),
-        ('TOPPADDING', (0,1), (3,1), 4),
-        ('BOTTOMPADDING', (0,1), (3,1), 4),
-        
-        # Valores das 4 colunas (Fonte e Padding ajustados)
-        ('BACKGROUND', (0,2), (3,2), AZUL_TABELA_PDF), 
-        ('TEXTCOLOR', (0,2), (3,2), colors.white),
-        ('FONTSIZE', (0,2), (3,2), 14), 
-        ('FONTNAME', (0,2), (3,2), 'Helvetica-Bold'),
-        ('TOPPADDING', (0,2), (3,2), 8),
-        ('BOTTOMPADDING', (0,2), (3,2), 8),
-        
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('GRID', (0,0), (-1,-1), 0, colors.transparent),
-    ]))
-    story.append(t_res_final)
-    
-    story.append(HRFlowable(width="100%", thickness=0.5, lineCap='round', color=colors.lightgrey, spaceBefore=10, spaceAfter=10)) 
-
-    # 9. FUNDAMENTOS DO ATIVO (ATUALIZADO)
-    story.append(Paragraph(f"FUNDAMENTOS DO ATIVO ({tipo_investimento})", styles['SectionTitle'])) 
-    
-    if tipo_investimento in ("LCI", "LCA"):
-        fundamentos_p1 = (
-            f"A <b>{tipo_investimento}</b> (Letra de Crédito {'Imobiliário' if tipo_investimento == 'LCI' else 'do Agronegócio'}) "
-            "é um título de renda fixa emitido por bancos para financiar os respectivos setores. É considerado um investimento de "
-            "baixo risco, conta com a garantia do <b>FGC</b> (Fundo Garantidor de Créditos) e, para Pessoa Física, é "
-            "<b>ISENTO de Imposto de Renda e IOF</b>, o que o torna altamente atrativo."
+        por_chave = {registro.chave: registro for registro in registros}
+        chave_escolhida = st.selectbox("Simulações salvas", list(por_chave), format_func=lambda c: rotulo_registro(por_chave[c]))
+        escolhido = por_chave[chave_escolhida]
+        st.button("Carregar nos campos", on_click=carregar_simulacao, args=(chave_escolhida,), use_container_width=True)
+        if escolhido.tem_pdf:
+            st.download_button(
+                "Baixar PDF salvo",
+                gerar_download("pdf_historico", lambda: historico.pdf(chave_escolhida)),
+                file_name=arquivo_proposta(escolhido.entrada.tipo_investimento, escolhido.nome_cliente),
+                mime="application/pdf", on_click="ignore", use_container_width=True,
+            )
+            mostrar_erro_download("pdf_historico")
+
+# ===================== CARTEIRA (VÁRIAS POSIÇÕES) =====================
+# Posições digitadas ou importadas (mesmas colunas do lote_propostas); o
+# cálculo é uma passada vetorizada sobre todas as posições, em cache pelas linhas.
+with st.expander("Carteira: várias posições com projeção consolidada", expanded=False):
+    if st.toggle("Simular carteira", value=False, key="carteira_ativa"):
+        import pandas as pd
+        arquivo = st.file_uploader("Importar posições (CSV ou Parquet: codigo, valor, ativo, taxa, data_aplicacao, data_vencimento)",
+                                   type=["csv", "parquet"], key="carteira_arquivo")
+        tabela_carteira = None
+        if arquivo is not None:
+            from exportacao import tabela_carteira as ler_tabela_carteira
+            try:
+                tabela_carteira = ler_tabela_carteira(arquivo, arquivo.name)
+            except (ValueError, ImportError) as e:
+                st.error(f"Não foi possível importar {arquivo.name}: {e}")
+        origem_carteira = arquivo.file_id if tabela_carteira is not None else "manual"
+        if tabela_carteira is None:
+            # Começa pela posição simulada acima
+            tabela_carteira = pd.DataFrame([{
+                "codigo": codigo_cliente, "valor": valor_investido, "ativo": tipo_investimento,
+                "taxa": perc_cdi if "Pós-fixado" in tipo_investimento else taxa_anual,
+                "data_aplicacao": data_aplicacao, "data_vencimento": data_vencimento, "taxa_cdi": taxa_cdi,
+            }])
+        colunas_carteira = ["codigo", "valor", "ativo", "taxa", "data_aplicacao", "data_vencimento", "taxa_cdi"]
+        if "taxa_cdi" not in tabela_carteira:
+            tabela_carteira["taxa_cdi"] = taxa_cdi
+        tabela_carteira = st.data_editor(
+            tabela_carteira[colunas_carteira], num_rows="dynamic", use_container_width=True, hide_index=True,
+            key=f"carteira_editor_{origem_carteira}",
+            column_config={
+                "codigo": st.column_config.TextColumn("Código"),
+                "valor": st.column_config.NumberColumn("Valor (R$)", min_value=0.0, format="%.2f"),
+                "ativo": st.column_config.SelectboxColumn("Ativo", options=TIPOS_INVESTIMENTO, required=True),
+                "taxa": st.column_config.NumberColumn("Taxa (% a.a. ou % do CDI)", format="%.2f"),
+                "data_aplicacao": st.column_config.DateColumn("Aplicação", format="DD/MM/YYYY"),
+                "data_vencimento": st.column_config.DateColumn("Vencimento", format="DD/MM/YYYY"),
+                "taxa_cdi": st.column_config.NumberColumn("CDI (% a.a.)", format="%.2f"),
+            },
         )
-        fundamentos_p2 = (
-            "As Letras de Crédito geralmente têm prazos de vencimento definidos e carência, não permitindo resgate diário. "
-            "A rentabilidade é tipicamente <b>Pré-fixada</b> ou <b>Pós-fixada</b> (atrelada ao CDI). A isenção de imposto faz com "
-            "que a rentabilidade bruta seja igual à líquida."
-        )
-    else:
-        fundamentos_p1 = (
-            "O <b>CDB</b> (Certificado de Depósito Bancário) é um título de renda fixa emitido por bancos para "
-            "captar recursos. É considerado um investimento de baixo risco e conta com a garantia do "
-            "<b>FGC</b> (Fundo Garantidor de Créditos), que cobre até R$ 250.000 por CPF e por instituição financeira, "
-            "oferecendo segurança ao investidor. A rentabilidade pode ser <b>Pré-fixada</b> (taxa definida no início) "
-            "ou <b>Pós-fixada</b> (geralmente atrelada a um percentual do CDI)."
+        # Só linhas completas (a linha nova do editor chega vazia)
+        linhas_carteira = (tabela_carteira.dropna(subset=["valor", "ativo", "taxa", "data_aplicacao", "data_vencimento"])
+                           .assign(codigo=lambda df: df["codigo"].fillna("").astype(str)).to_dict("records"))
+        try:
+            carteira_resultado, carteira_projecao = acessar_cache("carteira", carteira_cache, linhas_carteira, cdi_historico)
+        except ValueError as e:
+            st.error(f"Carteira inválida: {e}")
+        else:
+            k1, k2, k3, k4 = st.columns(4)
+            k1.metric("Investido", brl(carteira_resultado.valor_investido))
+            k2.metric("Bruto", brl(carteira_resultado.montante_bruto))
+            k3.metric("Impostos", brl(carteira_resultado.impostos_totais))
+            k4.metric("Líquido", brl(carteira_resultado.montante_liquido), delta=brl(carteira_resultado.rendimento_liquido))
+            st.image(grafico_carteira_cache(linhas_carteira, cdi_historico), use_container_width=True)
+
+            posicoes_carteira = carteira_resultado.posicoes
+            st.dataframe(pd.DataFrame({
+                "Código": carteira_resultado.carteira.codigos,
+                "Ativo": carteira_resultado.carteira.tipos,
+                "Prazo (dias)": posicoes_carteira.prazo_dias,
+                "Bruto": posicoes_carteira.montante_bruto.round(2),
+                "IR + IOF": posicoes_carteira.impostos_totais.round(2),
+                "Líquido": posicoes_carteira.montante_liquido.round(2),
+            }), use_container_width=True, hide_index=True)
+
+            from carteira import COLUNAS_FLUXOS, fluxos_carteira
+            from exportacao import abrir_escritor
+            def fluxos_csv():
+                import io
+                buffer = io.StringIO()
+                escritor = abrir_escritor(buffer, COLUNAS_FLUXOS, "csv")
+                escritor.escrever(fluxos_carteira(carteira_resultado))
+                return buffer.getvalue().encode("utf-8")
+
+            f1, f2 = st.columns(2)
+            f1.download_button("Fluxos de caixa (CSV)", fluxos_csv, file_name=f"fluxos_carteira_{codigo_cliente}.csv",
+                               mime="text/csv", use_container_width=True)
+            f2.download_button(
+                "PROPOSTA DA CARTEIRA (PDF)",
+                gerar_download("pdf_carteira", lambda: acessar_cache("pdf_carteira", pdf_carteira_cache, codigo_cliente, nome_cliente,
+                                                                     nome_assessor, data_simulacao, linhas_carteira, cdi_historico)),
+                file_name=arquivo_carteira(nome_cliente),
+                mime="application/pdf", type="primary", on_click="ignore", use_container_width=True,
+            )
+            mostrar_erro_download("pdf_carteira")
+
+# ===================== DESEMPENHO (MÉTRICAS DO PROCESSO) =====================
+# Etapas, caches e tamanho do PDF medidos por metricas; a coleta vale para o
+# processo inteiro (todas as sessões) e, desligada, não tem custo relevante.
+with st.expander("Desempenho", expanded=False):
+    metricas.ativar(st.toggle("Coletar métricas", value=metricas.ativo(), key="metricas_ativas"))
+    dados_metricas = metricas.instantaneo()
+    if dados_metricas["etapas"]:
+        st.markdown("**Etapas**")
+        st.dataframe(
+            [{"etapa": nome, "chamadas": e["chamadas"], "média (ms)": round(e["media_ms"], 2),
+              "máx (ms)": round(e["max_ms"], 2), "última (ms)": round(e["ultimo_ms"], 2)}
+             for nome, e in sorted(dados_metricas["etapas"].items())],
+            use_container_width=True, hide_index=True,
         )
-        fundamentos_p2 = (
-            "Em relação às características de resgate, a <b>Liquidez</b> do CDB pode ser diária (ideal para reserva de emergência) "
-            "ou apenas no vencimento (oferecendo historicamente maior retorno). A tributação segue a tabela regressiva do "
-            "<b>Imposto de Renda (IR)</b>, onde o imposto diminui quanto maior o prazo do investimento (chegando a 15% após 720 dias). "
-            "O <b>Imposto sobre Operações Financeiras (IOF)</b> é isento para resgates feitos após 30 dias."
+    contadores = dados_metricas["contadores"]
+    caches = sorted({nome.split(".")[1] for nome in contadores if nome.startswith("cache.")})
+    if caches:
+        st.markdown("**Caches**")
+        st.dataframe(
+            [{"cache": nome, "acessos": contadores.get(f"cache.{nome}.acesso", 0),
+              "acertos": contadores.get(f"cache.{nome}.acesso", 0) - contadores.get(f"cache.{nome}.falta", 0),
+              "faltas": contadores.get(f"cache.{nome}.falta", 0)} for nome in caches],
+            use_container_width=True, hide_index=True,
         )
-
-    story.append(Paragraph(fundamentos_p1, styles['FundamentosStyle']))
-    story.append(Spacer(1, 3*mm)) 
-    story.append(Paragraph(fundamentos_p2, styles['FundamentosStyle']))
-    
-    story.append(Spacer(1, 5*mm)) 
-    
-    story.append(PageBreak()) 
-    
-    # 10. PROJEÇÃO DA RENTABILIDADE (Gráfico com Benchmarks) - Página 2
-    story.append(Paragraph("PROJEÇÃO DA RENTABILIDADE BRUTA vs. BENCHMARKS", styles['SectionTitle']))
-    
-    img = Image(grafico_png(), width=180*mm, height=90*mm)
-    img.hAlign = 'CENTER'
-    story.append(img)
-    
-    nota_benchmarks = (
-        f"Benchmarks: CDI ({taxa_cdi:.2f}% a.a.) e Poupança (Proxy 6.17% a.a.). " 
-        "Projeção baseada em taxas atuais, podendo variar conforme mercado. Rentabilidades dos benchmarks são brutas (sem IR)."
-    )
-    
-    story.append(Paragraph(nota_benchmarks, 
-                           ParagraphStyle(name='GraphNote', fontSize=9, alignment=1, textColor=colors.HexColor('#666666'), spaceAfter=10*mm))) 
-
-    # 11. BLOCO: COMPARAÇÃO DE RESULTADOS BRUTOS
-    story.append(Paragraph("COMPARATIVO DE RESULTADOS BRUTOS (No Vencimento)", styles['SectionTitle'])) 
-
-    valor_bruto_ativo = montante_bruto
-    valor_bruto_cdi = bruto_cdi_graf[-1] 
-    valor_bruto_poupanca = bruto_poupanca_graf[-1]
-
-    valores_comparacao = [valor_bruto_ativo, valor_bruto_cdi, valor_bruto_poupanca]
-    max_valor = max(valores_comparacao)
-    
-    def formatar_valor_comparacao(valor):
-        cor = VERDE_DESTAQUE if valor == max_valor else '#333333'
-        return Paragraph(f"<b><font size='12' color='{cor}'>{brl_pdf(valor)}</font></b>", 
-                         ParagraphStyle(name='CompValue', alignment=1, fontName='Helvetica'))
-
-    dados_comparacao = [
-        [f"{tipo_investimento} (Simulado)", "CDI (Benchmark)", "Poupança (Benchmark)"],
-        [formatar_valor_comparacao(valor_bruto_ativo), 
-         formatar_valor_comparacao(valor_bruto_cdi),
-         formatar_valor_comparacao(valor_bruto_poupanca)]
-    ]
-    
-    colWidths_comp = [total_width/3] * 3
-    t_comparacao = Table(dados_comparacao, colWidths=colWidths_comp)
-    t_comparacao.hAlign = 'CENTER'
-
-    t_comparacao.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#f0f0f0')), 
-        ('TEXTCOLOR', (0,0), (-1,0), colors.HexColor('#333333')),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.lightgrey),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('TOPPADDING', (0,0), (-1,-1), 8),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 8),
-        ('BACKGROUND', (0,1), (-1,1), colors.white), 
-    ]))
-    
-    story.append(t_comparacao)
-    
-    story.append(Spacer(1, 10*mm)) 
-    
-    # 12. Rodapé personalizado (Assessor)
-    story.append(Paragraph(f"Simulação elaborada por <b>{nome_assessor}</b> em {data_simulacao.strftime('%d/%m/%Y')}", styles['Footer']))
-
-    # 13. Disclaimer Legal com Título
-    story.append(Spacer(1, 5*mm)) 
-    story.append(Paragraph("DISCLAIMER", styles['SectionTitle'])) 
-    
-    disclaimer_text = (
-        "A Traders Distribuidora de Valores Mobiliários Ltda., com CNPJ sob o nº 62.280.490/0001-84 é uma instituição financeira autorizada a funcionar pelo Banco Central do Brasil, que atua como Participante de Negociação (PN) e realiza suas operações através de um Participante de Negociação Pleno (PNP), Terra Investimentos Ltda. Toda comunicação através da rede mundial de computadores está sujeita a interrupções ou atrasos, podendo impedir ou prejudicar o envio das ordens ou a recepção de informações atualizadas. Antes de tomar qualquer decisão de investimento, recomendamos que os investidores avaliem cuidadosamente seus objetivos financeiros e seu perfil de risco. A Traders DTVM exime-se de responsabilidade por danos sofridos por seus clientes, por força de falha de serviços disponibilizados por terceiros e não se responsabiliza por eventuais perdas financeiras decorrentes da negociação de ativos, nem garante a rentabilidade dos investimentos. O histórico de desempenho de qualquer ativo não assegura resultados futuros. A negociação em mercados financeiros está sujeita a volatilidade e pode envolver riscos significantes, incluindo, mas não se limitando ao risco de mercado, risco de liquidez e risco de crédito."
-    )
-    story.append(Paragraph(disclaimer_text, styles['Disclaimer']))
-
-
-    doc.build(story)
-    buffer.seek(0)
-    return buffer.getvalue()
-
-# ===================== BOTÃO PDF =====================
-st.markdown("---")
-if st.button("BAIXAR PROPOSTA PREMIUM", type="primary", use_container_width=True):
-    with st.spinner("Gerando sua proposta premium..."):
-        try:
-            pdf_data = criar_pdf_perfeito()
-            b64 = base64.b64encode(pdf_data).decode()
-            nome_arq = f"Proposta_{tipo_investimento.replace(' ', '_')}_{nome_cliente.replace(' ', '_')}.pdf"
-            href = f'<a href="data:application/pdf;base64,{b64}" download="{nome_arq}"><h3 style="text-align:center; color:white;">BAIXAR PROPOSTA PREMIUM</h3></a>'
-            st.markdown(href, unsafe_allow_html=True)
-            st.balloons()
-            st.success("Proposta premium gerada com sucesso!")
-        except Exception as e:
-            st.error(f"Ocorreu um erro ao gerar o PDF: {e}")
+    tamanho_pdf = dados_metricas["observacoes"].get("pdf.bytes")
+    if tamanho_pdf:
+        st.markdown(f"Último PDF: **{tamanho_pdf['ultimo'] / 1024:.1f} KB** (média de {tamanho_pdf['media'] / 1024:.1f} KB)")
+    if metricas.ativo():
+        if st.button("Zerar métricas"):
+            metricas.zerar()
+        st.code(metricas.prometheus(), language="text")
 
 
 # ===================== RODAPÉ STREAMLIT =====================
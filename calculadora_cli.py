@@ -0,0 +1,230 @@
+# ===================== LINHA DE COMANDO (calculadora-cdb) =====================
+# Ponto de entrada para cron e pipelines, sem Streamlit:
+#   simulate   um caso (argumentos) ou um JSON por linha na entrada padrão -> JSON
+#   batch      arquivo de posições -> resultados (CSV/Parquet), em blocos e em paralelo
+#   proposals  propostas em PDF em lote (lote_propostas)
+#   bench      vazão do cálculo escalar e do lote
+#
+# A entrada é lida como fluxo ("-" = entrada padrão), então arquivos muito
+# grandes nunca são carregados inteiros.
+#
+# Exemplos:
+#   calculadora-cdb simulate --tipo LCI --valor 10000 --aplicacao 2025-01-02 --vencimento 2026-01-02 --taxa 12
+#   cat casos.jsonl | calculadora-cdb simulate
+#   calculadora-cdb batch carteira.csv resultados.parquet --workers 8
+#   zcat carteira.csv.gz | calculadora-cdb batch - - > resultados.csv
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import asdict
+
+from motor_calculo import (
+    TAXA_CDI_MERCADO, TIPOS_INVESTIMENTO, EntradaSimulacao, eh_pos_fixado, entrada_de_json, simular,
+)
+from motor_preciso import MODO_PADRAO, MODOS_NUMERICOS, simular_modo
+
+log = logging.getLogger("calculadora_cdb")
+
+
+# ===================== simulate =====================
+
+def _imprimir(resultado, entrada=None):
+    dados = asdict(resultado)
+    if entrada is not None:
+        dados = {"entrada": {k: (v.isoformat() if isinstance(v, datetime.date) else v) for k, v in asdict(entrada).items()},
+                 "resultado": dados}
+    sys.stdout.write(json.dumps(dados, ensure_ascii=False) + "\n")
+
+
+def comando_simulate(args):
+    if args.tipo is not None:
+        tipo = args.tipo
+        entrada = EntradaSimulacao(
+            valor_investido=args.valor,
+            tipo_investimento=tipo,
+            data_aplicacao=datetime.date.fromisoformat(args.aplicacao),
+            data_vencimento=datetime.date.fromisoformat(args.vencimento),
+            taxa_anual=0.0 if eh_pos_fixado(tipo) else args.taxa,
+            perc_cdi=args.taxa if eh_pos_fixado(tipo) else 0.0,
+            taxa_cdi=args.taxa_cdi,
+            cdi_historico=args.cdi_historico,
+        )
+        _imprimir(simular_modo(entrada, args.modo), entrada if args.com_entrada else None)
+        return 0
+
+    # Um objeto JSON por linha (mesmos campos do POST /simulate), uma resposta por linha
+    erros = 0
+    for numero, linha in enumerate(sys.stdin, start=1):
+        if not linha.strip():
+            continue
+        try:
+            entrada = entrada_de_json(json.loads(linha))
+            _imprimir(simular_modo(entrada, args.modo), entrada if args.com_entrada else None)
+        except Exception as e:
+            erros += 1
+            sys.stdout.write(json.dumps({"linha": numero, "erro": f"{e}"}, ensure_ascii=False) + "\n")
+    return 1 if erros else 0
+
+
+# ===================== batch =====================
+
+def _linhas(caminho):
+    if caminho == "-":
+        from lote_propostas import ler_csv
+        return ler_csv(sys.stdin)
+    from lote_propostas import ler_clientes
+    return ler_clientes(caminho)
+
+
+# Blocos simulados em processos; os resultados são gravados na ordem da entrada,
+# com no máximo 2 blocos por worker em voo (memória limitada)
+def comando_batch(args):
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    from exportacao import COLUNAS_LOTE, LINHAS_POR_BLOCO, abrir_escritor, blocos, posicoes, simular_bloco
+
+    # Parquet é binário: na saída padrão vai pelo buffer de bytes
+    destino = args.saida
+    if args.saida == "-":
+        destino = sys.stdout.buffer if args.formato == "parquet" else sys.stdout
+    escritor = abrir_escritor(destino, COLUNAS_LOTE, args.formato)
+    workers = args.workers or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    total = 0
+    simular_bloco_modo = partial(simular_bloco, modo=args.modo)
+    try:
+        fila = blocos(posicoes(_linhas(args.entrada)), args.bloco or LINHAS_POR_BLOCO)
+        if workers == 1:
+            for bloco in fila:
+                escritor.escrever(simular_bloco_modo(bloco))
+                total += len(bloco)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pendentes = deque()
+                for bloco in fila:
+                    pendentes.append((len(bloco), executor.submit(simular_bloco_modo, bloco)))
+                    if len(pendentes) >= workers * 2:
+                        tamanho, futuro = pendentes.popleft()
+                        escritor.escrever(futuro.result())
+                        total += tamanho
+                while pendentes:
+                    tamanho, futuro = pendentes.popleft()
+                    escritor.escrever(futuro.result())
+                    total += tamanho
+    finally:
+        escritor.fechar()
+
+    duracao = time.perf_counter() - inicio
+    log.info("%d posições em %.2fs (%.0f/s, %d workers)", total, duracao, total / duracao if duracao else 0, workers)
+    return 0
+
+
+# ===================== proposals =====================
+
+def comando_proposals(args):
+    from lote_propostas import gerar_propostas
+    resumo = gerar_propostas(args.entrada, args.saida, workers=args.workers, tamanho_bloco=args.bloco)
+    return 1 if resumo["erros"] else 0
+
+
+# ===================== bench =====================
+
+def comando_bench(args):
+    entrada = EntradaSimulacao(500000.0, "CDB Pós-fixado (% do CDI)", datetime.date(2025, 1, 2),
+                               datetime.date(2030, 1, 2), perc_cdi=110.0)
+    simular(entrada)  # aquecimento (calendário e tabelas)
+    inicio = time.perf_counter()
+    for _ in range(args.n):
+        simular(entrada)
+    escalar = args.n / (time.perf_counter() - inicio)
+    resumo = {"simular_por_segundo": round(escalar)}
+
+    try:
+        import numpy as np
+        from motor_lote import simular_lote
+    except ImportError:
+        resumo["lote"] = "numpy não instalado"
+    else:
+        rng = np.random.default_rng(0)
+        n = args.linhas
+        aplicacao = np.datetime64("2025-01-02") + rng.integers(0, 365, n)
+        simular_lote(1.0, "LCI", "2025-01-02", "2026-01-02")  # aquecimento
+        inicio = time.perf_counter()
+        simular_lote(rng.uniform(1e3, 1e6, n), rng.integers(0, len(TIPOS_INVESTIMENTO), n),
+                     aplicacao, aplicacao + rng.integers(1, 3650, n), taxa_anual=12.0, perc_cdi=110.0)
+        duracao = time.perf_counter() - inicio
+        resumo.update(lote_linhas=n, lote_segundos=round(duracao, 4), lote_linhas_por_segundo=round(n / duracao))
+    print(json.dumps(resumo, ensure_ascii=False))
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="calculadora-cdb", description="Simulador de CDB/LCI/LCA sem interface.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("simulate", help="simula um caso (ou JSON por linha na entrada padrão)")
+    p.add_argument("--tipo", choices=TIPOS_INVESTIMENTO, help="sem --tipo, lê JSON por linha da entrada padrão")
+    p.add_argument("--valor", type=float, default=1000.0)
+    p.add_argument("--aplicacao", default=datetime.date.today().isoformat(), help="AAAA-MM-DD")
+    p.add_argument("--vencimento", help="AAAA-MM-DD")
+    p.add_argument("--taxa", type=float, default=0.0, help="taxa anual (%%) ou %% do CDI no Pós-fixado")
+    p.add_argument("--taxa-cdi", type=float, default=TAXA_CDI_MERCADO)
+    p.add_argument("--cdi-historico", action="store_true", help="usa a curva do CDI importada (curva_cdi)")
+    p.add_argument("--com-entrada", action="store_true", help="inclui a entrada na saída")
+    p.add_argument("--modo", choices=MODOS_NUMERICOS, default=MODO_PADRAO,
+                   help="rapido (float64) ou preciso (arredondamentos de custódia, motor_preciso)")
+    p.set_defaults(funcao=comando_simulate)
+
+    p = sub.add_parser("batch", help="posições (CSV/Parquet ou '-') -> resultados (CSV/Parquet ou '-')")
+    p.add_argument("entrada")
+    p.add_argument("saida")
+    p.add_argument("--workers", type=int, default=None, help="processos (padrão: número de CPUs)")
+    p.add_argument("--bloco", type=int, default=None, help="posições por bloco (padrão: exportacao.LINHAS_POR_BLOCO)")
+    p.add_argument("--formato", choices=("csv", "parquet"), default=None, help="padrão: pela extensão da saída")
+    p.add_argument("--modo", choices=MODOS_NUMERICOS, default=MODO_PADRAO,
+                   help="rapido (float64) ou preciso (valores truncados no centavo)")
+    p.set_defaults(funcao=comando_batch)
+
+    p = sub.add_parser("proposals", help="propostas em PDF em lote (diretório ou .zip)")
+    p.add_argument("entrada")
+    p.add_argument("saida")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--bloco", type=int, default=25, help="linhas por tarefa")
+    p.set_defaults(funcao=comando_proposals)
+
+    p = sub.add_parser("bench", help="vazão do cálculo escalar e do lote")
+    p.add_argument("--n", type=int, default=20000, help="simulações escalares")
+    p.add_argument("--linhas", type=int, default=1_000_000, help="linhas do lote")
+    p.set_defaults(funcao=comando_bench)
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if args.comando == "simulate" and args.tipo is not None and not args.vencimento:
+        criar_parser().error("simulate com --tipo requer --vencimento")
+    # Logs vão para stderr: stdout fica livre para os dados
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s", stream=sys.stderr)
+    try:
+        return args.funcao(args)
+    except RuntimeError as e:
+        # Dependência opcional ausente (ex.: pyarrow para Parquet)
+        log.error("%s", e)
+        return 2
+    except BrokenPipeError:
+        # Saída fechada antes do fim (ex.: "| head"): encerra sem traceback
+        sys.stdout = None
+        return 1
+    except (ValueError, OSError) as e:
+        # Entrada inválida ou arquivo inacessível: mensagem no log, sem traceback
+        log.error("%s: %s", type(e).__name__, e)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# ===================== CALENDÁRIO DE DIAS ÚTEIS (ANBIMA) =====================
+# Feriados nacionais e contagem de dias úteis para a capitalização do
+# Pós-fixado (base 252). O índice acumulado é montado uma vez por processo:
+# contar os dias úteis entre duas datas é uma subtração, sem laço.
+# Só usa a biblioteca padrão; motor_lote reaproveita o mesmo índice em NumPy.
+import datetime
+from array import array
+from functools import lru_cache
+
+ANO_INICIAL = 2000
+ANO_FINAL = 2099
+
+# (mês, dia, nome)
+FERIADOS_FIXOS = (
+    (1, 1, "Confraternização Universal"),
+    (4, 21, "Tiradentes"),
+    (5, 1, "Dia do Trabalho"),
+    (9, 7, "Independência do Brasil"),
+    (10, 12, "Nossa Senhora Aparecida"),
+    (11, 2, "Finados"),
+    (11, 15, "Proclamação da República"),
+    (12, 25, "Natal"),
+)
+# Consciência Negra: feriado nacional a partir de 2024 (Lei 14.759/2023)
+CONSCIENCIA_NEGRA = (11, 20, "Dia Nacional de Zumbi e da Consciência Negra", 2024)
+
+# Deslocamento em dias a partir do domingo de Páscoa
+FERIADOS_MOVEIS = (
+    (-48, "Carnaval (segunda-feira)"),
+    (-47, "Carnaval (terça-feira)"),
+    (-2, "Sexta-feira Santa"),
+    (60, "Corpus Christi"),
+)
+
+
+# Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher, calendário gregoriano)
+def domingo_pascoa(ano):
+    a, b, c = ano % 19, ano // 100, ano % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19*a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2*e + 2*i - h - k) % 7
+    m = (a + 11*h + 22*l) // 451
+    mes = (h + l - 7*m + 114) // 31
+    dia = (h + l - 7*m + 114) % 31 + 1
+    return datetime.date(ano, mes, dia)
+
+
+def feriados_ano(ano):
+    feriados = {datetime.date(ano, mes, dia): nome for mes, dia, nome in FERIADOS_FIXOS}
+    mes, dia, nome, desde = CONSCIENCIA_NEGRA
+    if ano >= desde:
+        feriados[datetime.date(ano, mes, dia)] = nome
+    pascoa = domingo_pascoa(ano)
+    for deslocamento, nome in FERIADOS_MOVEIS:
+        feriados[pascoa + datetime.timedelta(days=deslocamento)] = nome
+    return feriados
+
+
+# Tabela de feriados nacionais de ANO_INICIAL a ANO_FINAL: {data: nome}
+@lru_cache(maxsize=None)
+def feriados_nacionais():
+    feriados = {}
+    for ano in range(ANO_INICIAL, ANO_FINAL + 1):
+        feriados.update(feriados_ano(ano))
+    return feriados
+
+
+# ===================== ÍNDICE ACUMULADO =====================
+# indice[i] = dias úteis em [inicio, inicio + i). Com isso,
+# dias_uteis(a, b) = indice[b - inicio] - indice[a - inicio].
+ORDINAL_INICIAL = datetime.date(ANO_INICIAL, 1, 1).toordinal()
+ORDINAL_FINAL = datetime.date(ANO_FINAL, 12, 31).toordinal() + 1  # exclusivo
+
+
+@lru_cache(maxsize=None)
+def indice_dias_uteis():
+    feriados = {data.toordinal() for data in feriados_nacionais()}
+    indice = array("i", [0])
+    acumulado = 0
+    for ordinal in range(ORDINAL_INICIAL, ORDINAL_FINAL):
+        # toordinal() % 7: 0 = domingo, 6 = sábado
+        if ordinal % 7 not in (0, 6) and ordinal not in feriados:
+            acumulado += 1
+        indice.append(acumulado)
+    return indice
+
+
+def _posicao(data):
+    posicao = data.toordinal() - ORDINAL_INICIAL
+    if not 0 <= posicao <= ORDINAL_FINAL - ORDINAL_INICIAL:
+        raise ValueError(f"Data fora do calendário ({ANO_INICIAL}-{ANO_FINAL}): {data}")
+    return posicao
+
+
+def eh_dia_util(data):
+    return data.weekday() < 5 and data not in feriados_nacionais()
+
+
+# Dias úteis de inicio (inclusive) a fim (exclusive), convenção ANBIMA
+def dias_uteis(inicio, fim):
+    indice = indice_dias_uteis()
+    return indice[_posicao(fim)] - indice[_posicao(inicio)]
@@ -0,0 +1,176 @@
+# ===================== CARTEIRA (VÁRIAS POSIÇÕES) =====================
+# Modo carteira: escadas de CDB/LCI/LCA com datas e taxas diferentes.
+#   simular_carteira   resultado com IR/IOF de todas as posições em uma chamada de simular_lote
+#   projetar_carteira  patrimônio consolidado x benchmarks em um eixo de datas comum
+#   fluxos_carteira    aplicações e resgates líquidos agregados por data
+#
+# A projeção é uma matriz [posição, data] calculada de uma vez (broadcasting):
+# antes da aplicação a posição vale 0; entre aplicação e vencimento vale o
+# bruto; depois do vencimento vale o líquido resgatado (mantido em caixa, sem
+# reaplicação). CDI e poupança recebem os mesmos aportes nas mesmas datas e
+# ficam parados após o vencimento de cada posição.
+import datetime
+from dataclasses import dataclass
+
+import numpy as np
+
+from motor_calculo import ProjecaoRentabilidade, taxas_benchmark_diarias
+from motor_lote import _datas, codificar_tipos, dias_uteis_lote, eh_pos_fixado_lote, simular_lote
+from motor_projecao import datas_projecao
+
+COLUNAS_FLUXOS = ("data", "aplicacoes", "resgates_liquidos", "saldo")
+
+
+@dataclass(frozen=True)
+class Carteira:
+    codigos: np.ndarray
+    tipos: np.ndarray
+    valor_investido: np.ndarray
+    data_aplicacao: np.ndarray   # datetime64[D]
+    data_vencimento: np.ndarray  # datetime64[D]
+    taxa_anual: np.ndarray
+    perc_cdi: np.ndarray
+    taxa_cdi: np.ndarray
+    cdi_historico: bool = False
+
+    def __len__(self):
+        return len(self.codigos)
+
+
+@dataclass(frozen=True)
+class ResultadoCarteira:
+    carteira: Carteira
+    posicoes: object              # motor_lote.ResultadoLote, uma linha por posição
+    valor_investido: float
+    montante_bruto: float
+    impostos_totais: float
+    montante_liquido: float
+    rendimento_liquido: float
+    data_aplicacao: datetime.date   # primeira aplicação
+    data_vencimento: datetime.date  # último vencimento
+
+
+@dataclass(frozen=True)
+class ProjecaoCarteira:
+    datas: np.ndarray       # datetime64[D], da primeira aplicação ao último vencimento
+    aplicado: np.ndarray    # capital aplicado acumulado
+    patrimonio: np.ndarray  # posições abertas pelo bruto + resgates líquidos
+    cdi: np.ndarray
+    poupanca: np.ndarray
+
+    # Mesmo formato de motor_calculo.ProjecaoRentabilidade (gráfico e PDF)
+    def como_projecao(self):
+        return ProjecaoRentabilidade(
+            tuple(self.datas.tolist()), tuple(self.patrimonio.tolist()),
+            tuple(self.cdi.tolist()), tuple(self.poupanca.tolist()),
+        )
+
+
+# Monta a carteira a partir de pares (codigo, EntradaSimulacao) (ex.: exportacao.posicoes)
+def montar_carteira(posicoes, cdi_historico=False):
+    posicoes = list(posicoes)
+    if not posicoes:
+        raise ValueError("Carteira sem posições")
+    entradas = [entrada for _, entrada in posicoes]
+    return Carteira(
+        codigos=np.array([str(codigo) for codigo, _ in posicoes]),
+        tipos=np.array([e.tipo_investimento for e in entradas]),
+        valor_investido=np.array([e.valor_investido for e in entradas], dtype=np.float64),
+        data_aplicacao=np.array([e.data_aplicacao for e in entradas], dtype="datetime64[D]"),
+        data_vencimento=np.array([e.data_vencimento for e in entradas], dtype="datetime64[D]"),
+        taxa_anual=np.array([e.taxa_anual for e in entradas], dtype=np.float64),
+        perc_cdi=np.array([e.perc_cdi for e in entradas], dtype=np.float64),
+        taxa_cdi=np.array([e.taxa_cdi for e in entradas], dtype=np.float64),
+        cdi_historico=cdi_historico,
+    )
+
+
+def simular_carteira(carteira):
+    posicoes = simular_lote(
+        carteira.valor_investido, carteira.tipos, carteira.data_aplicacao, carteira.data_vencimento,
+        taxa_anual=carteira.taxa_anual, perc_cdi=carteira.perc_cdi, taxa_cdi=carteira.taxa_cdi,
+        cdi_historico=carteira.cdi_historico,
+    )
+    if not posicoes.validos.all():
+        invalidas = ", ".join(carteira.codigos[~posicoes.validos][:10].tolist())
+        raise ValueError(f"Posições com valor ou prazo inválido: {invalidas}")
+    return ResultadoCarteira(
+        carteira=carteira,
+        posicoes=posicoes,
+        valor_investido=float(carteira.valor_investido.sum()),
+        montante_bruto=float(posicoes.montante_bruto.sum()),
+        impostos_totais=float(posicoes.impostos_totais.sum()),
+        montante_liquido=float(posicoes.montante_liquido.sum()),
+        rendimento_liquido=float(posicoes.rendimento_liquido.sum()),
+        data_aplicacao=carteira.data_aplicacao.min().item(),
+        data_vencimento=carteira.data_vencimento.max().item(),
+    )
+
+
+# Grade da granularidade entre a primeira aplicação e o último vencimento, mais
+# as datas de aplicação e vencimento de cada posição (degraus da carteira)
+def datas_carteira(data_aplicacao, data_vencimento, granularidade="mensal"):
+    aplicacao, vencimento = _datas(data_aplicacao), _datas(data_vencimento)
+    grade = datas_projecao(aplicacao.min(), vencimento.max(), granularidade)
+    return np.unique(np.concatenate([grade, aplicacao, vencimento]))
+
+
+def projetar_carteira(resultado, granularidade="mensal"):
+    carteira = resultado.carteira
+    datas = datas_carteira(carteira.data_aplicacao, carteira.data_vencimento, granularidade)
+
+    # Matrizes [posição, data]; t é a data limitada ao intervalo de cada posição
+    aplicacao = carteira.data_aplicacao[:, None]
+    vencimento = carteira.data_vencimento[:, None]
+    valor = carteira.valor_investido[:, None]
+    taxa_cdi = carteira.taxa_cdi[:, None]
+    t = np.minimum(np.maximum(datas[None, :], aplicacao), vencimento)
+    dias = (t - aplicacao).astype(np.int64)
+    aplicada = datas[None, :] >= aplicacao
+    vencida = datas[None, :] >= vencimento
+
+    taxa_cdi_diaria, taxa_poupanca_diaria = taxas_benchmark_diarias(taxa_cdi)
+
+    pos = eh_pos_fixado_lote(codificar_tipos(carteira.tipos))[:, None]
+    taxa = np.where(pos, taxa_cdi * (carteira.perc_cdi[:, None] / 100), carteira.taxa_anual[:, None])
+    taxa_diaria = (1 + taxa / 100) ** (1 / np.where(pos, 252.0, 360.0)) - 1
+    dias_capitalizacao = np.where(pos, dias_uteis_lote(aplicacao, t), dias) if pos.any() else dias
+    bruto = valor * (1 + taxa_diaria) ** dias_capitalizacao
+
+    if carteira.cdi_historico:
+        from curva_cdi import carregar_curva
+        curva = carregar_curva()
+        cdi = valor * curva.fator_lote(aplicacao, t, 100.0, taxa_cdi)
+        if pos.any():
+            linhas = pos[:, 0]
+            bruto[linhas] = valor[linhas] * curva.fator_lote(
+                aplicacao[linhas], t[linhas], carteira.perc_cdi[linhas, None], taxa_cdi[linhas])
+    else:
+        cdi = valor * (1 + taxa_cdi_diaria) ** dias
+    poupanca = valor * (1 + taxa_poupanca_diaria) ** dias
+
+    patrimonio = np.where(vencida, resultado.posicoes.montante_liquido[:, None], bruto)
+    return ProjecaoCarteira(
+        datas=datas,
+        aplicado=np.where(aplicada, valor, 0.0).sum(axis=0),
+        patrimonio=np.where(aplicada, patrimonio, 0.0).sum(axis=0),
+        cdi=np.where(aplicada, cdi, 0.0).sum(axis=0),
+        poupanca=np.where(aplicada, poupanca, 0.0).sum(axis=0),
+    )
+
+
+# Aplicações (saídas de caixa) e resgates líquidos (entradas) agregados por data,
+# com o saldo acumulado de caixa; colunas de COLUNAS_FLUXOS (exportacao.abrir_escritor)
+def fluxos_carteira(resultado):
+    carteira = resultado.carteira
+    datas, indices = np.unique(np.concatenate([carteira.data_aplicacao, carteira.data_vencimento]),
+                               return_inverse=True)
+    n = len(carteira)
+    aplicacoes = np.bincount(indices[:n], weights=carteira.valor_investido, minlength=len(datas))
+    resgates = np.bincount(indices[n:], weights=resultado.posicoes.montante_liquido, minlength=len(datas))
+    return {
+        "data": datas,
+        "aplicacoes": aplicacoes,
+        "resgates_liquidos": resgates,
+        "saldo": np.cumsum(resgates - aplicacoes),
+    }
@@ -0,0 +1,120 @@
+# ===================== GRADE DE CENÁRIOS (SENSIBILIDADE) =====================
+# Rentabilidade líquida de vários produtos sobre uma grade prazo x taxa, em uma
+# única chamada vetorizada de motor_lote.simular_lote (produto cartesiano via
+# broadcasting, sem laço em Python). Usado no material comercial: heatmap na
+# página Streamlit e exportação em CSV/Parquet.
+#
+# O eixo de taxa é a taxa anual (%) para Pré-fixado, LCI e LCA e o % do CDI
+# para o Pós-fixado; pode ser um único array ou um dict {tipo: array}.
+import csv
+import datetime
+import io
+from dataclasses import dataclass
+
+import numpy as np
+
+from motor_calculo import TAXA_CDI_MERCADO, TIPOS_INVESTIMENTO, eh_pos_fixado
+from motor_lote import simular_lote
+
+COLUNAS_EXPORTACAO = ("tipo_investimento", "prazo_dias", "taxa", "montante_liquido", "rentabilidade_liquida_pct")
+
+
+@dataclass(frozen=True)
+class GradeCenarios:
+    tipos: tuple
+    prazos_dias: np.ndarray           # [prazo]
+    taxas: np.ndarray                 # [tipo, taxa]
+    valor_investido: float
+    montante_liquido: np.ndarray      # [tipo, prazo, taxa]
+    rentabilidade_liquida: np.ndarray  # [tipo, prazo, taxa], em % sobre o valor investido
+
+    @property
+    def formato(self):
+        return self.montante_liquido.shape
+
+    # Fatia 2-D (prazo x taxa) de um tipo
+    def tabela(self, tipo):
+        return self.rentabilidade_liquida[self.tipos.index(tipo)]
+
+
+def _eixo_taxas(taxas, tipos):
+    if isinstance(taxas, dict):
+        linhas = [np.asarray(taxas[tipo], dtype=np.float64) for tipo in tipos]
+        if len({len(l) for l in linhas}) != 1:
+            raise ValueError("Todos os tipos precisam do mesmo número de taxas")
+        return np.stack(linhas)
+    return np.tile(np.asarray(taxas, dtype=np.float64), (len(tipos), 1))
+
+
+def grade_cenarios(prazos_dias, taxas, tipos=TIPOS_INVESTIMENTO, valor_investido=1000.0,
+                   data_aplicacao=None, taxa_cdi=TAXA_CDI_MERCADO):
+    tipos = tuple(tipos)
+    prazos_dias = np.asarray(prazos_dias, dtype=np.int64)
+    eixo_taxas = _eixo_taxas(taxas, tipos)
+    aplicacao = np.datetime64(data_aplicacao or datetime.date.today(), "D")
+
+    # Formatos [tipo, 1, 1], [1, prazo, 1] e [tipo, 1, taxa]: o broadcasting monta o produto cartesiano
+    tipo_arr = np.array(tipos)[:, None, None]
+    pos = np.array([eh_pos_fixado(t) for t in tipos])[:, None, None]
+    taxa_arr = eixo_taxas[:, None, :]
+    vencimento = aplicacao + prazos_dias[None, :, None]
+
+    resultado = simular_lote(
+        valor_investido, tipo_arr, aplicacao, vencimento,
+        taxa_anual=np.where(pos, 0.0, taxa_arr),
+        perc_cdi=np.where(pos, taxa_arr, 0.0),
+        taxa_cdi=taxa_cdi,
+    )
+    return GradeCenarios(
+        tipos=tipos,
+        prazos_dias=prazos_dias,
+        taxas=eixo_taxas,
+        valor_investido=float(valor_investido),
+        montante_liquido=resultado.montante_liquido,
+        rentabilidade_liquida=(resultado.montante_liquido / valor_investido - 1) * 100,
+    )
+
+
+# ===================== EXPORTAÇÃO =====================
+
+# Linhas em formato longo, geradas sob demanda (um tipo e um prazo por vez)
+def linhas_grade(grade):
+    for i, tipo in enumerate(grade.tipos):
+        taxas = grade.taxas[i].tolist()
+        for j, prazo in enumerate(grade.prazos_dias.tolist()):
+            montantes = grade.montante_liquido[i, j].tolist()
+            rentabilidades = grade.rentabilidade_liquida[i, j].tolist()
+            for taxa, montante, rentabilidade in zip(taxas, montantes, rentabilidades):
+                yield tipo, prazo, taxa, montante, rentabilidade
+
+
+def escrever_csv(grade, destino):
+    escritor = csv.writer(destino)
+    escritor.writerow(COLUNAS_EXPORTACAO)
+    escritor.writerows(linhas_grade(grade))
+
+
+def csv_bytes(grade):
+    buffer = io.StringIO()
+    escrever_csv(grade, buffer)
+    return buffer.getvalue().encode("utf-8")
+
+
+def parquet_bytes(grade):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Exportação em Parquet requer o pacote pyarrow") from None
+
+    n_tipos, n_prazos, n_taxas = grade.formato
+    tabela = pa.table({
+        "tipo_investimento": np.repeat(np.array(grade.tipos), n_prazos * n_taxas),
+        "prazo_dias": np.tile(np.repeat(grade.prazos_dias, n_taxas), n_tipos),
+        "taxa": np.repeat(grade.taxas, n_prazos, axis=0).ravel(),
+        "montante_liquido": grade.montante_liquido.ravel(),
+        "rentabilidade_liquida_pct": grade.rentabilidade_liquida.ravel(),
+    })
+    buffer = io.BytesIO()
+    pq.write_table(tabela, buffer)
+    return buffer.getvalue()
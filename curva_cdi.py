@@ -0,0 +1,220 @@
+# ===================== CURVA HISTÓRICA DO CDI (MEMMAP) =====================
+# Importa um CSV local com o CDI diário e grava, em um arquivo binário NumPy,
+# a taxa de cada dia e o fator acumulado (produto) desde o início da série.
+# Em tempo de execução o arquivo é aberto com mmap: o fator do CDI entre duas
+# datas é uma divisão, sem rede e sem carregar a série inteira na memória.
+#
+# Formato do CSV (ex.: exportação da série 12 do SGS/Banco Central):
+#   data;valor
+#   02/01/2025;0,054266     <- taxa diária em %  (--anual: taxa em % a.a., base 252)
+#
+# Depois da última data da série, o período restante é projetado com a taxa_cdi
+# informada na simulação (dias úteis, base 252).
+#
+# Variáveis de ambiente:
+#   CDB_CURVA_CDI   caminho do arquivo .npy (padrão: dados/cdi.npy)
+#
+# Uso:
+#   python curva_cdi.py cdi_sgs12.csv [--saida dados/cdi.npy] [--anual]
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+from functools import lru_cache
+
+from calendario import dias_uteis
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "cdi.npy")
+_EPOCA_ORDINAL = 719163  # datetime.date(1970, 1, 1).toordinal()
+
+
+def caminho_curva():
+    return os.environ.get("CDB_CURVA_CDI") or CAMINHO_PADRAO
+
+
+def _caminho_meta(caminho):
+    return os.path.splitext(caminho)[0] + ".json"
+
+
+# ===================== IMPORTAÇÃO DO CSV =====================
+
+def _ler_data(texto):
+    texto = texto.strip()
+    for formato in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(texto, formato).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Data inválida: {texto!r}")
+
+
+def _ler_taxa(texto):
+    texto = texto.strip().replace("%", "")
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    return float(texto)
+
+
+def ler_csv_cdi(caminho, anual=False):
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+        except csv.Error:
+            dialeto = csv.excel
+        for linha in csv.reader(f, dialect=dialeto):
+            if len(linha) < 2 or not linha[0].strip():
+                continue
+            try:
+                data = _ler_data(linha[0])
+            except ValueError:
+                continue  # cabeçalho
+            taxa = _ler_taxa(linha[1])
+            # Taxa diária como fração (0,054266% -> 0.00054266)
+            yield data, ((1 + taxa / 100) ** (1 / 252) - 1) if anual else taxa / 100
+
+
+# Grava a série densa por dia corrido: linha 0 = taxa do dia (0 em fins de
+# semana e feriados), linha 1 = fator acumulado até o início do dia.
+def importar_csv(caminho_csv, saida=None, anual=False):
+    import numpy as np
+
+    saida = saida or caminho_curva()
+    taxas_por_data = dict(ler_csv_cdi(caminho_csv, anual=anual))
+    if not taxas_por_data:
+        raise ValueError(f"Nenhuma taxa encontrada em {caminho_csv}")
+
+    data_inicial, data_final = min(taxas_por_data), max(taxas_por_data)
+    n = (data_final - data_inicial).days + 1
+    serie = np.zeros((2, n + 1), dtype=np.float64)
+    for data, taxa in taxas_por_data.items():
+        serie[0, (data - data_inicial).days] = taxa
+    serie[1, 0] = 1.0
+    np.cumprod(1 + serie[0, :n], out=serie[1, 1:])
+
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    np.save(saida, serie)
+    meta = {
+        "data_inicial": data_inicial.isoformat(),
+        "data_final": data_final.isoformat(),
+        "dias_com_taxa": len(taxas_por_data),
+        "origem": os.path.basename(caminho_csv),
+    }
+    with open(_caminho_meta(saida), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    carregar_curva.cache_clear()
+    return meta
+
+
+# ===================== CONSULTA =====================
+
+class CurvaCDI:
+    def __init__(self, caminho):
+        import numpy as np
+
+        with open(_caminho_meta(caminho), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.caminho = caminho
+        self.data_inicial = datetime.date.fromisoformat(meta["data_inicial"])
+        self.data_final = datetime.date.fromisoformat(meta["data_final"])
+        serie = np.load(caminho, mmap_mode="r")
+        self._taxas = serie[0]
+        self._fatores = {100.0: serie[1]}  # % do CDI -> fator acumulado
+
+    @property
+    def fim_serie(self):
+        # Primeiro dia sem taxa conhecida
+        return self.data_final + datetime.timedelta(days=1)
+
+    # Fator acumulado para um % do CDI: 100% vem do arquivo; os demais são
+    # calculados uma vez (produto de 1 + taxa * %) e reaproveitados
+    def _fatores_perc(self, perc_cdi):
+        import numpy as np
+
+        perc_cdi = float(perc_cdi)
+        fatores = self._fatores.get(perc_cdi)
+        if fatores is None:
+            fatores = np.empty(len(self._taxas), dtype=np.float64)
+            fatores[0] = 1.0
+            np.cumprod(1 + self._taxas[:-1] * (perc_cdi / 100), out=fatores[1:])
+            if len(self._fatores) > 32:
+                self._fatores = {100.0: self._fatores[100.0]}
+            self._fatores[perc_cdi] = fatores
+        return fatores
+
+    def _posicao(self, data):
+        if data < self.data_inicial:
+            raise ValueError(f"Data anterior à curva do CDI ({self.data_inicial:%d/%m/%Y}): {data:%d/%m/%Y}")
+        return min((data - self.data_inicial).days, len(self._taxas) - 1)
+
+    # Fator do CDI (no % informado) de inicio a fim. Além do fim da série, o
+    # período restante é capitalizado pela taxa_cdi (% a.a.) em dias úteis.
+    def fator(self, inicio, fim, perc_cdi=100.0, taxa_cdi=None):
+        fatores = self._fatores_perc(perc_cdi)
+        fator = float(fatores[self._posicao(fim)] / fatores[self._posicao(inicio)])
+        if fim > self.fim_serie:
+            if taxa_cdi is None:
+                raise ValueError(f"Curva do CDI termina em {self.data_final:%d/%m/%Y}; informe taxa_cdi para projetar o restante")
+            dias = dias_uteis(max(inicio, self.fim_serie), fim)
+            fator *= (1 + taxa_cdi * (perc_cdi / 100) / 100) ** (dias / 252)
+        return fator
+
+    # Mesmo cálculo de fator() sobre arrays (datas datetime64[D]); um grupo por % do CDI distinto
+    def fator_lote(self, inicio, fim, perc_cdi, taxa_cdi):
+        import numpy as np
+        from motor_lote import dias_uteis_lote
+
+        inicio = np.asarray(inicio, dtype="datetime64[D]")
+        fim = np.asarray(fim, dtype="datetime64[D]")
+        inicio, fim, perc_cdi, taxa_cdi = np.broadcast_arrays(
+            inicio, fim, np.asarray(perc_cdi, dtype=np.float64), np.asarray(taxa_cdi, dtype=np.float64))
+
+        base = self.data_inicial.toordinal() - _EPOCA_ORDINAL
+        pos_inicio = inicio.astype(np.int64) - base
+        pos_fim = fim.astype(np.int64) - base
+        if pos_inicio.size and min(pos_inicio.min(), pos_fim.min()) < 0:
+            raise ValueError(f"Data anterior à curva do CDI ({self.data_inicial:%d/%m/%Y})")
+        ultimo = len(self._taxas) - 1
+        pos_inicio, pos_fim = np.minimum(pos_inicio, ultimo), np.minimum(pos_fim, ultimo)
+
+        fator = np.empty(inicio.shape, dtype=np.float64)
+        for perc in np.unique(perc_cdi):
+            grupo = perc_cdi == perc
+            fatores = self._fatores_perc(perc)
+            fator[grupo] = fatores[pos_fim[grupo]] / fatores[pos_inicio[grupo]]
+
+        fim_serie = np.datetime64(self.fim_serie, "D")
+        alem = fim > fim_serie
+        if alem.any():
+            dias = dias_uteis_lote(np.maximum(inicio[alem], fim_serie), fim[alem])
+            fator[alem] *= (1 + taxa_cdi[alem] * (perc_cdi[alem] / 100) / 100) ** (dias / 252)
+        return fator
+
+
+@lru_cache(maxsize=4)
+def carregar_curva(caminho=None):
+    return CurvaCDI(caminho or caminho_curva())
+
+
+def curva_disponivel(caminho=None):
+    caminho = caminho or caminho_curva()
+    return os.path.exists(caminho) and os.path.exists(_caminho_meta(caminho))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa o CDI diário de um CSV local para a curva em memmap.")
+    parser.add_argument("csv", help="CSV com data e taxa do CDI")
+    parser.add_argument("--saida", default=None, help=f"arquivo .npy de destino (padrão: {CAMINHO_PADRAO})")
+    parser.add_argument("--anual", action="store_true", help="taxas em % a.a. (base 252) em vez de % ao dia")
+    args = parser.parse_args(argv)
+
+    meta = importar_csv(args.csv, saida=args.saida, anual=args.anual)
+    print(f"Curva do CDI de {meta['data_inicial']} a {meta['data_final']} ({meta['dias_com_taxa']} dias com taxa)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
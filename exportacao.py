@@ -0,0 +1,300 @@
+# ===================== EXPORTAÇÃO CSV / PARQUET (EM BLOCOS) =====================
+# Números por trás da tela e do PDF para risco e back-office:
+#   projeção por período  data, bruto, CDI, poupança, IOF e IR acumulados, líquido
+#   simulação em lote     uma linha por posição (motor_lote.simular_lote)
+#
+# A escrita é em blocos: a entrada é lida sob demanda (mesmo leitor do
+# lote_propostas), cada bloco é calculado e gravado, e só um bloco fica em
+# memória. Assim, exportar curvas diárias de uma carteira inteira não
+# materializa tudo de uma vez.
+#
+# Colunas de entrada: as mesmas de lote_propostas (nome e assessor opcionais).
+#
+# Uso:
+#   python exportacao.py lote carteira.csv resultados.parquet
+#   python exportacao.py projecao carteira.csv curvas.csv --granularidade diaria
+import argparse
+import csv
+import io
+import logging
+import sys
+import time
+
+import numpy as np
+
+from lote_propostas import ler_clientes, linha_para_entrada
+from motor_lote import compilar_esquema, simular_lote
+from motor_projecao import GRANULARIDADES, projetar_curvas
+
+log = logging.getLogger("exportacao")
+
+LINHAS_POR_BLOCO = 50_000
+
+COLUNAS_PROJECAO = ("data", "bruto", "cdi", "poupanca", "iof", "ir", "liquido")
+COLUNAS_LOTE = (
+    "codigo", "tipo_investimento", "valor_investido", "data_aplicacao", "data_vencimento", "prazo_dias",
+    "montante_bruto", "iof", "aliquota_ir", "ir", "impostos_totais", "montante_liquido", "rendimento_liquido",
+)
+
+
+# ===================== ESCRITORES =====================
+# Recebem blocos como dict {coluna: array} e gravam incrementalmente.
+
+class EscritorCSV:
+    def __init__(self, destino, colunas):
+        self._arquivo = open(destino, "w", newline="", encoding="utf-8") if isinstance(destino, str) else None
+        self._csv = csv.writer(self._arquivo or destino)
+        self.colunas = colunas
+        self._csv.writerow(colunas)
+
+    def escrever(self, bloco):
+        valores = []
+        for coluna in self.colunas:
+            arr = np.asarray(bloco[coluna])
+            # datetime64[D] -> AAAA-MM-DD
+            valores.append(arr.astype(str).tolist() if arr.dtype.kind == "M" else arr.tolist())
+        self._csv.writerows(zip(*valores))
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+
+
+class EscritorParquet:
+    def __init__(self, destino, colunas):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Exportação em Parquet requer o pacote pyarrow") from None
+        self._pa, self._pq = pa, pq
+        self._destino = destino
+        self._escritor = None
+        self.colunas = colunas
+
+    def escrever(self, bloco):
+        tabela = self._pa.table({coluna: np.asarray(bloco[coluna]) for coluna in self.colunas})
+        if self._escritor is None:
+            self._escritor = self._pq.ParquetWriter(self._destino, tabela.schema)
+        self._escritor.write_table(tabela)  # um row group por bloco
+
+    def fechar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+
+
+def abrir_escritor(destino, colunas, formato=None):
+    if formato is None:
+        nome = destino if isinstance(destino, str) else ""
+        formato = "parquet" if nome.lower().endswith((".parquet", ".pq")) else "csv"
+    if formato == "parquet":
+        return EscritorParquet(destino, colunas)
+    if formato == "csv":
+        return EscritorCSV(destino, colunas)
+    raise ValueError(f"Formato de exportação inválido: {formato!r} (use csv ou parquet)")
+
+
+# Junta blocos pequenos (ex.: uma curva por cliente) até LINHAS_POR_BLOCO antes de gravar
+class _Acumulador:
+    def __init__(self, escritor, linhas_por_bloco):
+        self._escritor = escritor
+        self._limite = linhas_por_bloco
+        self._partes, self._linhas = [], 0
+        self.total = 0
+
+    def adicionar(self, bloco):
+        self._partes.append(bloco)
+        self._linhas += len(next(iter(bloco.values())))
+        if self._linhas >= self._limite:
+            self.descarregar()
+
+    def descarregar(self):
+        if not self._partes:
+            return
+        colunas = self._partes[0].keys()
+        self._escritor.escrever({c: np.concatenate([np.atleast_1d(p[c]) for p in self._partes]) for c in colunas})
+        self.total += self._linhas
+        self._partes, self._linhas = [], 0
+
+
+# ===================== PROJEÇÃO POR PERÍODO =====================
+
+# Colunas da projeção com IOF e IR que incidiriam em um resgate em cada data
+def tabela_projecao(entrada, granularidade="mensal", versao_tributos=None):
+    from motor_lote import CODIGOS_TIPO
+
+    curvas = projetar_curvas(entrada, granularidade)
+    esquema = compilar_esquema(versao_tributos)
+    prazo = (curvas.datas - np.datetime64(entrada.data_aplicacao, "D")).astype(np.int64)
+    dias = esquema.indices(prazo)
+    codigo = CODIGOS_TIPO[entrada.tipo_investimento]
+
+    rendimento = curvas.bruto - entrada.valor_investido
+    iof = rendimento * esquema.aliquota_iof[codigo, dias]
+    ir = (rendimento - iof) * esquema.aliquota_ir[codigo, dias]
+    return {
+        "data": curvas.datas,
+        "bruto": curvas.bruto,
+        "cdi": curvas.cdi,
+        "poupanca": curvas.poupanca,
+        "iof": iof,
+        "ir": ir,
+        "liquido": curvas.bruto - iof - ir,
+    }
+
+
+def exportar_projecao(entrada, destino, granularidade="mensal", formato=None):
+    escritor = abrir_escritor(destino, COLUNAS_PROJECAO, formato)
+    try:
+        escritor.escrever(tabela_projecao(entrada, granularidade))
+    finally:
+        escritor.fechar()
+
+
+def projecao_bytes(entrada, granularidade="mensal", formato="csv"):
+    if formato == "csv":
+        buffer = io.StringIO()
+        exportar_projecao(entrada, buffer, granularidade, formato)
+        return buffer.getvalue().encode("utf-8")
+    buffer = io.BytesIO()
+    exportar_projecao(entrada, buffer, granularidade, formato)
+    return buffer.getvalue()
+
+
+# ===================== CARTEIRA (ARQUIVO DE ENTRADA) =====================
+
+COLUNAS_CARTEIRA = ("codigo", "valor", "ativo", "taxa", "data_aplicacao", "data_vencimento")
+
+
+# Arquivo de posições enviado na página (CSV ou Parquet) como DataFrame, com as
+# datas convertidas; colunas ausentes, arquivo vazio ou datas ilegíveis são ValueError
+def tabela_carteira(arquivo, nome):
+    import pandas as pd
+
+    try:
+        if nome.lower().endswith((".parquet", ".pq")):
+            tabela = pd.read_parquet(arquivo)
+        else:
+            tabela = pd.read_csv(arquivo, sep=None, engine="python", encoding="utf-8-sig", dtype={"codigo": str})
+    except pd.errors.EmptyDataError:
+        raise ValueError("arquivo vazio") from None
+    except csv.Error as e:  # separador não detectado (ex.: arquivo vazio ou de uma coluna só)
+        raise ValueError(f"CSV ilegível: {e}") from None
+    ausentes = [coluna for coluna in COLUNAS_CARTEIRA if coluna not in tabela.columns]
+    if ausentes:
+        raise ValueError(f"colunas ausentes: {', '.join(ausentes)}")
+    if tabela.empty:
+        raise ValueError("nenhuma posição no arquivo")
+    for coluna in ("data_aplicacao", "data_vencimento"):
+        tabela[coluna] = pd.to_datetime(tabela[coluna], dayfirst="/" in str(tabela[coluna].iloc[0])).dt.date
+    return tabela
+
+
+# (codigo, EntradaSimulacao) para cada linha válida; aceita um caminho ou um iterável de dicts
+def posicoes(entrada):
+    linhas = ler_clientes(entrada) if isinstance(entrada, str) else entrada
+    for numero, linha in enumerate(linhas, start=1):
+        try:
+            codigo, _, _, _, simulacao = linha_para_entrada({"nome": "", "assessor": "", **linha})
+        except (KeyError, ValueError) as e:
+            log.warning("linha %d ignorada: %s: %s", numero, type(e).__name__, e)
+            continue
+        yield codigo, simulacao
+
+
+def blocos(iteravel, tamanho):
+    bloco = []
+    for item in iteravel:
+        bloco.append(item)
+        if len(bloco) == tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+# Simula um bloco de (codigo, EntradaSimulacao) e devolve as colunas de COLUNAS_LOTE
+def simular_bloco(bloco, modo="rapido"):
+    codigos = [codigo for codigo, _ in bloco]
+    entradas = [entrada for _, entrada in bloco]
+    resultado = simular_lote(
+        [e.valor_investido for e in entradas],
+        [e.tipo_investimento for e in entradas],
+        [e.data_aplicacao for e in entradas],
+        [e.data_vencimento for e in entradas],
+        taxa_anual=[e.taxa_anual for e in entradas],
+        perc_cdi=[e.perc_cdi for e in entradas],
+        taxa_cdi=[e.taxa_cdi for e in entradas],
+        modo=modo,
+    )
+    return {
+        "codigo": np.array(codigos),
+        "tipo_investimento": np.array([e.tipo_investimento for e in entradas]),
+        "valor_investido": np.array([e.valor_investido for e in entradas]),
+        "data_aplicacao": np.array([e.data_aplicacao for e in entradas], dtype="datetime64[D]"),
+        "data_vencimento": np.array([e.data_vencimento for e in entradas], dtype="datetime64[D]"),
+        "prazo_dias": resultado.prazo_dias,
+        "montante_bruto": resultado.montante_bruto,
+        "iof": resultado.iof,
+        "aliquota_ir": resultado.aliquota_ir,
+        "ir": resultado.ir,
+        "impostos_totais": resultado.impostos_totais,
+        "montante_liquido": resultado.montante_liquido,
+        "rendimento_liquido": resultado.rendimento_liquido,
+    }
+
+
+# Uma linha por posição; cada bloco de posições é simulado com simular_lote e gravado
+def exportar_lote(caminho_entrada, destino, formato=None, linhas_por_bloco=LINHAS_POR_BLOCO):
+    escritor = abrir_escritor(destino, COLUNAS_LOTE, formato)
+    total = 0
+    try:
+        for bloco in blocos(posicoes(caminho_entrada), linhas_por_bloco):
+            escritor.escrever(simular_bloco(bloco))
+            total += len(bloco)
+            log.info("%d posições exportadas", total)
+    finally:
+        escritor.fechar()
+    return total
+
+
+# Curva de cada posição (com a coluna codigo), acumulada em blocos de ~linhas_por_bloco
+def exportar_projecoes(caminho_entrada, destino, granularidade="mensal", formato=None,
+                       linhas_por_bloco=LINHAS_POR_BLOCO):
+    escritor = abrir_escritor(destino, ("codigo",) + COLUNAS_PROJECAO, formato)
+    acumulador = _Acumulador(escritor, linhas_por_bloco)
+    try:
+        for codigo, entrada in posicoes(caminho_entrada):
+            tabela = tabela_projecao(entrada, granularidade)
+            tabela["codigo"] = np.full(len(tabela["data"]), codigo)
+            acumulador.adicionar(tabela)
+        acumulador.descarregar()
+    finally:
+        escritor.fechar()
+    return acumulador.total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta simulações e projeções em CSV ou Parquet, em blocos.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    lote = sub.add_parser("lote", help="uma linha por posição")
+    projecao = sub.add_parser("projecao", help="curva por período de cada posição")
+    for p in (lote, projecao):
+        p.add_argument("entrada", help="arquivo .csv ou .parquet com as posições")
+        p.add_argument("saida", help="arquivo .csv ou .parquet de destino")
+        p.add_argument("--bloco", type=int, default=LINHAS_POR_BLOCO, help="linhas por bloco gravado")
+    projecao.add_argument("--granularidade", choices=GRANULARIDADES, default="mensal")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    inicio = time.perf_counter()
+    if args.comando == "lote":
+        total = exportar_lote(args.entrada, args.saida, linhas_por_bloco=args.bloco)
+    else:
+        total = exportar_projecoes(args.entrada, args.saida, args.granularidade, linhas_por_bloco=args.bloco)
+    log.info("Concluído: %d linhas em %.1fs", total, time.perf_counter() - inicio)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
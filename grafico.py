@@ -0,0 +1,158 @@
+# ===================== GRÁFICO DA PROJEÇÃO (ATIVO x BENCHMARKS) =====================
+# Usado pela página Streamlit e pela proposta em PDF. O matplotlib só é
+# importado na primeira renderização (importar este módulo não o carrega).
+#
+# Sem pyplot: cada gráfico é uma matplotlib.figure.Figure própria com canvas
+# Agg, sem registro global de figuras nem "figura atual" compartilhada entre
+# as threads das sessões do Streamlit. A figura vive só dentro da função que
+# gera o PNG e é limpa logo após o savefig. Como o matplotlib não é
+# thread-safe (caches de fontes e de layout de texto), criação e savefig
+# rodam sob uma trava do processo; a espera aparece na etapa "grafico.trava".
+# benchmarks/estresse_grafico.py verifica imagens e memória com 50 sessões.
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+
+import metricas
+from moeda import brl
+from tema import COR_ATIVO, COR_CDI, COR_EIXO_GRAFICO, COR_POUPANCA, FUNDO_GRAFICO, TEXTO_PRINCIPAL_ST
+
+
+_TRAVA = threading.Lock()
+
+
+@contextmanager
+def renderizacao():
+    with metricas.etapa("grafico.trava"):
+        _TRAVA.acquire()
+    try:
+        yield
+    finally:
+        _TRAVA.release()
+
+
+def nova_figura(figsize):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# Plotagem com tema claro (chamar dentro de renderizacao())
+def criar_grafico(entrada, resultado, projecao):
+    return _criar_grafico_projecao(projecao, f"{entrada.tipo_investimento} Bruto", resultado.montante_bruto)
+
+
+# Patrimônio consolidado da carteira (carteira.ProjecaoCarteira.como_projecao())
+def criar_grafico_carteira(projecao):
+    return _criar_grafico_projecao(projecao, "Carteira (patrimônio)", projecao.bruto[-1])
+
+
+def _criar_grafico_projecao(projecao, rotulo_ativo, valor_final_ativo):
+    import matplotlib.dates as mdates
+
+    fig = nova_figura((12, 6))
+    ax = fig.subplots()
+    fig.set_facecolor(FUNDO_GRAFICO)
+    ax.set_facecolor(FUNDO_GRAFICO)
+    ax.tick_params(axis='x', colors=COR_EIXO_GRAFICO)
+    ax.tick_params(axis='y', colors=COR_EIXO_GRAFICO)
+    ax.yaxis.label.set_color(COR_EIXO_GRAFICO)
+    ax.title.set_color(TEXTO_PRINCIPAL_ST)
+
+    ax.plot(projecao.datas, projecao.bruto, label=rotulo_ativo, color=COR_ATIVO, linewidth=2, alpha=0.9)
+    ax.plot(projecao.datas, projecao.cdi, label="Benchmark: CDI", color=COR_CDI, linestyle="--", linewidth=1.5)
+    ax.plot(projecao.datas, projecao.poupanca, label="Benchmark: Poupança", color=COR_POUPANCA, linestyle=":", linewidth=1.5)
+
+    ax.set_title("Projeção da Rentabilidade Bruta vs. Benchmarks", fontsize=16, pad=20)
+    ax.set_ylabel("Valor em R$")
+    ax.legend(fontsize=10, loc='upper left', facecolor=FUNDO_GRAFICO, edgecolor=COR_EIXO_GRAFICO, labelcolor=COR_EIXO_GRAFICO)
+    ax.grid(True, alpha=0.3)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+
+    # ANOTAÇÕES DE VALORES FINAIS NO GRÁFICO (cor adaptativa)
+    dados_finais = [
+        (valor_final_ativo, COR_ATIVO, "Ativo"),
+        (projecao.cdi[-1], COR_CDI, "CDI"),
+        (projecao.poupanca[-1], COR_POUPANCA, "Poupança"),
+    ]
+
+    for valor, cor, nome in dados_finais:
+        ax.annotate(brl(valor, 0),
+                    xy=(projecao.datas[-1], valor),
+                    xytext=(5, 0),
+                    textcoords='offset points',
+                    color=TEXTO_PRINCIPAL_ST,
+                    fontsize=9,
+                    fontweight='bold',
+                    ha='left',
+                    va='center')
+
+    ax.tick_params(axis='x', labelrotation=0)
+    for rotulo in ax.get_xticklabels():
+        rotulo.set_horizontalalignment('center')
+    fig.tight_layout()
+    return fig, ax
+
+
+# ===================== GERAR PNG DO GRÁFICO =====================
+# Salva a figura em PNG e a limpa em seguida (a figura não deve ser reutilizada;
+# chamar dentro de renderizacao(), junto com a criação)
+def figura_png(fig, dpi):
+    buf = BytesIO()
+    try:
+        with metricas.etapa("grafico.savefig"):
+            fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight', facecolor='white')
+    finally:
+        fig.clear()
+    buf.seek(0)
+    return buf
+
+
+# PNG do gráfico para exibição na página (mesma aparência do st.pyplot)
+def grafico_png_tela(entrada, resultado, projecao, dpi=150):
+    with renderizacao():
+        fig, _ = criar_grafico(entrada, resultado, projecao)
+        return figura_png(fig, dpi).getvalue()
+
+
+def grafico_carteira_png_tela(projecao, dpi=150):
+    with renderizacao():
+        fig, _ = criar_grafico_carteira(projecao)
+        return figura_png(fig, dpi).getvalue()
+
+
+# PNG com fundo branco para o PDF. O PDF usa por padrão o gráfico vetorial
+# (grafico_vetorial); este PNG é a alternativa raster, com dpi configurável.
+def grafico_png(entrada, resultado, projecao, dpi=150):
+    with renderizacao():
+        fig, ax = criar_grafico(entrada, resultado, projecao)
+        ax.title.set_color('#000000')
+        return figura_png(fig, dpi)
+
+
+# ===================== HEATMAP DA GRADE DE CENÁRIOS =====================
+# Rentabilidade líquida (%) de um tipo: prazo no eixo Y, taxa no eixo X
+def heatmap_cenarios_png(grade, tipo, dpi=100):
+    with renderizacao():
+        return _heatmap_cenarios(grade, tipo, dpi)
+
+
+def _heatmap_cenarios(grade, tipo, dpi):
+    fig = nova_figura((10, 6))
+    ax = fig.subplots()
+    fig.set_facecolor(FUNDO_GRAFICO)
+    tabela = grade.tabela(tipo)
+    taxas = grade.taxas[grade.tipos.index(tipo)]
+    imagem = ax.imshow(
+        tabela, aspect='auto', origin='lower', cmap='viridis', interpolation='nearest',
+        extent=(taxas[0], taxas[-1], grade.prazos_dias[0], grade.prazos_dias[-1]),
+    )
+    fig.colorbar(imagem, ax=ax, label="Rentabilidade líquida (%)")
+    ax.set_xlabel("% do CDI" if "Pós-fixado" in tipo else "Taxa anual (%)", color=COR_EIXO_GRAFICO)
+    ax.set_ylabel("Prazo (dias)", color=COR_EIXO_GRAFICO)
+    ax.set_title(f"{tipo}: rentabilidade líquida por prazo e taxa", color=TEXTO_PRINCIPAL_ST)
+    fig.tight_layout()
+    return figura_png(fig, dpi).getvalue()
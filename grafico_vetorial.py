@@ -0,0 +1,131 @@
+# ===================== GRÁFICO VETORIAL PARA O PDF (REPORTLAB GRAPHICS) =====================
+# Mesma projeção do gráfico matplotlib, desenhada com primitivas do ReportLab:
+# fica vetorial dentro do PDF (nítido em qualquer zoom, poucos KB) e não passa
+# pelo savefig de 300 dpi.
+import datetime
+from functools import partial
+
+from reportlab.graphics.charts.legends import LineLegend
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+from reportlab.lib.units import mm
+
+from moeda import brl
+from tema import COR_ATIVO, COR_CDI, COR_EIXO_GRAFICO, COR_POUPANCA
+
+_brl_eixo = partial(brl, casas=0)
+
+
+# Marcas do eixo X: início de cada ano; em prazos curtos, início de cada trimestre
+def _marcas_eixo_x(inicio, fim):
+    marcas = []
+    if (fim - inicio).days > 2 * 366:
+        ano = inicio.year if (inicio.month, inicio.day) == (1, 1) else inicio.year + 1
+        while datetime.date(ano, 1, 1) <= fim:
+            marcas.append((datetime.date(ano, 1, 1), str(ano)))
+            ano += 1
+    else:
+        ano, mes = inicio.year, ((inicio.month - 1) // 3) * 3 + 1
+        while True:
+            data = datetime.date(ano, mes, 1)
+            if data > fim:
+                break
+            if data >= inicio:
+                marcas.append((data, data.strftime('%m/%Y')))
+            mes += 3
+            if mes > 12:
+                ano, mes = ano + 1, 1
+    if not marcas:
+        marcas = [(inicio, inicio.strftime('%m/%Y')), (fim, fim.strftime('%m/%Y'))]
+    return marcas
+
+
+def grafico_vetorial(entrada, resultado, projecao, largura=180*mm, altura=90*mm):
+    return _grafico_vetorial_projecao(projecao, f"{entrada.tipo_investimento} Bruto", largura, altura)
+
+
+# Patrimônio consolidado da carteira (carteira.ProjecaoCarteira.como_projecao())
+def grafico_vetorial_carteira(projecao, largura=180*mm, altura=90*mm):
+    return _grafico_vetorial_projecao(projecao, "Carteira (patrimônio)", largura, altura)
+
+
+def _grafico_vetorial_projecao(projecao, rotulo_ativo, largura, altura):
+    cor_eixo = colors.HexColor(COR_EIXO_GRAFICO)
+    series = [
+        (rotulo_ativo, projecao.bruto, colors.HexColor(COR_ATIVO), None, 2),
+        ("Benchmark: CDI", projecao.cdi, colors.HexColor(COR_CDI), (4, 2), 1.5),
+        ("Benchmark: Poupança", projecao.poupanca, colors.HexColor(COR_POUPANCA), (1, 2), 1.5),
+    ]
+
+    desenho = Drawing(largura, altura)
+    desenho.add(String(largura / 2, altura - 12, "Projeção da Rentabilidade Bruta vs. Benchmarks",
+                       fontName='Helvetica-Bold', fontSize=10, fillColor=colors.black, textAnchor='middle'))
+
+    # X em dias desde a aplicação (as datas da projeção não são equidistantes)
+    origem, fim = projecao.datas[0], projecao.datas[-1]
+    xs = [(d - origem).days for d in projecao.datas]
+
+    plot = LinePlot()
+    plot.x, plot.y = 62, 22
+    plot.width, plot.height = largura - plot.x - 70, altura - plot.y - 50
+    plot.data = [list(zip(xs, valores)) for _, valores, _, _, _ in series]
+    for i, (_, _, cor, tracejado, espessura) in enumerate(series):
+        plot.lines[i].strokeColor = cor
+        plot.lines[i].strokeWidth = espessura
+        if tracejado:
+            plot.lines[i].strokeDashArray = tracejado
+
+    marcas = _marcas_eixo_x(origem, fim)
+    rotulos = {(d - origem).days: texto for d, texto in marcas}
+    plot.xValueAxis.valueMin = 0
+    plot.xValueAxis.valueMax = max(xs[-1], 1)
+    plot.xValueAxis.valueSteps = list(rotulos)
+    plot.xValueAxis.labelTextFormat = lambda x: rotulos.get(int(round(x)), "")
+    plot.xValueAxis.strokeColor = cor_eixo
+    plot.xValueAxis.labels.fontName = 'Helvetica'
+    plot.xValueAxis.labels.fontSize = 7
+    plot.xValueAxis.labels.fillColor = cor_eixo
+
+    minimo = min(min(valores) for _, valores, _, _, _ in series)
+    maximo = max(max(valores) for _, valores, _, _, _ in series)
+    folga = (maximo - minimo) * 0.05 or maximo * 0.01
+    plot.yValueAxis.valueMin = minimo - folga
+    plot.yValueAxis.valueMax = maximo + folga
+    plot.yValueAxis.labelTextFormat = _brl_eixo
+    plot.yValueAxis.strokeColor = cor_eixo
+    plot.yValueAxis.labels.fontName = 'Helvetica'
+    plot.yValueAxis.labels.fontSize = 7
+    plot.yValueAxis.labels.fillColor = cor_eixo
+    plot.yValueAxis.visibleGrid = True
+    plot.yValueAxis.gridStrokeColor = colors.HexColor('#e5e5e5')
+    plot.yValueAxis.gridStrokeWidth = 0.5
+    desenho.add(plot)
+
+    # ANOTAÇÕES DE VALORES FINAIS (à direita da última data)
+    escala_y = plot.height / (plot.yValueAxis.valueMax - plot.yValueAxis.valueMin)
+    posicoes = []
+    for _, valores, _, _, _ in series:
+        y = plot.y + (valores[-1] - plot.yValueAxis.valueMin) * escala_y
+        # Evita sobreposição quando os valores finais são muito próximos
+        for anterior in posicoes:
+            if abs(y - anterior) < 8:
+                y = anterior - 8 if y <= anterior else anterior + 8
+        posicoes.append(y)
+        desenho.add(String(plot.x + plot.width + 4, y - 2.5, _brl_eixo(valores[-1]),
+                           fontName='Helvetica-Bold', fontSize=7, fillColor=colors.HexColor('#222222')))
+
+    legenda = LineLegend()
+    legenda.x, legenda.y = plot.x, altura - 24
+    legenda.columnMaximum = 1
+    legenda.deltax = 10
+    legenda.dx, legenda.dy = 14, 0
+    legenda.fontSize = 7
+    legenda.fontName = 'Helvetica'
+    legenda.fillColor = cor_eixo
+    legenda.alignment = 'right'
+    legenda.colorNamePairs = [(cor, nome) for nome, _, cor, _, _ in series]
+    legenda.strokeWidth = 1.5
+    desenho.add(legenda)
+
+    return desenho
@@ -0,0 +1,222 @@
+# ===================== HISTÓRICO DE SIMULAÇÕES (SQLITE) =====================
+# Simulações salvas e PDFs gerados ficam em um SQLite local, para recuperar
+# propostas antigas pelo código do cliente, assessor ou data:
+#   simulacoes   uma linha por simulação (chave = hash de cliente + entrada + modo);
+#                índices em (codigo_cliente, criado_em), (assessor, criado_em) e criado_em
+#   pdfs         bytes da proposta por chave (tabela separada: listar não lê blobs)
+#
+# Escrita: salvar() só enfileira; uma thread gravadora junta o que chegou e
+# grava em uma transação por lote (executemany), com journal em WAL. A página
+# nunca espera o disco, e leituras (uma conexão por thread) não bloqueiam a
+# gravação nem são bloqueadas por ela.
+#
+# Variáveis de ambiente:
+#   CDB_HISTORICO   caminho do banco (padrão: dados/historico.sqlite3)
+import atexit
+import datetime
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+from motor_calculo import TABELA_TRIBUTOS, EntradaSimulacao
+
+log = logging.getLogger("calculadora_cdb.historico")
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "historico.sqlite3")
+LOTE_MAXIMO = 500      # registros por transação
+ESPERA_LOTE = 0.05     # segundos que a gravadora espera por mais registros antes de gravar
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS simulacoes (
+    chave           TEXT PRIMARY KEY,
+    criado_em       TEXT NOT NULL,
+    codigo_cliente  TEXT NOT NULL,
+    nome_cliente    TEXT NOT NULL,
+    assessor        TEXT NOT NULL,
+    data_simulacao  TEXT NOT NULL,
+    modo            TEXT NOT NULL,
+    entrada         TEXT NOT NULL,
+    resultado       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_simulacoes_cliente ON simulacoes (codigo_cliente, criado_em);
+CREATE INDEX IF NOT EXISTS ix_simulacoes_assessor ON simulacoes (assessor, criado_em);
+CREATE INDEX IF NOT EXISTS ix_simulacoes_criado_em ON simulacoes (criado_em);
+CREATE TABLE IF NOT EXISTS pdfs (
+    chave      TEXT PRIMARY KEY,
+    criado_em  TEXT NOT NULL,
+    pdf        BLOB NOT NULL
+);
+"""
+
+# Salvar de novo a mesma simulação só a traz para o topo da lista
+_INSERIR_SIMULACAO = """
+INSERT INTO simulacoes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (chave) DO UPDATE SET criado_em = excluded.criado_em
+"""
+_INSERIR_PDF = "INSERT OR REPLACE INTO pdfs VALUES (?, ?, ?)"
+
+
+def caminho_historico():
+    return os.environ.get("CDB_HISTORICO") or CAMINHO_PADRAO
+
+
+def _json_entrada(entrada):
+    return json.dumps({k: (v.isoformat() if isinstance(v, datetime.date) else v) for k, v in vars(entrada).items()},
+                      ensure_ascii=False, sort_keys=True)
+
+
+def _entrada_de_json(texto):
+    dados = json.loads(texto)
+    for campo in ("data_aplicacao", "data_vencimento"):
+        dados[campo] = datetime.date.fromisoformat(dados[campo])
+    return EntradaSimulacao(**dados)
+
+
+# Mesma simulação (cliente, entrada, modo e tabela de tributos) -> mesma chave
+def chave_simulacao(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, modo="rapido"):
+    texto = "\x1f".join((codigo_cliente, nome_cliente, nome_assessor, data_simulacao.isoformat(), modo,
+                         TABELA_TRIBUTOS.versao, _json_entrada(entrada)))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass(frozen=True)
+class RegistroSimulacao:
+    chave: str
+    criado_em: datetime.datetime
+    codigo_cliente: str
+    nome_cliente: str
+    assessor: str
+    data_simulacao: datetime.date
+    modo: str
+    entrada: EntradaSimulacao
+    resultado: dict
+    tem_pdf: bool
+
+
+class Historico:
+    def __init__(self, caminho):
+        self.caminho = caminho
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        conexao = self._conectar()
+        conexao.executescript(_ESQUEMA)
+        conexao.close()
+
+        self._local = threading.local()
+        self._fila = queue.Queue()
+        self._gravadora = threading.Thread(target=self._gravar, name="historico-gravadora", daemon=True)
+        self._gravadora.start()
+
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        return conexao
+
+    def _leitura(self):
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = self._local.conexao = self._conectar()
+        return conexao
+
+    # ===================== ESCRITA (ASSÍNCRONA) =====================
+
+    def salvar(self, codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, resultado,
+               modo="rapido", pdf=None):
+        chave = chave_simulacao(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, modo)
+        agora = datetime.datetime.now().isoformat(timespec="seconds")
+        self._fila.put(("simulacao", (
+            chave, agora, codigo_cliente, nome_cliente, nome_assessor, data_simulacao.isoformat(), modo,
+            _json_entrada(entrada), json.dumps(vars(resultado), ensure_ascii=False),
+        )))
+        if pdf is not None:
+            self._fila.put(("pdf", (chave, agora, pdf)))
+        return chave
+
+    def _gravar(self):
+        conexao = self._conectar()
+        while True:
+            itens = [self._fila.get()]
+            try:
+                # Junta o que chegar em ESPERA_LOTE (ex.: simulação + PDF, ou um lote inteiro)
+                while len(itens) < LOTE_MAXIMO:
+                    itens.append(self._fila.get(timeout=ESPERA_LOTE if len(itens) == 1 else 0))
+            except queue.Empty:
+                pass
+            simulacoes = [dados for tipo, dados in itens if tipo == "simulacao"]
+            pdfs = [dados for tipo, dados in itens if tipo == "pdf"]
+            try:
+                with conexao:
+                    conexao.executemany(_INSERIR_SIMULACAO, simulacoes)
+                    conexao.executemany(_INSERIR_PDF, pdfs)
+            except sqlite3.Error:
+                log.exception("falha ao gravar %d registro(s) no histórico", len(itens))
+            finally:
+                for _ in itens:
+                    self._fila.task_done()
+
+    # Espera a gravadora esvaziar a fila (CLI, benchmarks e encerramento)
+    def descarregar(self):
+        self._fila.join()
+
+    # ===================== LEITURA =====================
+
+    def buscar(self, codigo_cliente=None, assessor=None, desde=None, limite=50):
+        condicoes, parametros = [], []
+        if codigo_cliente:
+            condicoes.append("s.codigo_cliente = ?")
+            parametros.append(codigo_cliente)
+        if assessor:
+            condicoes.append("s.assessor = ?")
+            parametros.append(assessor)
+        if desde:
+            condicoes.append("s.criado_em >= ?")
+            parametros.append(desde.isoformat())
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        linhas = self._leitura().execute(
+            f"SELECT s.*, p.chave IS NOT NULL FROM simulacoes s LEFT JOIN pdfs p USING (chave) {where} "
+            f"ORDER BY s.criado_em DESC LIMIT ?", (*parametros, limite)).fetchall()
+        return [self._registro(linha) for linha in linhas]
+
+    def obter(self, chave):
+        linha = self._leitura().execute(
+            "SELECT s.*, p.chave IS NOT NULL FROM simulacoes s LEFT JOIN pdfs p USING (chave) WHERE s.chave = ?",
+            (chave,)).fetchone()
+        return self._registro(linha) if linha else None
+
+    # Só a existência (sem ler o blob)
+    def tem_pdf(self, chave):
+        return self._leitura().execute("SELECT 1 FROM pdfs WHERE chave = ?", (chave,)).fetchone() is not None
+
+    def pdf(self, chave):
+        linha = self._leitura().execute("SELECT pdf FROM pdfs WHERE chave = ?", (chave,)).fetchone()
+        return bytes(linha[0]) if linha else None
+
+    @staticmethod
+    def _registro(linha):
+        chave, criado_em, codigo, nome, assessor, data_simulacao, modo, entrada, resultado, tem_pdf = linha
+        return RegistroSimulacao(
+            chave=chave,
+            criado_em=datetime.datetime.fromisoformat(criado_em),
+            codigo_cliente=codigo,
+            nome_cliente=nome,
+            assessor=assessor,
+            data_simulacao=datetime.date.fromisoformat(data_simulacao),
+            modo=modo,
+            entrada=_entrada_de_json(entrada),
+            resultado=json.loads(resultado),
+            tem_pdf=bool(tem_pdf),
+        )
+
+
+# Uma instância (e uma thread gravadora) por banco no processo
+@lru_cache(maxsize=None)
+def abrir_historico(caminho=None):
+    historico = Historico(caminho or caminho_historico())
+    atexit.register(historico.descarregar)
+    return historico
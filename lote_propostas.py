@@ -0,0 +1,259 @@
+# ===================== PROPOSTAS EM LOTE (PROCESS POOL) =====================
+# Gera uma proposta em PDF por linha de um CSV/Parquet de clientes, em paralelo,
+# gravando os arquivos em um diretório ou em um único ZIP.
+#
+# Colunas esperadas (cabeçalho):
+#   codigo, nome, assessor, valor, ativo, taxa, data_aplicacao, data_vencimento
+# Opcionais: taxa_cdi (benchmark / base do Pós-fixado), data_simulacao.
+# Para "CDB Pós-fixado (% do CDI)" a coluna taxa é o percentual do CDI.
+#
+# Uso:
+#   python lote_propostas.py clientes.csv saida/ --workers 8
+#   python lote_propostas.py clientes.parquet propostas.zip
+import argparse
+import csv
+import datetime
+import itertools
+import logging
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from motor_calculo import TAXA_CDI_MERCADO, EntradaSimulacao, eh_pos_fixado, validar_tipo
+
+log = logging.getLogger("lote_propostas")
+
+TAMANHO_BLOCO = 25          # linhas por tarefa enviada a um worker
+INTERVALO_PROGRESSO = 2.0   # segundos entre mensagens de progresso
+
+
+# ===================== LEITURA DA ENTRADA =====================
+
+# Separador detectado nas primeiras linhas (",", ";" ou tab). Não usa seek:
+# serve também para a entrada padrão (calculadora-cdb batch -)
+def ler_csv(arquivo):
+    amostra, tamanho = [], 0
+    for linha in arquivo:
+        amostra.append(linha)
+        tamanho += len(linha)
+        if tamanho >= 4096:
+            break
+    try:
+        dialeto = csv.Sniffer().sniff("".join(amostra), delimiters=",;\t")
+    except csv.Error:
+        dialeto = csv.excel
+    yield from csv.DictReader(itertools.chain(amostra, arquivo), dialect=dialeto)
+
+
+def _ler_csv(caminho):
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        yield from ler_csv(f)
+
+
+def _ler_parquet(caminho):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Leitura de Parquet requer o pacote pyarrow") from None
+    arquivo = pq.ParquetFile(caminho)
+    for lote in arquivo.iter_batches():
+        yield from lote.to_pylist()
+
+
+# Lê as linhas sob demanda (sem carregar o arquivo inteiro)
+def ler_clientes(caminho):
+    if caminho.lower().endswith((".parquet", ".pq")):
+        return _ler_parquet(caminho)
+    return _ler_csv(caminho)
+
+
+def _ler_numero(valor):
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    texto = str(valor).replace("R$", "").replace("%", "").strip()
+    if "," in texto:
+        # Formato brasileiro: 500.000,00
+        texto = texto.replace(".", "").replace(",", ".")
+    return float(texto)
+
+
+def _ler_data(valor):
+    if isinstance(valor, datetime.datetime):
+        return valor.date()
+    if isinstance(valor, datetime.date):
+        return valor
+    texto = str(valor).strip()
+    for formato in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.datetime.strptime(texto, formato).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Data inválida: {texto!r}")
+
+
+# Converte uma linha do arquivo em (codigo, nome, assessor, data_simulacao, EntradaSimulacao).
+# Ativo desconhecido é ValueError já aqui: a linha é descartada como as demais malformadas
+def linha_para_entrada(linha):
+    tipo = str(linha["ativo"]).strip()
+    validar_tipo(tipo)
+    taxa = _ler_numero(linha["taxa"])
+    taxa_cdi = linha.get("taxa_cdi")
+    taxa_cdi = _ler_numero(taxa_cdi) if taxa_cdi not in (None, "") else TAXA_CDI_MERCADO
+    data_simulacao = linha.get("data_simulacao")
+    data_simulacao = _ler_data(data_simulacao) if data_simulacao not in (None, "") else datetime.date.today()
+
+    entrada = EntradaSimulacao(
+        valor_investido=_ler_numero(linha["valor"]),
+        tipo_investimento=tipo,
+        data_aplicacao=_ler_data(linha["data_aplicacao"]),
+        data_vencimento=_ler_data(linha["data_vencimento"]),
+        taxa_anual=0.0 if eh_pos_fixado(tipo) else taxa,
+        perc_cdi=taxa if eh_pos_fixado(tipo) else 0.0,
+        taxa_cdi=taxa_cdi,
+    )
+    return str(linha["codigo"]), str(linha["nome"]), str(linha["assessor"]), data_simulacao, entrada
+
+
+def _nome_seguro(texto):
+    return re.sub(r"[^\w.-]+", "_", texto, flags=re.UNICODE).strip("_")
+
+
+# O número da linha no nome evita que clientes repetidos (mesmo código e nome)
+# sobrescrevam o arquivo um do outro ou dupliquem entradas no ZIP
+def nome_arquivo_lote(numero, codigo, nome_proposta):
+    raiz, extensao = os.path.splitext(nome_proposta)
+    return f"{_nome_seguro(codigo)}_{_nome_seguro(raiz)}_linha{numero}{extensao}"
+
+
+# ===================== WORKER =====================
+
+# Estado montado uma única vez por processo (fontes, estilos, logo). O
+# matplotlib fica de fora: o gráfico padrão é o vetorial do ReportLab, e o
+# raster (CDB_GRAFICO_PDF=png) importa o canvas Agg do grafico na primeira proposta.
+def _inicializar_worker():
+    from cache_logo import pre_carregar_logo
+    import proposta_pdf  # noqa: F401  (importa reportlab e registra as fontes padrão)
+
+    pre_carregar_logo()
+
+
+# Renderiza um bloco de linhas. Em modo diretório o próprio worker grava os
+# arquivos; em modo ZIP os bytes voltam para o processo principal.
+def _renderizar_bloco(bloco, diretorio):
+    from proposta_pdf import criar_pdf_perfeito, montar_proposta, nome_arquivo_proposta
+
+    saidas, erros = [], []
+    for numero, linha in bloco:
+        try:
+            codigo, nome, assessor, data_simulacao, entrada = linha_para_entrada(linha)
+            proposta = montar_proposta(codigo, nome, assessor, data_simulacao, entrada)
+            pdf = criar_pdf_perfeito(proposta)
+            nome_arq = nome_arquivo_lote(numero, codigo, nome_arquivo_proposta(proposta))
+            if diretorio is not None:
+                with open(os.path.join(diretorio, nome_arq), "wb") as f:
+                    f.write(pdf)
+                saidas.append((nome_arq, len(pdf), None))
+            else:
+                saidas.append((nome_arq, len(pdf), pdf))
+        except Exception as e:
+            erros.append((numero, f"{type(e).__name__}: {e}"))
+    return saidas, erros
+
+
+# ===================== ORQUESTRAÇÃO =====================
+
+def _blocos(linhas, tamanho):
+    bloco = []
+    for numero, linha in enumerate(linhas, start=1):
+        bloco.append((numero, linha))
+        if len(bloco) == tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def gerar_propostas(caminho_entrada, saida, workers=None, tamanho_bloco=TAMANHO_BLOCO):
+    workers = workers or os.cpu_count() or 1
+    modo_zip = saida.lower().endswith(".zip")
+    diretorio = None
+    if not modo_zip:
+        os.makedirs(saida, exist_ok=True)
+        diretorio = saida
+
+    arquivo_zip = zipfile.ZipFile(saida, "w", compression=zipfile.ZIP_STORED) if modo_zip else None
+    inicio = time.perf_counter()
+    ultimo_aviso = inicio
+    total, total_bytes, erros = 0, 0, []
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker) as executor:
+            pendentes = set()
+            blocos = _blocos(ler_clientes(caminho_entrada), tamanho_bloco)
+            esgotado = False
+            while pendentes or not esgotado:
+                # Mantém no máximo 2 blocos por worker em voo: memória limitada em arquivos grandes
+                while not esgotado and len(pendentes) < workers * 2:
+                    bloco = next(blocos, None)
+                    if bloco is None:
+                        esgotado = True
+                    else:
+                        pendentes.add(executor.submit(_renderizar_bloco, bloco, diretorio))
+                if not pendentes:
+                    break
+
+                concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    saidas, erros_bloco = futuro.result()
+                    erros.extend(erros_bloco)
+                    for nome_arq, tamanho, pdf in saidas:
+                        if arquivo_zip is not None:
+                            arquivo_zip.writestr(nome_arq, pdf)
+                        total += 1
+                        total_bytes += tamanho
+
+                agora = time.perf_counter()
+                if agora - ultimo_aviso >= INTERVALO_PROGRESSO:
+                    ultimo_aviso = agora
+                    log.info("%d propostas geradas (%.1f/s), %d erros", total, total / (agora - inicio), len(erros))
+    finally:
+        if arquivo_zip is not None:
+            arquivo_zip.close()
+
+    duracao = time.perf_counter() - inicio
+    for numero, mensagem in erros:
+        log.warning("linha %d: %s", numero, mensagem)
+    resumo = {
+        "propostas": total,
+        "erros": len(erros),
+        "segundos": round(duracao, 3),
+        "propostas_por_segundo": round(total / duracao, 2) if duracao else 0.0,
+        "bytes": total_bytes,
+        "workers": workers,
+    }
+    log.info("Concluído: %(propostas)d propostas em %(segundos).1fs (%(propostas_por_segundo).1f/s, %(workers)d workers)", resumo)
+    return resumo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera propostas em PDF em lote a partir de um CSV/Parquet de clientes.")
+    parser.add_argument("entrada", help="arquivo .csv ou .parquet com os clientes")
+    parser.add_argument("saida", help="diretório de destino ou arquivo .zip")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: número de CPUs)")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por tarefa")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        resumo = gerar_propostas(args.entrada, args.saida, workers=args.workers, tamanho_bloco=args.bloco)
+    except RuntimeError as e:
+        log.error("%s", e)
+        return 2
+    return 1 if resumo["erros"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
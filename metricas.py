@@ -0,0 +1,145 @@
+# ===================== MÉTRICAS DE DESEMPENHO (ETAPAS E CONTADORES) =====================
+# Instrumentação leve dos caminhos quentes da proposta:
+#   etapa("pdf.build")       tempo de uma etapa (context manager)
+#   contar("cache.pdf.miss") contador (ex.: acertos e faltas de cache)
+#   observar("pdf.bytes", n) valor medido (ex.: tamanho do PDF)
+#
+# Desligada por padrão: etapa() devolve um context manager vazio compartilhado
+# e contar()/observar() retornam na primeira linha, então o custo nos caminhos
+# quentes fica em uma chamada de função. Ligada, cada medida é acumulada por
+# processo (thread-safe) e registrada como log estruturado (JSON) no logger
+# "calculadora_cdb.metricas".
+#
+# Saídas: instantaneo() (dict), prometheus() (formato texto do Prometheus),
+# o expander "Desempenho" da página e GET /metrics no servidor_api.
+#
+# Variáveis de ambiente:
+#   CDB_METRICAS   1 liga a coleta desde a partida (padrão: desligada)
+import contextlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+log = logging.getLogger("calculadora_cdb.metricas")
+
+_ativo = os.environ.get("CDB_METRICAS", "").lower() in ("1", "true", "sim")
+_trava = threading.Lock()
+_etapas = {}       # nome -> [chamadas, total_s, max_s, ultimo_s]
+_contadores = {}   # nome -> int
+_observacoes = {}  # nome -> [quantidade, soma, ultimo]
+
+_VAZIO = contextlib.nullcontext()
+
+
+def ativo():
+    return _ativo
+
+
+def ativar(ligado=True):
+    global _ativo
+    _ativo = bool(ligado)
+
+
+def zerar():
+    with _trava:
+        _etapas.clear()
+        _contadores.clear()
+        _observacoes.clear()
+
+
+def _registrar(evento, nome, **campos):
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps({"evento": evento, "nome": nome, **campos}, ensure_ascii=False))
+
+
+class _Etapa:
+    __slots__ = ("nome", "inicio")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duracao = time.perf_counter() - self.inicio
+        with _trava:
+            acumulado = _etapas.get(self.nome)
+            if acumulado is None:
+                _etapas[self.nome] = [1, duracao, duracao, duracao]
+            else:
+                acumulado[0] += 1
+                acumulado[1] += duracao
+                acumulado[2] = max(acumulado[2], duracao)
+                acumulado[3] = duracao
+        _registrar("etapa", self.nome, ms=round(duracao * 1000, 3), erro=exc[0] is not None)
+        return False
+
+
+def etapa(nome):
+    return _Etapa(nome) if _ativo else _VAZIO
+
+
+def contar(nome, n=1):
+    if not _ativo:
+        return
+    with _trava:
+        _contadores[nome] = _contadores.get(nome, 0) + n
+
+
+def observar(nome, valor):
+    if not _ativo:
+        return
+    with _trava:
+        acumulado = _observacoes.get(nome)
+        if acumulado is None:
+            _observacoes[nome] = [1, valor, valor]
+        else:
+            acumulado[0] += 1
+            acumulado[1] += valor
+            acumulado[2] = valor
+    _registrar("observacao", nome, valor=valor)
+
+
+# ===================== LEITURA =====================
+
+def instantaneo():
+    with _trava:
+        etapas = {
+            nome: {"chamadas": c, "total_ms": t * 1000, "media_ms": t / c * 1000, "max_ms": m * 1000, "ultimo_ms": u * 1000}
+            for nome, (c, t, m, u) in _etapas.items()
+        }
+        contadores = dict(_contadores)
+        observacoes = {nome: {"quantidade": q, "media": s / q, "ultimo": u} for nome, (q, s, u) in _observacoes.items()}
+    return {"etapas": etapas, "contadores": contadores, "observacoes": observacoes}
+
+
+def _nome_prometheus(nome):
+    return "cdb_" + re.sub(r"[^a-zA-Z0-9_]", "_", nome)
+
+
+# Formato texto de exposição do Prometheus (etapas como summary sem quantis)
+def prometheus():
+    with _trava:
+        etapas = {nome: tuple(v) for nome, v in _etapas.items()}
+        contadores = dict(_contadores)
+        observacoes = {nome: tuple(v) for nome, v in _observacoes.items()}
+
+    linhas = []
+    if etapas:
+        linhas.append("# TYPE cdb_etapa_segundos summary")
+        for nome, (chamadas, total, _, _) in sorted(etapas.items()):
+            linhas.append(f'cdb_etapa_segundos_count{{etapa="{nome}"}} {chamadas}')
+            linhas.append(f'cdb_etapa_segundos_sum{{etapa="{nome}"}} {total:.6f}')
+    for nome, valor in sorted(contadores.items()):
+        metrica = _nome_prometheus(nome) + "_total"
+        linhas += [f"# TYPE {metrica} counter", f"{metrica} {valor}"]
+    for nome, (quantidade, soma, ultimo) in sorted(observacoes.items()):
+        metrica = _nome_prometheus(nome)
+        linhas += [f"# TYPE {metrica} summary", f"{metrica}_count {quantidade}", f"{metrica}_sum {soma}",
+                   f"# TYPE {metrica}_ultimo gauge", f"{metrica}_ultimo {ultimo}"]
+    return "\n".join(linhas) + "\n"
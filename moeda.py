@@ -0,0 +1,88 @@
+# ===================== MOEDA (pt-BR) =====================
+# Formatação e leitura de valores em reais em um só lugar:
+#   brl(1234.5)            "R$ 1.234,50"   (negativos: "-R$ 1.234,50"; casas=0 em eixos e anotações)
+#   numero_br(1234.5)      "1.234,50"      (sem prefixo)
+#   brl_lote(valores)      lista de strings para colunas inteiras (tabelas de PDF, exportações)
+#   ler_brl("R$ 1.234,50") 1234.5          (decimal=True devolve Decimal, para o modo preciso)
+#   mascara_brl("1234,5")  "1.234,50"      (máscara do campo de valor digitado)
+#
+# O agrupamento sai do próprio format ("_" como separador de milhar) e vira
+# ponto/vírgula com duas trocas de caractere, sem regex. brl_lote formata tudo
+# em um único buffer e faz as trocas uma vez para a coluna inteira.
+# Não importa NumPy: arrays são lidos com .tolist().
+#
+# benchmarks/bench_moeda.py mede a vazão; tests/test_moeda.py verifica o ida-e-volta formatar -> ler.
+import math
+import re
+from decimal import Decimal, InvalidOperation
+
+_ESPEC = {0: "_.0f", 2: "_.2f"}
+_NAO_DIGITO = re.compile(r"[^\d,]")
+
+
+def _espec(casas):
+    return _ESPEC.get(casas) or f"_.{casas}f"
+
+
+# Caminho comum (float e 0/2 casas) em um format; os demais pelo fallback
+def _agrupado(valor, casas):
+    try:
+        return format(valor, _ESPEC[casas])
+    except (KeyError, ValueError):
+        # Decimal não aceita "_" como separador de milhar
+        return format(valor, f",.{casas}f").replace(",", "_")
+
+
+def numero_br(valor, casas=2):
+    return _agrupado(valor, casas).replace(".", ",").replace("_", ".")
+
+
+def brl(valor, casas=2):
+    try:
+        texto = format(valor, _ESPEC[casas])
+    except (KeyError, ValueError):
+        texto = _agrupado(valor, casas)
+    texto = texto.replace(".", ",").replace("_", ".")
+    if texto[0] == "-":
+        return "-R$ " + texto[1:]
+    return "R$ " + texto
+
+
+# Valores não finitos (NaN de linhas inválidas do lote) viram "-"
+def brl_lote(valores, casas=2):
+    valores = valores.tolist() if hasattr(valores, "tolist") else list(valores)
+    if not valores:
+        return []
+    try:
+        buffer = "\n".join(map(("R$ {:" + _espec(casas) + "}").format, valores))
+    except ValueError:
+        return [brl(valor, casas) for valor in valores]
+    buffer = buffer.replace(".", ",").replace("_", ".").replace("R$ -", "-R$ ")
+    if "n" in buffer:  # "nan" / "inf"
+        return [texto if texto[-1].isdigit() else "-" for texto in buffer.split("\n")]
+    return buffer.split("\n")
+
+
+def ler_brl(texto, decimal=False):
+    limpo = texto.replace("R$", "").replace(" ", "").replace("\xa0", "").replace(".", "").replace(",", ".")
+    try:
+        valor = Decimal(limpo) if decimal else float(limpo)
+    except (ValueError, InvalidOperation):
+        raise ValueError(f"Valor em reais inválido: {texto!r}") from None
+    if not math.isfinite(valor):
+        raise ValueError(f"Valor em reais inválido: {texto!r}")
+    return valor
+
+
+def _centavos_br(centavos):
+    return f"{centavos // 100:_},{centavos % 100:02d}".replace("_", ".")
+
+
+# Máscara do campo de valor: mantém dígitos e a primeira vírgula, no máximo
+# duas casas decimais; em inteiros (centavos), sem arredondamento de float
+def mascara_brl(texto):
+    inteiro, _, fracao = _NAO_DIGITO.sub("", texto).partition(",")
+    fracao = fracao.partition(",")[0][:2]
+    if not inteiro and not fracao:
+        return "0,00"
+    return _centavos_br(int(inteiro or 0) * 100 + int(fracao.ljust(2, "0")))
@@ -0,0 +1,291 @@
+# ===================== MOTOR DE CÁLCULO (SEM STREAMLIT) =====================
+# Núcleo da calculadora: tabelas de IR/IOF, capitalização e curvas de benchmark.
+# Não importa streamlit, matplotlib nem reportlab, para poder ser usado por
+# jobs em lote e APIs; a página Streamlit é apenas um cliente deste módulo.
+import datetime
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from calendario import dias_uteis
+from tabela_tributos import carregar_tabela
+
+TIPOS_INVESTIMENTO = ["CDB Pré-fixado", "CDB Pós-fixado (% do CDI)", "LCI", "LCA"]
+
+TAXA_CDI_MERCADO = 14.90       # % a.a.
+TAXA_POUPANCA_ANUAL = 0.0617   # Proxy da poupança (6,17% a.a.)
+
+
+# ===================== FUNÇÕES DE CÁLCULO DE IMPOSTOS =====================
+
+# Faixas legais vêm de tributacao.json (versão vigente); ver tabela_tributos
+TABELA_TRIBUTOS = carregar_tabela()
+TIPOS_ISENTOS = TABELA_TRIBUTOS.isentos
+
+# Tabela IOF (percentual de desconto por dia)
+iof_tab_valores = list(TABELA_TRIBUTOS.iof_por_dia) # index 0 é o dia 1
+
+# Tabela Regressiva de IR para Renda Fixa
+def obter_aliquota_ir(dias, tabela=TABELA_TRIBUTOS):
+    return tabela.aliquotas_ir[bisect_left(tabela.limites_ir, dias)]
+
+# Função principal que calcula IR e IOF baseado no tipo de investimento
+def calcular_impostos(prazo_dias, rendimento_bruto, tipo_investimento, tabela=TABELA_TRIBUTOS):
+
+    # 1. Isenção de LCI/LCA: Isentos de IR e IOF para Pessoas Físicas.
+    if tipo_investimento in tabela.isentos:
+        # Retorna IR, IOF e Alíquota IR (zero)
+        return 0.0, 0.0, 0.0
+
+    # 2. Imposto sobre Operações Financeiras (IOF) - Apenas CDBs/LC
+    iof_valor = 0.0
+    if prazo_dias <= len(tabela.iof_por_dia):
+        # Pega a alíquota de IOF
+        aliquota_iof = tabela.iof_por_dia[prazo_dias - 1] # Index 0 é o dia 1
+        iof_valor = rendimento_bruto * aliquota_iof
+
+    # Rendimento que serve de base para o IR (Rendimento Bruto - IOF)
+    rendimento_apos_iof = rendimento_bruto - iof_valor
+
+    # 3. Imposto de Renda (IR)
+    aliquota_ir = obter_aliquota_ir(prazo_dias, tabela)
+    ir_valor = rendimento_apos_iof * aliquota_ir
+
+    return ir_valor, iof_valor, aliquota_ir
+
+
+# ===================== ENTRADA / RESULTADO =====================
+
+def eh_pos_fixado(tipo_investimento):
+    return "Pós-fixado" in tipo_investimento
+
+
+# Texto livre (CSV do lote, JSON da API) não pode cair na tributação de CDB por engano
+def validar_tipo(tipo_investimento):
+    if tipo_investimento not in TIPOS_INVESTIMENTO:
+        raise ValueError(f"Tipo de investimento desconhecido: {tipo_investimento}")
+
+
+@dataclass(frozen=True)
+class EntradaSimulacao:
+    valor_investido: float
+    tipo_investimento: str
+    data_aplicacao: datetime.date
+    data_vencimento: datetime.date
+    taxa_anual: float = 0.0           # % a.a. (Pré-fixado, LCI e LCA)
+    perc_cdi: float = 0.0             # % do CDI (Pós-fixado)
+    taxa_cdi: float = TAXA_CDI_MERCADO  # % a.a. (benchmark e base do Pós-fixado)
+    cdi_historico: bool = False       # CDI diário realizado (curva_cdi) no Pós-fixado e no benchmark
+
+    # Taxa anual efetivamente aplicada ao ativo (%)
+    @property
+    def taxa_efetiva(self):
+        if eh_pos_fixado(self.tipo_investimento):
+            return self.taxa_cdi * (self.perc_cdi / 100)
+        return self.taxa_anual
+
+    # Base de capitalização: 252 para Pós-fixado, 360 para os demais
+    @property
+    def dias_ano(self):
+        return 252 if eh_pos_fixado(self.tipo_investimento) else 360
+
+    # Dias capitalizados até a data: dias úteis (ANBIMA) no Pós-fixado, corridos nos demais
+    def dias_capitalizacao(self, data):
+        if eh_pos_fixado(self.tipo_investimento):
+            return dias_uteis(self.data_aplicacao, data)
+        return (data - self.data_aplicacao).days
+
+
+@dataclass(frozen=True)
+class ResultadoSimulacao:
+    prazo_dias: int
+    prazo_meses: int
+    dias_capitalizacao: int
+    taxa_anual: float
+    taxa_diaria: float
+    montante_bruto: float
+    rendimento_bruto: float
+    ir: float
+    iof: float
+    aliquota_ir: float
+    impostos_totais: float
+    montante_liquido: float
+    rendimento_liquido: float
+    montante_cdi: float
+    montante_poupanca: float
+
+
+@dataclass(frozen=True)
+class ProjecaoRentabilidade:
+    datas: tuple
+    bruto: tuple
+    cdi: tuple
+    poupanca: tuple
+
+
+# ===================== ENTRADA A PARTIR DE JSON =====================
+# Campos do POST /simulate (servidor_api) e do simulate da CLI; erros de
+# conteúdo viram ValueError com o nome do campo.
+
+def data_de_json(dados, campo):
+    try:
+        return datetime.date.fromisoformat(str(dados[campo]))
+    except KeyError:
+        raise ValueError(f"Campo obrigatório ausente: {campo}") from None
+    except ValueError:
+        raise ValueError(f"Data inválida em {campo} (use AAAA-MM-DD): {dados[campo]!r}") from None
+
+
+def _numero_de_json(dados, campo, padrao=None):
+    valor = dados.get(campo, padrao)
+    if valor is None:
+        raise ValueError(f"Campo obrigatório ausente: {campo}")
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"Número inválido em {campo}: {valor!r}") from None
+
+
+def entrada_de_json(dados):
+    if not isinstance(dados, dict):
+        raise ValueError("Esperado um objeto JSON")
+    tipo = dados.get("tipo_investimento")
+    if not tipo:
+        raise ValueError("Campo obrigatório ausente: tipo_investimento")
+    return EntradaSimulacao(
+        valor_investido=_numero_de_json(dados, "valor_investido"),
+        tipo_investimento=str(tipo),
+        data_aplicacao=data_de_json(dados, "data_aplicacao"),
+        data_vencimento=data_de_json(dados, "data_vencimento"),
+        taxa_anual=_numero_de_json(dados, "taxa_anual", 0.0),
+        perc_cdi=_numero_de_json(dados, "perc_cdi", 0.0),
+        taxa_cdi=_numero_de_json(dados, "taxa_cdi", TAXA_CDI_MERCADO),
+        cdi_historico=bool(dados.get("cdi_historico", False)),
+    )
+
+
+# ===================== CÁLCULOS PRINCIPAIS =====================
+
+def calcular_prazo_meses(data_aplicacao, data_vencimento):
+    prazo_meses = (data_vencimento.year - data_aplicacao.year)*12 + (data_vencimento.month - data_aplicacao.month)
+    if data_vencimento.day < data_aplicacao.day: prazo_meses -= 1
+    return prazo_meses
+
+
+def calcular_taxa_diaria(taxa_anual, dias_ano):
+    return (1 + taxa_anual/100)**(1/dias_ano) - 1
+
+
+# Taxas diárias (dias corridos) dos benchmarks CDI e Poupança
+def taxas_benchmark_diarias(taxa_cdi):
+    taxa_cdi_diaria_corrida = (1 + taxa_cdi / 100)**(1/365) - 1
+    taxa_poupanca_diaria_corrida = (1 + TAXA_POUPANCA_ANUAL)**(1/365) - 1
+    return taxa_cdi_diaria_corrida, taxa_poupanca_diaria_corrida
+
+
+# Curva histórica só é carregada (NumPy + memmap) quando cdi_historico=True
+def _curva_cdi():
+    from curva_cdi import carregar_curva
+    return carregar_curva()
+
+
+# Montantes do ativo e do benchmark CDI na data. Com cdi_historico, o CDI
+# realizado vem da curva_cdi (projetado pela taxa_cdi depois do fim da série).
+def montantes_ativo_cdi(entrada, taxa_diaria, data):
+    valor_investido = entrada.valor_investido
+    if entrada.cdi_historico:
+        curva = _curva_cdi()
+        montante_cdi = valor_investido * curva.fator(entrada.data_aplicacao, data, 100.0, entrada.taxa_cdi)
+        if eh_pos_fixado(entrada.tipo_investimento):
+            montante_ativo = valor_investido * curva.fator(entrada.data_aplicacao, data, entrada.perc_cdi, entrada.taxa_cdi)
+            return montante_ativo, montante_cdi
+    else:
+        taxa_cdi_diaria, _ = taxas_benchmark_diarias(entrada.taxa_cdi)
+        montante_cdi = valor_investido * (1 + taxa_cdi_diaria)**(data - entrada.data_aplicacao).days
+    return valor_investido * (1 + taxa_diaria)**entrada.dias_capitalizacao(data), montante_cdi
+
+
+def simular(entrada):
+    validar_tipo(entrada.tipo_investimento)
+    if entrada.valor_investido <= 0:
+        raise ValueError("Valor investido deve ser maior que zero.")
+    prazo_dias = (entrada.data_vencimento - entrada.data_aplicacao).days
+    if prazo_dias <= 0:
+        raise ValueError("Data de resgate deve ser posterior")
+
+    valor_investido = entrada.valor_investido
+    taxa_anual = entrada.taxa_efetiva
+
+    # Cálculo do Montante Bruto (igual para todos)
+    taxa_diaria = calcular_taxa_diaria(taxa_anual, entrada.dias_ano)
+    dias_capitalizacao = entrada.dias_capitalizacao(entrada.data_vencimento)
+    montante_bruto, montante_cdi = montantes_ativo_cdi(entrada, taxa_diaria, entrada.data_vencimento)
+    rendimento_bruto = montante_bruto - valor_investido # RENTABILIDADE BRUTA
+
+    ir, iof, aliquota_ir = calcular_impostos(prazo_dias, rendimento_bruto, entrada.tipo_investimento)
+
+    impostos_totais = ir + iof
+    montante_liquido = montante_bruto - impostos_totais
+
+    _, taxa_poupanca_diaria = taxas_benchmark_diarias(entrada.taxa_cdi)
+
+    return ResultadoSimulacao(
+        prazo_dias=prazo_dias,
+        prazo_meses=calcular_prazo_meses(entrada.data_aplicacao, entrada.data_vencimento),
+        dias_capitalizacao=dias_capitalizacao,
+        taxa_anual=taxa_anual,
+        taxa_diaria=taxa_diaria,
+        montante_bruto=montante_bruto,
+        rendimento_bruto=rendimento_bruto,
+        ir=ir,
+        iof=iof,
+        aliquota_ir=aliquota_ir,
+        impostos_totais=impostos_totais,
+        montante_liquido=montante_liquido,
+        rendimento_liquido=montante_liquido - valor_investido, # RENTABILIDADE LÍQUIDA
+        montante_cdi=montante_cdi,
+        montante_poupanca=valor_investido * (1 + taxa_poupanca_diaria)**prazo_dias,
+    )
+
+
+# ===================== PROJEÇÃO MENSAL (ATIVO x BENCHMARKS) =====================
+
+def projetar_rentabilidade(entrada, resultado=None):
+    from dateutil.relativedelta import relativedelta
+
+    if resultado is None:
+        resultado = simular(entrada)
+
+    data_aplicacao, data_vencimento = entrada.data_aplicacao, entrada.data_vencimento
+    valor_investido = entrada.valor_investido
+    prazo_meses, prazo_dias = resultado.prazo_meses, resultado.prazo_dias
+    taxa_diaria = resultado.taxa_diaria
+    _, taxa_poupanca_diaria = taxas_benchmark_diarias(entrada.taxa_cdi)
+
+    datas, bruto, cdi, poupanca = [], [], [], []
+    data_temp = data_aplicacao
+
+    for m in range(prazo_meses + 1):
+        dias = (data_temp - data_aplicacao).days
+        if m == 0: dias = 0
+        if m == prazo_meses: dias = prazo_dias
+        if m == prazo_meses:
+            valor_bruto, valor_cdi = resultado.montante_bruto, resultado.montante_cdi
+        else:
+            valor_bruto, valor_cdi = montantes_ativo_cdi(entrada, taxa_diaria, data_temp)
+
+        datas.append(data_temp)
+        bruto.append(valor_bruto)
+        cdi.append(valor_cdi)
+        poupanca.append(valor_investido * (1 + taxa_poupanca_diaria)**dias)
+
+        data_temp += relativedelta(months=1)
+        if data_temp > data_vencimento:
+            data_temp = data_vencimento
+
+    if data_vencimento not in datas:
+        datas.append(data_vencimento)
+        bruto.append(resultado.montante_bruto)
+        cdi.append(resultado.montante_cdi)
+        poupanca.append(resultado.montante_poupanca)
+
+    return ProjecaoRentabilidade(tuple(datas), tuple(bruto), tuple(cdi), tuple(poupanca))
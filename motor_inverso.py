@@ -0,0 +1,106 @@
+# ===================== SIMULAÇÃO INVERSA (TAXA / PRAZO PARA UM ALVO) =====================
+# Responde às perguntas do assessor sem tentativa e erro nos widgets:
+#   taxa_para_alvo     taxa (ou % do CDI) que leva ao montante líquido desejado
+#   taxa_equivalente   gross-up entre produtos tributados e isentos (ex.: LCI -> CDB)
+#   prazo_para_alvo    menor prazo (dias) em que o líquido atinge o alvo
+# Tudo vetorizado sobre arrays (ex.: uma grade de vencimentos em uma chamada).
+#
+# Com o prazo fixo, IOF e IR são alíquotas fixas sobre o rendimento, então o
+# líquido é afim no montante bruto e a taxa sai em forma fechada. Só o prazo
+# exige busca: o líquido é não decrescente nos dias (a tabela regressiva só
+# reduz o imposto), o que permite bisseção sobre dias inteiros.
+import datetime
+
+import numpy as np
+
+import calendario
+from motor_calculo import TAXA_CDI_MERCADO
+from motor_lote import (
+    _datas, codificar_tipos, compilar_esquema, dias_capitalizacao_lote, eh_pos_fixado_lote, simular_lote,
+)
+
+PRAZO_MAXIMO_PADRAO = 30 * 365
+
+
+# Taxa anual (%) do ativo; no Pós-fixado, o % do CDI (sobre taxa_cdi).
+# NaN quando o alvo não é atingível (ex.: líquido alvo <= 0) ou a linha é inválida.
+def taxa_para_alvo(valor_investido, tipo_investimento, data_aplicacao, data_vencimento,
+                   montante_liquido_alvo, taxa_cdi=TAXA_CDI_MERCADO):
+    codigos = codificar_tipos(tipo_investimento)
+    valor, alvo, taxa_cdi, codigos, aplicacao, vencimento = np.broadcast_arrays(
+        np.asarray(valor_investido, dtype=np.float64),
+        np.asarray(montante_liquido_alvo, dtype=np.float64),
+        np.asarray(taxa_cdi, dtype=np.float64),
+        codigos,
+        _datas(data_aplicacao),
+        _datas(data_vencimento),
+    )
+    prazo_dias = (vencimento - aplicacao).astype(np.int64)
+    validos = (valor > 0) & (prazo_dias > 0) & (alvo > 0)
+
+    # líquido = valor + (bruto - valor) * (1 - iof) * (1 - ir)
+    esquema = compilar_esquema()
+    retido = esquema.fator_retido[codigos, esquema.indices(prazo_dias)]
+    montante_bruto = valor + (alvo - valor) / retido
+
+    pos = eh_pos_fixado_lote(codigos)
+    dias_ano = np.where(pos, 252.0, 360.0)
+    dias_capitalizacao = dias_capitalizacao_lote(pos, aplicacao, vencimento)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fator = montante_bruto / valor
+        taxa = (fator ** (dias_ano / dias_capitalizacao) - 1) * 100
+        taxa = np.where(pos, taxa / taxa_cdi * 100, taxa)
+    validos &= (fator > 0) & (dias_capitalizacao > 0)
+    return np.where(validos, taxa, np.nan)
+
+
+# Taxa (ou % do CDI) no tipo_destino com o mesmo líquido que `taxa` rende no tipo_origem.
+# Ex.: taxa_equivalente(12.0, "LCI", "CDB Pré-fixado", ...) -> taxa de CDB equivalente.
+def taxa_equivalente(taxa, tipo_origem, tipo_destino, data_aplicacao, data_vencimento,
+                     taxa_cdi=TAXA_CDI_MERCADO):
+    codigos = codificar_tipos(tipo_origem)
+    pos = eh_pos_fixado_lote(codigos)
+    taxa = np.asarray(taxa, dtype=np.float64)
+    origem = simular_lote(
+        1.0, codigos, data_aplicacao, data_vencimento,
+        taxa_anual=np.where(pos, 0.0, taxa), perc_cdi=np.where(pos, taxa, 0.0), taxa_cdi=taxa_cdi,
+    )
+    return taxa_para_alvo(1.0, tipo_destino, data_aplicacao, data_vencimento,
+                          origem.montante_liquido, taxa_cdi=taxa_cdi)
+
+
+# Menor prazo em dias corridos para o líquido atingir o alvo (-1 se não atinge até prazo_maximo).
+# No Pós-fixado a busca para na última data do calendário de dias úteis.
+def prazo_para_alvo(valor_investido, tipo_investimento, data_aplicacao, montante_liquido_alvo,
+                    taxa_anual=0.0, perc_cdi=0.0, taxa_cdi=TAXA_CDI_MERCADO, prazo_maximo=PRAZO_MAXIMO_PADRAO):
+    codigos = codificar_tipos(tipo_investimento)
+    valor, alvo, taxa_anual, perc_cdi, taxa_cdi, codigos, aplicacao = np.broadcast_arrays(
+        np.asarray(valor_investido, dtype=np.float64),
+        np.asarray(montante_liquido_alvo, dtype=np.float64),
+        np.asarray(taxa_anual, dtype=np.float64),
+        np.asarray(perc_cdi, dtype=np.float64),
+        np.asarray(taxa_cdi, dtype=np.float64),
+        codigos,
+        _datas(data_aplicacao),
+    )
+
+    def liquido(dias):
+        return simular_lote(valor, codigos, aplicacao, aplicacao + dias,
+                            taxa_anual=taxa_anual, perc_cdi=perc_cdi, taxa_cdi=taxa_cdi).montante_liquido
+
+    # Bisseção em dias inteiros: invariante liquido(alto) >= alvo, liquido(baixo - 1) < alvo
+    baixo = np.ones(valor.shape, dtype=np.int64)
+    alto = np.full(valor.shape, prazo_maximo, dtype=np.int64)
+    ultima_data = np.datetime64(datetime.date.fromordinal(calendario.ORDINAL_FINAL), "D")
+    alto = np.where(eh_pos_fixado_lote(codigos), np.minimum(alto, (ultima_data - aplicacao).astype(np.int64)), alto)
+    atinge = liquido(alto) >= alvo
+    while True:
+        ativos = atinge & (baixo < alto)
+        if not ativos.any():
+            break
+        meio = (baixo + alto) // 2
+        chegou = liquido(meio) >= alvo
+        alto = np.where(ativos & chegou, meio, alto)
+        baixo = np.where(ativos & ~chegou, meio + 1, baixo)
+    return np.where(atinge, alto, -1)
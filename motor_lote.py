@@ -0,0 +1,259 @@
+# ===================== SIMULAÇÃO EM LOTE (VETORIZADA COM NUMPY) =====================
+# Reprecificação de carteiras inteiras: as mesmas fórmulas de motor_calculo
+# (simular / calcular_impostos), aplicadas de uma vez sobre arrays NumPy.
+# modo="preciso" aplica os arredondamentos de custódia de motor_preciso
+# (taxa diária em 8 casas, bruto/IOF/IR truncados no centavo) em float64; as
+# linhas que o float64 não decide são refeitas em Decimal (_montantes_duvidosos).
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+import calendario
+from motor_calculo import TAXA_CDI_MERCADO, TIPOS_INVESTIMENTO, eh_pos_fixado
+from motor_preciso import CASAS_TAXA_DIARIA, MODOS_NUMERICOS, decimal_de, montante_decimal
+from tabela_tributos import carregar_tabela
+
+# Códigos numéricos dos tipos (posição em TIPOS_INVESTIMENTO)
+CODIGOS_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_INVESTIMENTO)}
+_CODIGOS_POS = np.array([CODIGOS_TIPO[t] for t in TIPOS_INVESTIMENTO if eh_pos_fixado(t)])
+
+# ===================== TABELA DE TRIBUTOS COMPILADA =====================
+# Para cada tipo e cada prazo de 0 a DIAS_ESQUEMA: alíquotas de IOF e IR e o
+# fator retido (1 - IOF) * (1 - IR). Prazos maiores usam a última coluna (as
+# faixas já estão estáveis). Tributar um lote vira uma indexação [tipo, prazo].
+DIAS_ESQUEMA = 3650
+
+
+@dataclass(frozen=True)
+class EsquemaTributos:
+    versao: str
+    aliquota_iof: np.ndarray     # [tipo, prazo_dias]
+    aliquota_ir: np.ndarray      # [tipo, prazo_dias]
+    fator_retido: np.ndarray     # [tipo, prazo_dias] fração do rendimento que fica com o cliente
+
+    def indices(self, prazo_dias):
+        return np.clip(prazo_dias, 0, self.fator_retido.shape[1] - 1)
+
+
+@lru_cache(maxsize=None)
+def compilar_esquema(versao=None, dias=DIAS_ESQUEMA):
+    tabela = carregar_tabela(versao)
+    if dias <= max(tabela.limites_ir[-1], len(tabela.iof_por_dia)):
+        raise ValueError("DIAS_ESQUEMA deve ultrapassar a última faixa de IR e a tabela de IOF")
+
+    prazos = np.arange(dias + 1)
+    iof_por_dia = np.zeros(dias + 1)
+    iof_por_dia[1:len(tabela.iof_por_dia) + 1] = tabela.iof_por_dia  # index 0 é o dia 1 na tabela
+    ir_por_dia = np.asarray(tabela.aliquotas_ir)[np.searchsorted(tabela.limites_ir, prazos, side="left")]
+
+    isento = np.array([tipo in tabela.isentos for tipo in TIPOS_INVESTIMENTO])[:, None]
+    aliquota_iof = np.where(isento, 0.0, iof_por_dia)
+    aliquota_ir = np.where(isento, 0.0, ir_por_dia)
+    esquema = EsquemaTributos(
+        versao=tabela.versao,
+        aliquota_iof=aliquota_iof,
+        aliquota_ir=aliquota_ir,
+        fator_retido=(1 - aliquota_iof) * (1 - aliquota_ir),
+    )
+    for arr in (esquema.aliquota_iof, esquema.aliquota_ir, esquema.fator_retido):
+        arr.flags.writeable = False
+    return esquema
+
+
+compilar_esquema()  # tabela vigente compilada já na importação
+
+
+@dataclass(frozen=True)
+class ResultadoLote:
+    validos: np.ndarray           # False para valor <= 0 ou resgate <= aplicação (linhas em NaN)
+    prazo_dias: np.ndarray
+    montante_bruto: np.ndarray
+    rendimento_bruto: np.ndarray
+    iof: np.ndarray
+    aliquota_ir: np.ndarray
+    ir: np.ndarray
+    impostos_totais: np.ndarray
+    montante_liquido: np.ndarray
+    rendimento_liquido: np.ndarray
+
+    def __len__(self):
+        return len(self.prazo_dias)
+
+
+# Aceita códigos inteiros ou os nomes de TIPOS_INVESTIMENTO
+def codificar_tipos(tipos):
+    tipos = np.asarray(tipos)
+    if tipos.dtype.kind in "iu":
+        codigos = tipos.astype(np.int8)
+    else:
+        # Uma comparação vetorizada por tipo conhecido (bem mais rápido que np.unique em strings)
+        codigos = np.full(tipos.shape, -1, dtype=np.int8)
+        for tipo, codigo in CODIGOS_TIPO.items():
+            codigos[tipos == tipo] = codigo
+        if (codigos < 0).any():
+            desconhecido = tipos[codigos < 0].flat[0]
+            raise ValueError(f"Tipo de investimento desconhecido: {desconhecido}")
+    if codigos.size and (codigos.min() < 0 or codigos.max() >= len(TIPOS_INVESTIMENTO)):
+        raise ValueError("Código de tipo de investimento fora da faixa")
+    return codigos
+
+
+def _datas(valores):
+    return np.asarray(valores, dtype="datetime64[D]")
+
+
+# Índice acumulado de dias úteis do calendario, como array NumPy (montado uma vez)
+_indice_du = None
+_EPOCA_ORDINAL = 719163  # datetime.date(1970, 1, 1).toordinal()
+
+
+def _indice_dias_uteis():
+    global _indice_du
+    if _indice_du is None:
+        _indice_du = np.frombuffer(calendario.indice_dias_uteis(), dtype=np.int32)
+    return _indice_du
+
+
+# Dias úteis de inicio (inclusive) a fim (exclusive): dois lookups e uma subtração por linha
+def dias_uteis_lote(inicio, fim):
+    indice = _indice_dias_uteis()
+    deslocamento = calendario.ORDINAL_INICIAL - _EPOCA_ORDINAL
+    pos_inicio = _datas(inicio).astype(np.int64) - deslocamento
+    pos_fim = _datas(fim).astype(np.int64) - deslocamento
+    limite = len(indice) - 1
+    if ((pos_inicio < 0) | (pos_inicio > limite) | (pos_fim < 0) | (pos_fim > limite)).any():
+        raise ValueError(f"Data fora do calendário ({calendario.ANO_INICIAL}-{calendario.ANO_FINAL})")
+    return indice[pos_fim] - indice[pos_inicio]
+
+
+# Pós-fixado capitaliza por dias úteis (calendario); os demais por dias corridos,
+# sem consultar o calendário (não ficam limitados aos anos dele)
+def dias_capitalizacao_lote(pos, aplicacao, vencimento):
+    prazo_dias = np.array(vencimento - aplicacao).astype(np.int64)
+    if not np.any(pos):
+        return prazo_dias
+    prazo_dias[pos] = dias_uteis_lote(aplicacao[pos], vencimento[pos])
+    return prazo_dias
+
+
+def eh_pos_fixado_lote(codigos):
+    return np.isin(codigos, _CODIGOS_POS)
+
+
+# Trunca no centavo; o arredondamento em 6 casas antes do floor absorve o erro
+# de representação (ex.: 123.45 * 100 = 12344.999999999998)
+def truncar_centavos_lote(valores):
+    return np.floor(np.round(valores * 100, 6)) / 100
+
+
+# Meio para cima em CASAS_TAXA_DIARIA casas (np.round arredonda o meio para o par).
+# Devolve também as linhas a menos de 1e-6 do meio, onde o erro do float64 decide.
+def arredondar_taxa_lote(taxa_diaria):
+    escalada = taxa_diaria * 10.0 ** CASAS_TAXA_DIARIA
+    duvidosas = np.abs(escalada - np.floor(escalada) - 0.5) < 1e-6
+    return np.floor(escalada + 0.5) / 10.0 ** CASAS_TAXA_DIARIA, duvidosas
+
+
+# O float64 acumula ~1 ulp por dia na potência (1 + taxa) ** dias, e o fator
+# truncado em CASAS_FATOR casas fica abaixo da sua resolução. Linhas cujo
+# montante cai a essa distância de um centavo (ou com taxa duvidosa) são
+# recalculadas por motor_preciso.montante_decimal, igual ao simular_decimal.
+def _montantes_duvidosos(montante_bruto, dias, taxa_duvidosa):
+    centavos = montante_bruto * 100
+    margem = centavos * (dias + 16) * np.finfo(np.float64).eps + 1e-6
+    return taxa_duvidosa | (np.abs(centavos - np.round(centavos)) <= margem)
+
+
+def simular_lote(valor_investido, tipo_investimento, data_aplicacao, data_vencimento,
+                 taxa_anual=0.0, perc_cdi=0.0, taxa_cdi=TAXA_CDI_MERCADO, cdi_historico=False,
+                 versao_tributos=None, modo="rapido"):
+    if modo not in MODOS_NUMERICOS:
+        raise ValueError(f"Modo numérico desconhecido: {modo!r} (use {', '.join(MODOS_NUMERICOS)})")
+    preciso = modo == "preciso"
+    codigos = codificar_tipos(tipo_investimento)
+    valor, taxa_anual, perc_cdi, taxa_cdi, codigos, aplicacao, vencimento = np.broadcast_arrays(
+        np.asarray(valor_investido, dtype=np.float64),
+        np.asarray(taxa_anual, dtype=np.float64),
+        np.asarray(perc_cdi, dtype=np.float64),
+        np.asarray(taxa_cdi, dtype=np.float64),
+        codigos,
+        _datas(data_aplicacao),
+        _datas(data_vencimento),
+    )
+
+    prazo_dias = (vencimento - aplicacao).astype(np.int64)
+    validos = (valor > 0) & (prazo_dias > 0)
+    if preciso:
+        valor = truncar_centavos_lote(valor)
+
+    # Taxa efetiva e base de capitalização (252 no Pós-fixado, 360 nos demais)
+    pos = eh_pos_fixado_lote(codigos)
+    taxa = np.where(pos, taxa_cdi * (perc_cdi / 100), taxa_anual)
+    dias_ano = np.where(pos, 252.0, 360.0)
+
+    taxa_diaria = (1 + taxa / 100) ** (1 / dias_ano) - 1
+    if preciso:
+        taxa_diaria, taxa_duvidosa = arredondar_taxa_lote(taxa_diaria)
+    dias_capitalizacao = dias_capitalizacao_lote(pos, aplicacao, vencimento)
+    fator = np.asarray((1 + taxa_diaria) ** dias_capitalizacao)
+    historico = np.zeros(fator.shape, dtype=bool)
+    if cdi_historico and pos.any():
+        # CDI diário realizado (curva_cdi) nas linhas Pós-fixado válidas
+        from curva_cdi import carregar_curva
+        historico = pos & validos
+        fator[historico] = carregar_curva().fator_lote(
+            aplicacao[historico], vencimento[historico], perc_cdi[historico], taxa_cdi[historico])
+    montante_bruto = valor * fator
+    if preciso:
+        duvidosos = validos & _montantes_duvidosos(montante_bruto, np.maximum(prazo_dias, dias_capitalizacao), taxa_duvidosa)
+        montante_bruto = np.array(truncar_centavos_lote(montante_bruto))
+        for i in np.flatnonzero(duvidosos):
+            # Pós-fixado: taxa anual em Decimal (taxa_cdi * perc_cdi / 100), como no simular_decimal
+            if pos.flat[i]:
+                taxa_linha = decimal_de(taxa_cdi.flat[i]) * decimal_de(perc_cdi.flat[i]) / 100
+            else:
+                taxa_linha = taxa_anual.flat[i]
+            montante_bruto.flat[i] = montante_decimal(
+                valor.flat[i], taxa_linha, int(dias_ano.flat[i]), int(dias_capitalizacao.flat[i]),
+                fator=fator.flat[i] if historico.flat[i] else None)
+    rendimento_bruto = montante_bruto - valor
+
+    # Tributos por lookup na tabela compilada [tipo, prazo]
+    esquema = compilar_esquema(versao_tributos)
+    dias = esquema.indices(prazo_dias)
+    aliquota_iof = esquema.aliquota_iof[codigos, dias]
+    aliquota_ir = esquema.aliquota_ir[codigos, dias]
+    iof = rendimento_bruto * aliquota_iof
+    if preciso:
+        iof = truncar_centavos_lote(iof)
+    # IR sobre o rendimento após IOF
+    ir = (rendimento_bruto - iof) * aliquota_ir
+
+    if preciso:
+        # Somas e diferenças de valores já em centavos: round(2) só remove o ruído do float64
+        ir = truncar_centavos_lote(ir)
+        impostos_totais = np.round(ir + iof, 2)
+        montante_liquido = np.round(montante_bruto - impostos_totais, 2)
+        rendimento_bruto = np.round(rendimento_bruto, 2)
+    else:
+        impostos_totais = ir + iof
+        montante_liquido = valor + rendimento_bruto * esquema.fator_retido[codigos, dias]
+    rendimento_liquido = montante_liquido - valor
+    if preciso:
+        rendimento_liquido = np.round(rendimento_liquido, 2)
+
+    campos = dict(
+        montante_bruto=montante_bruto,
+        rendimento_bruto=rendimento_bruto,
+        iof=iof,
+        aliquota_ir=aliquota_ir,
+        ir=ir,
+        impostos_totais=impostos_totais,
+        montante_liquido=montante_liquido,
+        rendimento_liquido=rendimento_liquido,
+    )
+    if not validos.all():
+        campos = {nome: np.where(validos, arr, np.nan) for nome, arr in campos.items()}
+
+    return ResultadoLote(validos=validos, prazo_dias=prazo_dias, **campos)
@@ -0,0 +1,213 @@
+# ===================== MODO PRECISO (DECIMAL / CENTAVOS) =====================
+# Mesmo modelo de motor_calculo.simular, com os arredondamentos que a custódia
+# aplica em cada passo, para o extrato conciliar no centavo:
+#   taxa diária        arredondada em CASAS_TAXA_DIARIA casas (meio para cima)
+#   fator acumulado    truncado em CASAS_FATOR casas
+#   valores em R$      truncados no centavo (montante bruto, IOF e IR, nesta ordem);
+#                      o líquido é bruto - IOF - IR, sem novo arredondamento
+#
+# Modos numéricos (MODOS_NUMERICOS):
+#   "rapido"   float64 sem arredondamento intermediário (motor_calculo / motor_lote);
+#              serve para triagem e telas, pode divergir alguns centavos do extrato
+#   "preciso"  as regras acima: Decimal no cálculo escalar (simular_decimal) e
+#              centavos em float64 no lote (motor_lote.simular_lote(modo="preciso")),
+#              com as linhas próximas de um arredondamento refeitas em Decimal;
+#              os dois caminhos coincidem no centavo (tests/test_motor_preciso.py)
+#
+# benchmarks/bench_precisao.py mede a diferença entre os modos e a vazão de cada um.
+#
+# Variáveis de ambiente:
+#   CDB_MODO_NUMERICO   modo padrão de simular_modo (padrão: rapido)
+import logging
+import os
+from dataclasses import dataclass
+from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal, localcontext
+
+from motor_calculo import (
+    TABELA_TRIBUTOS, TAXA_POUPANCA_ANUAL, ResultadoSimulacao, calcular_prazo_meses,
+    eh_pos_fixado, obter_aliquota_ir, simular, validar_tipo,
+)
+
+MODOS_NUMERICOS = ("rapido", "preciso")
+
+
+log = logging.getLogger("calculadora_cdb.motor_preciso")
+
+
+# Valor desconhecido em CDB_MODO_NUMERICO cai no modo rápido, com aviso no log:
+# quem pediu o modo preciso precisa saber que os valores não são no centavo
+def _modo_padrao():
+    valor = os.environ.get("CDB_MODO_NUMERICO", "rapido")
+    modo = valor.strip().lower()
+    if modo in MODOS_NUMERICOS:
+        return modo
+    log.warning("CDB_MODO_NUMERICO=%r desconhecido (use %s); usando o modo rapido", valor, " ou ".join(MODOS_NUMERICOS))
+    return "rapido"
+
+
+MODO_PADRAO = _modo_padrao()
+
+CASAS_TAXA_DIARIA = 8
+CASAS_FATOR = 16
+
+CENTAVO = Decimal("0.01")
+_QUANTUM_TAXA = Decimal(1).scaleb(-CASAS_TAXA_DIARIA)
+_QUANTUM_FATOR = Decimal(1).scaleb(-CASAS_FATOR)
+_PRECISAO = 34  # dígitos do contexto Decimal (potências de até ~10 mil dias sem perda)
+_UM = Decimal(1)
+_CEM = Decimal(100)
+
+
+# float -> Decimal pelo repr (valor digitado, não a expansão binária: 0.1 -> 0.1)
+def decimal_de(valor):
+    return valor if isinstance(valor, Decimal) else Decimal(repr(float(valor)))
+
+
+def truncar_centavos(valor):
+    return valor.quantize(CENTAVO, rounding=ROUND_DOWN)
+
+
+def centavos(valor):
+    return int(truncar_centavos(decimal_de(valor)) * 100)
+
+
+def taxa_diaria_decimal(taxa_anual, dias_ano):
+    taxa = (_UM + decimal_de(taxa_anual) / _CEM) ** (_UM / Decimal(dias_ano)) - _UM
+    return taxa.quantize(_QUANTUM_TAXA, rounding=ROUND_HALF_UP)
+
+
+def fator_decimal(taxa_diaria, dias):
+    return ((_UM + taxa_diaria) ** dias).quantize(_QUANTUM_FATOR, rounding=ROUND_DOWN)
+
+
+# Montante bruto de uma posição: fator pela taxa anual (ou fator já dado, ex.:
+# CDI realizado, só truncado), valor * fator truncado no centavo. O motor_lote
+# recorre a ela nas linhas em que o float64 não decide o arredondamento.
+def montante_decimal(valor, taxa_anual, dias_ano, dias, fator=None):
+    with localcontext() as contexto:
+        contexto.prec = _PRECISAO
+        if fator is None:
+            fator = fator_decimal(taxa_diaria_decimal(taxa_anual, dias_ano), dias)
+        else:
+            fator = decimal_de(fator).quantize(_QUANTUM_FATOR, rounding=ROUND_DOWN)
+        return truncar_centavos(truncar_centavos(decimal_de(valor)) * fator)
+
+
+@dataclass(frozen=True)
+class ResultadoPreciso:
+    prazo_dias: int
+    dias_capitalizacao: int
+    taxa_diaria: Decimal
+    fator: Decimal
+    montante_bruto: Decimal
+    rendimento_bruto: Decimal
+    iof: Decimal
+    aliquota_ir: Decimal
+    ir: Decimal
+    impostos_totais: Decimal
+    montante_liquido: Decimal
+    rendimento_liquido: Decimal
+    montante_cdi: Decimal
+    montante_poupanca: Decimal
+
+
+# IOF e IR truncados no centavo; IR sobre o rendimento após IOF (como calcular_impostos)
+def impostos_decimal(prazo_dias, rendimento_bruto, tipo_investimento, tabela=TABELA_TRIBUTOS):
+    if tipo_investimento in tabela.isentos:
+        return Decimal(0), Decimal(0), Decimal(0)
+    iof = Decimal(0)
+    if prazo_dias <= len(tabela.iof_por_dia):
+        iof = truncar_centavos(rendimento_bruto * decimal_de(tabela.iof_por_dia[prazo_dias - 1]))
+    aliquota_ir = decimal_de(obter_aliquota_ir(prazo_dias, tabela))
+    ir = truncar_centavos((rendimento_bruto - iof) * aliquota_ir)
+    return ir, iof, aliquota_ir
+
+
+def simular_decimal(entrada):
+    validar_tipo(entrada.tipo_investimento)
+    if entrada.valor_investido <= 0:
+        raise ValueError("Valor investido deve ser maior que zero.")
+    prazo_dias = (entrada.data_vencimento - entrada.data_aplicacao).days
+    if prazo_dias <= 0:
+        raise ValueError("Data de resgate deve ser posterior")
+
+    with localcontext() as contexto:
+        contexto.prec = _PRECISAO
+        valor = truncar_centavos(decimal_de(entrada.valor_investido))
+        taxa_cdi = decimal_de(entrada.taxa_cdi)
+        if eh_pos_fixado(entrada.tipo_investimento):
+            taxa_anual = taxa_cdi * decimal_de(entrada.perc_cdi) / _CEM
+        else:
+            taxa_anual = decimal_de(entrada.taxa_anual)
+
+        taxa_diaria = taxa_diaria_decimal(taxa_anual, entrada.dias_ano)
+        dias_capitalizacao = entrada.dias_capitalizacao(entrada.data_vencimento)
+        if entrada.cdi_historico:
+            # Fator realizado vem da curva_cdi (float64), truncado como os demais
+            from curva_cdi import carregar_curva
+            curva = carregar_curva()
+            fator_cdi = decimal_de(curva.fator(entrada.data_aplicacao, entrada.data_vencimento, 100.0, entrada.taxa_cdi))
+            fator_cdi = fator_cdi.quantize(_QUANTUM_FATOR, rounding=ROUND_DOWN)
+            if eh_pos_fixado(entrada.tipo_investimento):
+                fator = decimal_de(curva.fator(entrada.data_aplicacao, entrada.data_vencimento,
+                                               entrada.perc_cdi, entrada.taxa_cdi))
+                fator = fator.quantize(_QUANTUM_FATOR, rounding=ROUND_DOWN)
+            else:
+                fator = fator_decimal(taxa_diaria, dias_capitalizacao)
+        else:
+            fator = fator_decimal(taxa_diaria, dias_capitalizacao)
+            fator_cdi = fator_decimal(taxa_diaria_decimal(taxa_cdi, 365), prazo_dias)
+
+        montante_bruto = truncar_centavos(valor * fator)
+        rendimento_bruto = montante_bruto - valor
+        ir, iof, aliquota_ir = impostos_decimal(prazo_dias, rendimento_bruto, entrada.tipo_investimento)
+        montante_liquido = montante_bruto - iof - ir
+        fator_poupanca = fator_decimal(taxa_diaria_decimal(decimal_de(TAXA_POUPANCA_ANUAL) * _CEM, 365), prazo_dias)
+
+        return ResultadoPreciso(
+            prazo_dias=prazo_dias,
+            dias_capitalizacao=dias_capitalizacao,
+            taxa_diaria=taxa_diaria,
+            fator=fator,
+            montante_bruto=montante_bruto,
+            rendimento_bruto=rendimento_bruto,
+            iof=iof,
+            aliquota_ir=aliquota_ir,
+            ir=ir,
+            impostos_totais=iof + ir,
+            montante_liquido=montante_liquido,
+            rendimento_liquido=montante_liquido - valor,
+            montante_cdi=truncar_centavos(valor * fator_cdi),
+            montante_poupanca=truncar_centavos(valor * fator_poupanca),
+        )
+
+
+# ResultadoSimulacao (floats) com os valores do modo preciso: gráfico, PDF e
+# exportações seguem iguais; cada valor em R$ é exato no centavo ao formatar
+def como_resultado(entrada, preciso):
+    return ResultadoSimulacao(
+        prazo_dias=preciso.prazo_dias,
+        prazo_meses=calcular_prazo_meses(entrada.data_aplicacao, entrada.data_vencimento),
+        dias_capitalizacao=preciso.dias_capitalizacao,
+        taxa_anual=entrada.taxa_efetiva,
+        taxa_diaria=float(preciso.taxa_diaria),
+        montante_bruto=float(preciso.montante_bruto),
+        rendimento_bruto=float(preciso.rendimento_bruto),
+        ir=float(preciso.ir),
+        iof=float(preciso.iof),
+        aliquota_ir=float(preciso.aliquota_ir),
+        impostos_totais=float(preciso.impostos_totais),
+        montante_liquido=float(preciso.montante_liquido),
+        rendimento_liquido=float(preciso.rendimento_liquido),
+        montante_cdi=float(preciso.montante_cdi),
+        montante_poupanca=float(preciso.montante_poupanca),
+    )
+
+
+def simular_modo(entrada, modo=None):
+    modo = modo or MODO_PADRAO
+    if modo == "rapido":
+        return simular(entrada)
+    if modo == "preciso":
+        return como_resultado(entrada, simular_decimal(entrada))
+    raise ValueError(f"Modo numérico desconhecido: {modo!r} (use {', '.join(MODOS_NUMERICOS)})")
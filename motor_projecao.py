@@ -0,0 +1,102 @@
+# ===================== PROJEÇÃO VETORIZADA (ATIVO x BENCHMARKS) =====================
+# Curvas do ativo, do CDI e da poupança em forma fechada, calculadas de uma vez
+# sobre um array de datas (diária, por dia útil ou mensal). Usa as mesmas
+# fórmulas de motor_calculo.simular: o último ponto é o montante_bruto.
+# projetar_rentabilidade (motor_calculo) continua sendo o caminho sem NumPy.
+from dataclasses import dataclass
+
+import numpy as np
+
+from motor_calculo import (
+    ProjecaoRentabilidade, calcular_taxa_diaria, eh_pos_fixado, taxas_benchmark_diarias,
+)
+from motor_lote import _datas, _indice_dias_uteis, dias_uteis_lote
+import calendario
+
+GRANULARIDADES = ("diaria", "util", "mensal")
+
+
+@dataclass(frozen=True)
+class CurvasProjecao:
+    datas: np.ndarray      # datetime64[D], da aplicação ao vencimento (inclusive)
+    bruto: np.ndarray
+    cdi: np.ndarray
+    poupanca: np.ndarray
+
+    def __len__(self):
+        return len(self.datas)
+
+    # Mesmo formato de motor_calculo.ProjecaoRentabilidade (gráfico e PDF)
+    def como_projecao(self):
+        return ProjecaoRentabilidade(
+            tuple(self.datas.tolist()), tuple(self.bruto.tolist()),
+            tuple(self.cdi.tolist()), tuple(self.poupanca.tolist()),
+        )
+
+
+# Aplicação + k meses, com o dia limitado ao fim do mês (como relativedelta)
+def _datas_mensais(inicio, fim):
+    meses = np.arange((fim.astype("datetime64[M]") - inicio.astype("datetime64[M]")).astype(np.int64) + 1)
+    mes = inicio.astype("datetime64[M]") + meses
+    primeiro_dia = mes.astype("datetime64[D]")
+    dias_no_mes = ((mes + 1).astype("datetime64[D]") - primeiro_dia).astype(np.int64)
+    dia = (inicio - inicio.astype("datetime64[M]").astype("datetime64[D]")).astype(np.int64)
+    datas = primeiro_dia + np.minimum(dia, dias_no_mes - 1)
+    return datas[datas <= fim]
+
+
+def _datas_uteis(inicio, fim):
+    datas = np.arange(inicio, fim + 1)
+    indice = _indice_dias_uteis()
+    posicao = datas.astype(np.int64) - (calendario.ORDINAL_INICIAL - 719163)
+    if posicao[0] < 0 or posicao[-1] + 1 >= len(indice):
+        raise ValueError(f"Data fora do calendário ({calendario.ANO_INICIAL}-{calendario.ANO_FINAL})")
+    util = indice[posicao + 1] - indice[posicao] == 1
+    util[0] = util[-1] = True  # aplicação e vencimento sempre presentes
+    return datas[util]
+
+
+def datas_projecao(data_aplicacao, data_vencimento, granularidade="mensal"):
+    inicio, fim = _datas(data_aplicacao), _datas(data_vencimento)
+    if granularidade == "diaria":
+        datas = np.arange(inicio, fim + 1)
+    elif granularidade == "util":
+        datas = _datas_uteis(inicio, fim)
+    elif granularidade == "mensal":
+        datas = _datas_mensais(inicio, fim)
+    else:
+        raise ValueError(f"Granularidade inválida: {granularidade!r} (use {', '.join(GRANULARIDADES)})")
+    if datas[-1] != fim:
+        datas = np.append(datas, fim)
+    return datas
+
+
+def projetar_curvas(entrada, granularidade="mensal"):
+    if entrada.valor_investido <= 0:
+        raise ValueError("Valor investido deve ser maior que zero.")
+    if (entrada.data_vencimento - entrada.data_aplicacao).days <= 0:
+        raise ValueError("Data de resgate deve ser posterior")
+
+    datas = datas_projecao(entrada.data_aplicacao, entrada.data_vencimento, granularidade)
+    inicio = _datas(entrada.data_aplicacao)
+    valor = entrada.valor_investido
+    dias = (datas - inicio).astype(np.int64)
+    pos = eh_pos_fixado(entrada.tipo_investimento)
+
+    taxa_diaria = calcular_taxa_diaria(entrada.taxa_efetiva, entrada.dias_ano)
+    taxa_cdi_diaria, taxa_poupanca_diaria = taxas_benchmark_diarias(entrada.taxa_cdi)
+
+    if entrada.cdi_historico:
+        from curva_cdi import carregar_curva
+        curva = carregar_curva()
+        cdi = valor * curva.fator_lote(inicio, datas, 100.0, entrada.taxa_cdi)
+        if pos:
+            bruto = valor * curva.fator_lote(inicio, datas, entrada.perc_cdi, entrada.taxa_cdi)
+    else:
+        cdi = valor * (1 + taxa_cdi_diaria) ** dias
+    if not (pos and entrada.cdi_historico):
+        dias_capitalizacao = dias_uteis_lote(inicio, datas) if pos else dias
+        bruto = valor * (1 + taxa_diaria) ** dias_capitalizacao
+
+    poupanca = valor * (1 + taxa_poupanca_diaria) ** dias
+    return CurvasProjecao(datas=datas, bruto=bruto, cdi=cdi, poupanca=poupanca)
@@ -0,0 +1,10 @@
+# ===================== NOMES DOS ARQUIVOS DE PROPOSTA =====================
+# Sem dependências: a página monta o nome do download a cada execução sem
+# importar proposta_pdf (reportlab), que só carrega quando um PDF é gerado.
+
+def arquivo_proposta(tipo_investimento, nome_cliente):
+    return f"Proposta_{tipo_investimento.replace(' ', '_')}_{nome_cliente.replace(' ', '_')}.pdf"
+
+
+def arquivo_carteira(nome_cliente):
+    return f"Proposta_Carteira_{nome_cliente.replace(' ', '_')}.pdf"
@@ -0,0 +1,698 @@
+# ===================== PROPOSTA EM PDF =====================
+# Geração da proposta premium. Não lê estado do Streamlit: tudo chega em um
+# DadosProposta, o que permite gerar propostas fora da página (ex.: lote_propostas).
+import copy
+import datetime
+import functools
+import os
+from dataclasses import dataclass
+from io import BytesIO
+from io import BytesIO as PIOBytesIO
+
+from reportlab.lib.pagesizes import A4
+# Garante que todos os componentes são importados
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, HRFlowable, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from reportlab.lib.units import mm
+from reportlab.graphics.shapes import Drawing
+
+from cache_logo import obter_logo
+import metricas
+from moeda import brl, brl_lote
+from motor_calculo import TAXA_POUPANCA_ANUAL, TIPOS_INVESTIMENTO, TIPOS_ISENTOS, eh_pos_fixado, projetar_rentabilidade, simular
+from nomes_arquivo import arquivo_carteira, arquivo_proposta
+import tema
+from tema import VERDE_DESTAQUE
+
+AZUL_TABELA_PDF = colors.HexColor(tema.AZUL_TABELA_PDF)
+
+
+@dataclass(frozen=True)
+class DadosProposta:
+    codigo_cliente: str
+    nome_cliente: str
+    nome_assessor: str
+    data_simulacao: datetime.date
+    entrada: object       # motor_calculo.EntradaSimulacao
+    resultado: object     # motor_calculo.ResultadoSimulacao
+    projecao: object      # motor_calculo.ProjecaoRentabilidade
+
+
+# Monta a proposta a partir da entrada, calculando resultado e projeção no motor
+def montar_proposta(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada):
+    resultado = simular(entrada)
+    projecao = projetar_rentabilidade(entrada, resultado)
+    return DadosProposta(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada, resultado, projecao)
+
+
+def nome_arquivo_proposta(proposta):
+    return arquivo_proposta(proposta.entrada.tipo_investimento, proposta.nome_cliente)
+
+
+# Proposta consolidada de uma carteira (carteira.ResultadoCarteira)
+@dataclass(frozen=True)
+class DadosPropostaCarteira:
+    codigo_cliente: str
+    nome_cliente: str
+    nome_assessor: str
+    data_simulacao: datetime.date
+    resultado: object     # carteira.ResultadoCarteira
+    projecao: object      # motor_calculo.ProjecaoRentabilidade (patrimônio consolidado)
+
+
+def montar_proposta_carteira(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, resultado, granularidade="mensal"):
+    from carteira import projetar_carteira
+    projecao = projetar_carteira(resultado, granularidade).como_projecao()
+    return DadosPropostaCarteira(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, resultado, projecao)
+
+
+def nome_arquivo_carteira(nome_cliente):
+    return arquivo_carteira(nome_cliente)
+
+
+# ===================== FUNÇÃO PARA LOGO COM PROPORÇÃO CORRETA =====================
+# Função refeita para ser mais robusta ao carregar a imagem, usando o objeto Image do ReportLab
+# O download fica no cache_logo: bytes e proporção vêm da memória/disco, sem rede a cada PDF
+def carregar_logo():
+    # Usando a URL do logo com fundo branco (padrão do tema claro)
+    logo = obter_logo()
+    largura_desejada = 200 
+    altura_calculada = largura_desejada * logo.proporcao
+    
+    # Retorna o objeto Image do ReportLab
+    return Image(PIOBytesIO(logo.dados), width=largura_desejada, height=altura_calculada)
+
+
+# ===================== GRÁFICO DA PROPOSTA =====================
+# "vetor": gráfico desenhado com reportlab.graphics (padrão, leve e nítido)
+# "png":   raster do matplotlib, com dpi configurável (CDB_GRAFICO_DPI)
+MODOS_GRAFICO = ("vetor", "png")
+MODO_GRAFICO_PADRAO = os.environ.get("CDB_GRAFICO_PDF", "vetor")
+DPI_GRAFICO_PADRAO = int(os.environ.get("CDB_GRAFICO_DPI", 150))
+
+
+def _renderizar_grafico(proposta, modo, dpi):
+    if modo == "vetor":
+        from grafico_vetorial import grafico_vetorial
+        desenho = grafico_vetorial(proposta.entrada, proposta.resultado, proposta.projecao, largura=180*mm, altura=90*mm)
+        desenho.hAlign = 'CENTER'
+        return desenho
+    if modo == "png":
+        from grafico import grafico_png
+        return grafico_png(proposta.entrada, proposta.resultado, proposta.projecao, dpi=dpi)
+    raise ValueError(f"Modo de gráfico inválido: {modo!r} (use {' ou '.join(MODOS_GRAFICO)})")
+
+
+# ===================== TEMPLATE (MONTADO UMA VEZ POR PROCESSO) =====================
+# Estilos, TableStyles e parágrafos constantes não dependem do cliente: são
+# criados na primeira proposta e reaproveitados. Os flowables estáticos são
+# entregues como cópias rasas (copy.copy), pois o ReportLab guarda o estado do
+# layout no próprio objeto durante o build.
+
+TITULO_PDF = "Simulação de Investimento - CDB / LCI / LCA"
+SUBTITULO_PDF = "Projeção personalizada considerando IR, IOF e Isenções"
+TITULO_PDF_CARTEIRA = "Simulação de Carteira - CDB / LCI / LCA"
+
+DISCLAIMER_TEXTO = (
+    "A Traders Distribuidora de Valores Mobiliários Ltda., com CNPJ sob o nº 62.280.490/0001-84 é uma instituição financeira autorizada a funcionar pelo Banco Central do Brasil, que atua como Participante de Negociação (PN) e realiza suas operações através de um Participante de Negociação Pleno (PNP), Terra Investimentos Ltda. Toda comunicação através da rede mundial de computadores está sujeita a interrupções ou atrasos, podendo impedir ou prejudicar o envio das ordens ou a recepção de informações atualizadas. Antes de tomar qualquer decisão de investimento, recomendamos que os investidores avaliem cuidadosamente seus objetivos financeiros e seu perfil de risco. A Traders DTVM exime-se de responsabilidade por danos sofridos por seus clientes, por força de falha de serviços disponibilizados por terceiros e não se responsabiliza por eventuais perdas financeiras decorrentes da negociação de ativos, nem garante a rentabilidade dos investimentos. O histórico de desempenho de qualquer ativo não assegura resultados futuros. A negociação em mercados financeiros está sujeita a volatilidade e pode envolver riscos significantes, incluindo, mas não se limitando ao risco de mercado, risco de liquidez e risco de crédito."
+)
+
+TOTAL_WIDTH = A4[0] - 30*mm
+
+
+# Textos da seção FUNDAMENTOS DO ATIVO para cada tipo de investimento
+def _textos_fundamentos(tipo_investimento):
+    if tipo_investimento in TIPOS_ISENTOS:
+        fundamentos_p1 = (
+            f"A <b>{tipo_investimento}</b> (Letra de Crédito {'Imobiliário' if tipo_investimento == 'LCI' else 'do Agronegócio'}) "
+            "é um título de renda fixa emitido por bancos para financiar os respectivos setores. É considerado um investimento de "
+            "baixo risco, conta com a garantia do <b>FGC</b> (Fundo Garantidor de Créditos) e, para Pessoa Física, é "
+            "<b>ISENTO de Imposto de Renda e IOF</b>, o que o torna altamente atrativo."
+        )
+        fundamentos_p2 = (
+            "As Letras de Crédito geralmente têm prazos de vencimento definidos e carência, não permitindo resgate diário. "
+            "A rentabilidade é tipicamente <b>Pré-fixada</b> ou <b>Pós-fixada</b> (atrelada ao CDI). A isenção de imposto faz com "
+            "que a rentabilidade bruta seja igual à líquida."
+        )
+    else:
+        fundamentos_p1 = (
+            "O <b>CDB</b> (Certificado de Depósito Bancário) é um título de renda fixa emitido por bancos para "
+            "captar recursos. É considerado um investimento de baixo risco e conta com a garantia do "
+            "<b>FGC</b> (Fundo Garantidor de Créditos), que cobre até R$ 250.000 por CPF e por instituição financeira, "
+            "oferecendo segurança ao investidor. A rentabilidade pode ser <b>Pré-fixada</b> (taxa definida no início) "
+            "ou <b>Pós-fixada</b> (geralmente atrelada a um percentual do CDI)."
+        )
+        fundamentos_p2 = (
+            "Em relação às características de resgate, a <b>Liquidez</b> do CDB pode ser diária (ideal para reserva de emergência) "
+            "ou apenas no vencimento (oferecendo historicamente maior retorno). A tributação segue a tabela regressiva do "
+            "<b>Imposto de Renda (IR)</b>, onde o imposto diminui quanto maior o prazo do investimento (chegando a 15% após 720 dias). "
+            "O <b>Imposto sobre Operações Financeiras (IOF)</b> é isento para resgates feitos após 30 dias."
+        )
+    return fundamentos_p1, fundamentos_p2
+
+
+def _criar_estilos():
+    # 2. Estilos Personalizados (Branco/Padrão para o PDF)
+    styles = getSampleStyleSheet()
+    
+    # Cores fixas para PDF (Tema Claro)
+    styles.add(ParagraphStyle(name='TitlePDF', fontSize=18, fontName='Helvetica-Bold', alignment=1, spaceAfter=7*mm, textColor=colors.HexColor('#000000')))
+    styles.add(ParagraphStyle(name='SubTitlePDF', fontSize=10, alignment=1, textColor=colors.HexColor('#666666'), spaceAfter=10*mm)) 
+    styles.add(ParagraphStyle(name='SectionTitle', fontSize=10, fontName='Helvetica-Bold', spaceAfter=5*mm, textColor=colors.HexColor('#333333'), alignment=0)) 
+    styles.add(ParagraphStyle(name='DataLabel', fontSize=9, fontName='Helvetica', textColor=colors.HexColor('#666666'), alignment=0))
+    styles.add(ParagraphStyle(name='DataValue', fontSize=11, fontName='Helvetica-Bold', textColor=colors.HexColor('#333333'), alignment=0))
+    styles.add(ParagraphStyle(name='Footer', fontSize=9, alignment=1, textColor=colors.HexColor('#666666')))
+    styles.add(ParagraphStyle(name='PrefValue', fontSize=12, fontName='Helvetica-Bold', textColor=colors.HexColor('#333333'), alignment=0, spaceBefore=3)) 
+    
+    styles.add(ParagraphStyle(name='ResumoStyle',
+        fontName='Helvetica',
+        fontSize=11, 
+        textColor=colors.black,
+        alignment=1, 
+        spaceBefore=5,
+        spaceAfter=5
+    ))
+    styles.add(ParagraphStyle(name='FundamentosStyle', 
+        fontName='Helvetica',
+        fontSize=9, 
+        textColor=colors.HexColor('#444444'),
+        alignment=4, 
+        spaceBefore=5,
+        spaceAfter=5
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='Disclaimer', 
+        fontSize=7, 
+        fontName='Helvetica-Oblique', 
+        alignment=4, 
+        textColor=colors.HexColor('#666666'), 
+        spaceBefore=3*mm, 
+        spaceAfter=0*mm
+    ))
+    
+    # ESTILO DO TÍTULO DE RESULTADO FINAL: Usando margens spaceBefore/spaceAfter para forçar altura vertical
+    styles.add(ParagraphStyle(
+        name='ResultTitleLarge', 
+        fontSize=13, 
+        fontName='Helvetica-Bold', 
+        alignment=1, 
+        textColor=colors.white, 
+        backColor=AZUL_TABELA_PDF, # Cor #864df4 mantida
+        leftPadding=15, 
+        rightPadding=15, 
+        topPadding=0, # REMOVIDO
+        bottomPadding=0, # REMOVIDO
+        spaceBefore=12, # AUMENTADO PARA FORÇAR MAIS ESPAÇO ACIMA DO TEXTO
+        spaceAfter=12, # AUMENTADO PARA FORÇAR MAIS ESPAÇO ABAIXO DO TEXTO
+    ))
+
+    styles.add(ParagraphStyle(name='GraphNote', fontSize=9, alignment=1, textColor=colors.HexColor('#666666'), spaceAfter=10*mm))
+    styles.add(ParagraphStyle(name='CompValue', alignment=1, fontName='Helvetica'))
+    return styles
+
+
+def _criar_estilos_tabelas():
+    return {
+        'dados': TableStyle([
+            ('GRID', (0,0), (-1,-1), 0.5, colors.lightgrey),
+            ('LEFTPADDING', (0,0), (-1,-1), 10),
+            ('RIGHTPADDING', (0,0), (-1,-1), 5),
+            ('TOPPADDING', (0,0), (-1,-1), 5),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 5),
+            ('VALIGN', (0,0), (-1,-1), 'TOP'),
+        ]),
+        'prefs': TableStyle([
+            ('GRID', (0,0), (1,1), 0.5, colors.lightgrey), 
+            ('GRID', (2,0), (3,1), 0.5, colors.lightgrey), 
+            ('GRID', (4,0), (5,1), 0.5, colors.lightgrey), 
+            ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+            ('VALIGN', (0,0), (-1,-1), 'TOP'),
+            ('LEFTPADDING', (0,0), (-1,-1), 5),
+            ('RIGHTPADDING', (0,0), (-1,-1), 2),
+            ('TOPPADDING', (0,0), (-1,-1), 5),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 5),
+            ('VALIGN', (0,0), (0,1), 'TOP'),
+            ('VALIGN', (2,0), (2,1), 'TOP'),
+            ('VALIGN', (4,0), (4,1), 'TOP'),
+        ]),
+        'resumo': TableStyle([
+            ('BACKGROUND', (0,0), (-1,-1), colors.white),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('INNERPADDING', (0,0), (-1,-1), 0), 
+            ('LEFTPADDING', (0,0), (-1,-1), 0),
+            ('RIGHTPADDING', (0,0), (-1,-1), 0),
+        ]),
+        'resultado': TableStyle([
+            # Título principal (RESULTADO FINAL)
+            ('SPAN', (0,0), (3,0)), 
+            ('BACKGROUND', (0,0), (3,0), AZUL_TABELA_PDF), # Cor #864df4 mantida
+            ('LINEBELOW', (0,0), (3,0), 1, colors.white), 
+            ('VALIGN', (0,0), (3,0), 'MIDDLE'), # Garante alinhamento vertical
+            
+            # Cabeçalho das 4 colunas (Fonte e Padding ajustados para caber)
+            ('BACKGROUND', (0,1), (3,1), AZUL_TABELA_PDF), 
+            ('TEXTCOLOR', (0,1), (3,1), colors.white),
+            ('FONTSIZE', (0,1), (3,1), 9), 
+            ('FONTNAME', (0,1), (3,1), 'Helvetica-Bold'),
+            ('TOPPADDING', (0,1), (3,1), 4),
+            ('BOTTOMPADDING', (0,1), (3,1), 4),
+            
+            # Valores das 4 colunas (Fonte e Padding ajustados)
+            ('BACKGROUND', (0,2), (3,2), AZUL_TABELA_PDF), 
+            ('TEXTCOLOR', (0,2), (3,2), colors.white),
+            ('FONTSIZE', (0,2), (3,2), 14), 
+            ('FONTNAME', (0,2), (3,2), 'Helvetica-Bold'),
+            ('TOPPADDING', (0,2), (3,2), 8),
+            ('BOTTOMPADDING', (0,2), (3,2), 8),
+            
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('GRID', (0,0), (-1,-1), 0, colors.transparent),
+        ]),
+        'posicoes': TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), AZUL_TABELA_PDF),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (-1,-1), 7.5),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('ALIGN', (5,1), (-1,-1), 'RIGHT'),
+            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.HexColor('#f5f5f5')]),
+            ('GRID', (0,0), (-1,-1), 0.25, colors.lightgrey),
+            ('TOPPADDING', (0,0), (-1,-1), 3),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 3),
+        ]),
+        'comparacao': TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#f0f0f0')), 
+            ('TEXTCOLOR', (0,0), (-1,0), colors.HexColor('#333333')),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('GRID', (0,0), (-1,-1), 0.5, colors.lightgrey),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('TOPPADDING', (0,0), (-1,-1), 8),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+            ('BACKGROUND', (0,1), (-1,1), colors.white), 
+        ]),
+    }
+
+
+class TemplateProposta:
+    def __init__(self):
+        self.styles = _criar_estilos()
+        self.tabelas = _criar_estilos_tabelas()
+
+        styles = self.styles
+        icone = lambda letra: Paragraph(f"<font face='ZapfDingbats' size='10' color='#1e3a8a'>{letra}</font>", styles['DataLabel'])
+        self._paragrafos = {
+            'titulo': Paragraph(TITULO_PDF, styles['TitlePDF']),
+            'subtitulo': Paragraph(SUBTITULO_PDF, styles['SubTitlePDF']),
+            'secao_dados': Paragraph("DADOS DA SIMULAÇÃO", styles['SectionTitle']),
+            'secao_prefs': Paragraph("PREFERÊNCIAS DO INVESTIMENTO", styles['SectionTitle']),
+            'secao_resumo': Paragraph("RESUMO DA OPERAÇÃO", styles['SectionTitle']),
+            'secao_projecao': Paragraph("PROJEÇÃO DA RENTABILIDADE BRUTA vs. BENCHMARKS", styles['SectionTitle']),
+            'secao_comparacao': Paragraph("COMPARATIVO DE RESULTADOS BRUTOS (No Vencimento)", styles['SectionTitle']),
+            'secao_disclaimer': Paragraph("DISCLAIMER", styles['SectionTitle']),
+            'disclaimer': Paragraph(DISCLAIMER_TEXTO, styles['Disclaimer']),
+            'titulo_resultado': Paragraph("<b>RESULTADO FINAL</b>", styles['ResultTitleLarge']),
+            'titulo_carteira': Paragraph(TITULO_PDF_CARTEIRA, styles['TitlePDF']),
+            'secao_posicoes': Paragraph("POSIÇÕES DA CARTEIRA", styles['SectionTitle']),
+            'secao_projecao_carteira': Paragraph("PROJEÇÃO DO PATRIMÔNIO CONSOLIDADO vs. BENCHMARKS", styles['SectionTitle']),
+            'icone_data': icone('d'),
+            'icone_consideracoes': icone('I'),
+        }
+        for rotulo in ("Código do Cliente", "Ativo Simulado", "Nome do cliente", "Data da simulação", "Valor investido",
+                       "Taxa de Retorno", "IR Aplicado", "Benchmark CDI", "Data da Aplicação", "Data do Vencimento",
+                       "Considerações", "Posições"):
+            self._paragrafos[rotulo] = Paragraph(rotulo, styles['DataLabel'])
+
+        # Seção FUNDAMENTOS DO ATIVO pronta para cada tipo: (título, parágrafo 1, parágrafo 2)
+        self._fundamentos = {}
+        for tipo in TIPOS_INVESTIMENTO:
+            p1, p2 = _textos_fundamentos(tipo)
+            self._fundamentos[tipo] = (
+                Paragraph(f"FUNDAMENTOS DO ATIVO ({tipo})", styles['SectionTitle']),
+                Paragraph(p1, styles['FundamentosStyle']),
+                Paragraph(p2, styles['FundamentosStyle']),
+            )
+
+    def p(self, nome):
+        return copy.copy(self._paragrafos[nome])
+
+    def fundamentos(self, tipo_investimento):
+        if tipo_investimento not in self._fundamentos:
+            p1, p2 = _textos_fundamentos(tipo_investimento)
+            self._fundamentos[tipo_investimento] = (
+                Paragraph(f"FUNDAMENTOS DO ATIVO ({tipo_investimento})", self.styles['SectionTitle']),
+                Paragraph(p1, self.styles['FundamentosStyle']),
+                Paragraph(p2, self.styles['FundamentosStyle']),
+            )
+        return [copy.copy(p) for p in self._fundamentos[tipo_investimento]]
+
+
+@functools.lru_cache(maxsize=1)
+def obter_template():
+    return TemplateProposta()
+
+
+# Descarta o template (usado pelo benchmark para medir o custo sem cache)
+def limpar_template():
+    obter_template.cache_clear()
+
+
+def _linha_horizontal(spaceBefore):
+    return HRFlowable(width="100%", thickness=0.5, lineCap='round', color=colors.lightgrey, spaceBefore=spaceBefore, spaceAfter=10)
+
+
+# ===================== PDF GERAÇÃO (Tema Claro com 4 Colunas no Resultado Final) =====================
+# grafico: gráfico já renderizado (PNG em BytesIO ou Drawing); se ausente, é
+# gerado aqui no modo_grafico escolhido ("vetor" ou "png", ver MODOS_GRAFICO)
+def criar_pdf_perfeito(proposta, grafico=None, modo_grafico=None, dpi=None):
+    # 0. Dados da proposta
+    entrada, resultado, projecao = proposta.entrada, proposta.resultado, proposta.projecao
+    tipo_investimento = entrada.tipo_investimento
+    valor_investido = entrada.valor_investido
+    data_simulacao = proposta.data_simulacao
+
+    if grafico is None:
+        with metricas.etapa("pdf.grafico"):
+            grafico = _renderizar_grafico(proposta, modo_grafico or MODO_GRAFICO_PADRAO, dpi or DPI_GRAFICO_PADRAO)
+
+    template = obter_template()
+    styles, tabelas, p = template.styles, template.tabelas, template.p
+
+    # 1. Configuração do Documento
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=15*mm, bottomMargin=15*mm, leftMargin=15*mm, rightMargin=15*mm)
+    story = []
+
+    
+    # 3. Logo (Sempre usando o logo BG-WHITE no PDF)
+    # Chamando a função para carregar o logo de forma robusta
+    with metricas.etapa("pdf.logo"):
+        logo = carregar_logo()
+    logo.hAlign = 'CENTER'
+    story.append(logo)
+    story.append(Spacer(1, 10*mm)) 
+    
+    # 4. Título Principal
+    story.append(p('titulo'))
+    story.append(p('subtitulo'))
+    
+    story.append(_linha_horizontal(5))
+
+    # 5. DADOS DA SIMULAÇÃO (ATUALIZADO)
+    story.append(p('secao_dados'))
+    
+    # Determina o rótulo da taxa e IR para o PDF
+    if eh_pos_fixado(tipo_investimento):
+        taxa_retorno_pdf = f"{entrada.perc_cdi:.2f}% do CDI"
+    else:
+        taxa_retorno_pdf = f"{resultado.taxa_anual:.2f}% a.a."
+        
+    aliquota_ir_display = f"{resultado.aliquota_ir * 100:.1f}%" if resultado.aliquota_ir > 0 else "ISENTO"
+    
+    data_formatada = [
+        # NOVO: Código do Cliente e Ativo Simulado
+        [p("Código do Cliente"), 
+         Paragraph(proposta.codigo_cliente, styles['DataValue']), 
+         p("Ativo Simulado"), 
+         Paragraph(tipo_investimento, styles['DataValue'])],
+         
+        [p("Nome do cliente"), 
+         Paragraph(proposta.nome_cliente, styles['DataValue']), 
+         p("Data da simulação"), 
+         Paragraph(data_simulacao.strftime('%d/%m/%Y'), styles['DataValue'])],
+        
+        [p("Valor investido"), 
+         Paragraph(brl(valor_investido), styles['DataValue']), 
+         p("Taxa de Retorno"), 
+         Paragraph(taxa_retorno_pdf, styles['DataValue'])],
+         
+        [p("IR Aplicado"), # NOVO
+         Paragraph(aliquota_ir_display, styles['DataValue']), 
+         p("Benchmark CDI"), 
+         Paragraph(f"{entrada.taxa_cdi:.2f}% a.a.", styles['DataValue'])]
+    ]
+    
+    total_width = TOTAL_WIDTH
+    colWidths = [total_width * 0.22, total_width * 0.28, total_width * 0.22, total_width * 0.28] 
+    t_dados = Table(data_formatada, colWidths=colWidths)
+    t_dados.hAlign = 'LEFT' 
+    t_dados.setStyle(tabelas['dados'])
+    story.append(t_dados)
+    
+    story.append(Spacer(1, 5*mm)) 
+
+    story.append(_linha_horizontal(5))
+    
+    # 6. PREFERÊNCIAS DO INVESTIMENTO (ATUALIZADO)
+    story.append(p('secao_prefs'))
+    
+    # ATUALIZADO: Considerações
+    consideracoes_texto = "Isento de IR/IOF" if tipo_investimento in TIPOS_ISENTOS else "IR, IOF"
+    
+    prefs_data = [
+        [p('icone_data'), p("Data da Aplicação"), 
+         p('icone_data'), p("Data do Vencimento"), 
+         p('icone_consideracoes'), p("Considerações")],
+        
+        [Spacer(1,1), Paragraph(entrada.data_aplicacao.strftime('%d/%m/%Y'), styles['PrefValue']), 
+         Spacer(1,1), Paragraph(entrada.data_vencimento.strftime('%d/%m/%Y'), styles['PrefValue']), 
+         Spacer(1,1), Paragraph(consideracoes_texto, styles['PrefValue'])]
+    ]
+    
+    largura_pref = total_width / 3
+    colWidths_prefs = [8*mm, largura_pref - 8*mm, 8*mm, largura_pref - 8*mm, 8*mm, largura_pref - 8*mm]
+    
+    t_prefs = Table(prefs_data, colWidths=colWidths_prefs)
+    t_prefs.hAlign = 'LEFT'
+    t_prefs.setStyle(tabelas['prefs'])
+    story.append(t_prefs)
+    
+    story.append(_linha_horizontal(10)) 
+
+    # 7. RESUMO DA OPERAÇÃO
+    story.append(p('secao_resumo')) 
+    
+    valor_liquido_formatado = f"<b><font color='{VERDE_DESTAQUE}'>{brl(resultado.montante_liquido)}</font></b>" 
+    
+    resumo_texto = f"Com um investimento inicial de {brl(valor_investido)} em um ativo de {tipo_investimento} com taxa de {taxa_retorno_pdf} por um período de {resultado.prazo_meses} meses, o valor líquido será de {valor_liquido_formatado}."
+
+    resumo_paragrafo = Paragraph(resumo_texto, styles['ResumoStyle'])
+
+    t_resumo = Table([[resumo_paragrafo]], colWidths=[total_width])
+    t_resumo.hAlign = 'CENTER'
+    t_resumo.setStyle(tabelas['resumo'])
+    story.append(t_resumo)
+    
+    story.append(Spacer(1, 5*mm)) 
+
+    # 8. RESULTADO FINAL (4 Colunas com Ajustes de Fonte/Espaçamento)
+    resultado_completo = [
+        # Linha 1: Título principal. Usa o spaceBefore/spaceAfter do estilo.
+        [p('titulo_resultado'), 
+         "", 
+         "",
+         ""],
+        
+        # Linha 2: Cabeçalho das 4 colunas
+        ["VALOR INVESTIDO", "VALOR BRUTO", "IMPOSTOS", "VALOR LÍQUIDO"], 
+        
+        # Linha 3: Valores das 4 colunas
+        [brl(valor_investido), 
+         brl(resultado.montante_bruto), 
+         brl(resultado.impostos_totais), 
+         brl(resultado.montante_liquido)],
+    ]
+    
+    colWidths_4 = [total_width/4] * 4
+    t_res_final = Table(resultado_completo, colWidths=colWidths_4)
+    t_res_final.hAlign = 'CENTER'
+    t_res_final.setStyle(tabelas['resultado'])
+    story.append(t_res_final)
+    
+    story.append(_linha_horizontal(10)) 
+
+    # 9. FUNDAMENTOS DO ATIVO (ATUALIZADO)
+    titulo_fundamentos, fundamentos_p1, fundamentos_p2 = template.fundamentos(tipo_investimento)
+    story.append(titulo_fundamentos) 
+    story.append(fundamentos_p1)
+    story.append(Spacer(1, 3*mm)) 
+    story.append(fundamentos_p2)
+    
+    story.append(Spacer(1, 5*mm)) 
+    
+    story.append(PageBreak()) 
+    
+    # 10. PROJEÇÃO DA RENTABILIDADE (Gráfico com Benchmarks) - Página 2
+    story.append(p('secao_projecao'))
+    
+    if isinstance(grafico, Drawing):
+        story.append(grafico)
+    else:
+        img = Image(grafico, width=180*mm, height=90*mm)
+        img.hAlign = 'CENTER'
+        story.append(img)
+    
+    nota_benchmarks = (
+        f"Benchmarks: CDI ({entrada.taxa_cdi:.2f}% a.a.) e Poupança (Proxy {TAXA_POUPANCA_ANUAL * 100:.2f}% a.a.). " 
+        "Projeção baseada em taxas atuais, podendo variar conforme mercado. Rentabilidades dos benchmarks são brutas (sem IR)."
+    )
+    
+    story.append(Paragraph(nota_benchmarks, styles['GraphNote'])) 
+
+    # 11. BLOCO: COMPARAÇÃO DE RESULTADOS BRUTOS
+    story.append(p('secao_comparacao')) 
+
+    valor_bruto_ativo = resultado.montante_bruto
+    valor_bruto_cdi = projecao.cdi[-1] 
+    valor_bruto_poupanca = projecao.poupanca[-1]
+
+    valores_comparacao = [valor_bruto_ativo, valor_bruto_cdi, valor_bruto_poupanca]
+    max_valor = max(valores_comparacao)
+    
+    def formatar_valor_comparacao(valor):
+        cor = VERDE_DESTAQUE if valor == max_valor else '#333333'
+        return Paragraph(f"<b><font size='12' color='{cor}'>{brl(valor)}</font></b>", styles['CompValue'])
+
+    dados_comparacao = [
+        [f"{tipo_investimento} (Simulado)", "CDI (Benchmark)", "Poupança (Benchmark)"],
+        [formatar_valor_comparacao(valor_bruto_ativo), 
+         formatar_valor_comparacao(valor_bruto_cdi),
+         formatar_valor_comparacao(valor_bruto_poupanca)]
+    ]
+    
+    colWidths_comp = [total_width/3] * 3
+    t_comparacao = Table(dados_comparacao, colWidths=colWidths_comp)
+    t_comparacao.hAlign = 'CENTER'
+    t_comparacao.setStyle(tabelas['comparacao'])
+    story.append(t_comparacao)
+    
+    story.append(Spacer(1, 10*mm)) 
+    
+    # 12. Rodapé personalizado (Assessor)
+    story.append(Paragraph(f"Simulação elaborada por <b>{proposta.nome_assessor}</b> em {data_simulacao.strftime('%d/%m/%Y')}", styles['Footer']))
+
+    # 13. Disclaimer Legal com Título
+    story.append(Spacer(1, 5*mm)) 
+    story.append(p('secao_disclaimer')) 
+    story.append(p('disclaimer'))
+
+    with metricas.etapa("pdf.build"):
+        doc.build(story)
+    pdf = buffer.getvalue()
+    metricas.observar("pdf.bytes", len(pdf))
+    return pdf
+
+
+# ===================== PDF DA CARTEIRA (CONSOLIDADO) =====================
+# Mesmo template da proposta individual: totais da carteira, tabela com uma
+# linha por posição (quebra de página automática, cabeçalho repetido) e o
+# gráfico vetorial do patrimônio consolidado x benchmarks.
+def criar_pdf_carteira(proposta):
+    resultado, projecao = proposta.resultado, proposta.projecao
+    carteira, posicoes = resultado.carteira, resultado.posicoes
+    data_simulacao = proposta.data_simulacao
+
+    with metricas.etapa("pdf.grafico"):
+        from grafico_vetorial import grafico_vetorial_carteira
+        grafico = grafico_vetorial_carteira(projecao, largura=180*mm, altura=90*mm)
+        grafico.hAlign = 'CENTER'
+
+    template = obter_template()
+    styles, tabelas, p = template.styles, template.tabelas, template.p
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=15*mm, bottomMargin=15*mm, leftMargin=15*mm, rightMargin=15*mm)
+    story = []
+
+
+    with metricas.etapa("pdf.logo"):
+        logo = carregar_logo()
+    logo.hAlign = 'CENTER'
+    story.append(logo)
+    story.append(Spacer(1, 10*mm))
+    story.append(p('titulo_carteira'))
+    story.append(p('subtitulo'))
+    story.append(_linha_horizontal(5))
+
+    # Dados da simulação
+    story.append(p('secao_dados'))
+    dados = [
+        [p("Código do Cliente"), Paragraph(proposta.codigo_cliente, styles['DataValue']),
+         p("Posições"), Paragraph(str(len(carteira)), styles['DataValue'])],
+        [p("Nome do cliente"), Paragraph(proposta.nome_cliente, styles['DataValue']),
+         p("Data da simulação"), Paragraph(data_simulacao.strftime('%d/%m/%Y'), styles['DataValue'])],
+        [p("Data da Aplicação"), Paragraph(resultado.data_aplicacao.strftime('%d/%m/%Y'), styles['DataValue']),
+         p("Data do Vencimento"), Paragraph(resultado.data_vencimento.strftime('%d/%m/%Y'), styles['DataValue'])],
+    ]
+    t_dados = Table(dados, colWidths=[TOTAL_WIDTH * 0.22, TOTAL_WIDTH * 0.28, TOTAL_WIDTH * 0.22, TOTAL_WIDTH * 0.28])
+    t_dados.hAlign = 'LEFT'
+    t_dados.setStyle(tabelas['dados'])
+    story.append(t_dados)
+    story.append(Spacer(1, 5*mm))
+
+    # Resultado consolidado
+    resultado_completo = [
+        [p('titulo_resultado'), "", "", ""],
+        ["VALOR INVESTIDO", "VALOR BRUTO", "IMPOSTOS", "VALOR LÍQUIDO"],
+        [brl(resultado.valor_investido), brl(resultado.montante_bruto),
+         brl(resultado.impostos_totais), brl(resultado.montante_liquido)],
+    ]
+    t_res_final = Table(resultado_completo, colWidths=[TOTAL_WIDTH / 4] * 4)
+    t_res_final.hAlign = 'CENTER'
+    t_res_final.setStyle(tabelas['resultado'])
+    story.append(t_res_final)
+    story.append(_linha_horizontal(10))
+
+    # Uma linha por posição, na ordem de vencimento
+    story.append(p('secao_posicoes'))
+    linhas = [["Código", "Ativo", "Aplicação", "Vencimento", "Taxa", "Investido", "Líquido"]]
+    pos_fixado = [eh_pos_fixado(t) for t in carteira.tipos.tolist()]
+    investido, liquido = brl_lote(carteira.valor_investido), brl_lote(posicoes.montante_liquido)
+    for i in sorted(range(len(carteira)), key=lambda i: carteira.data_vencimento[i]):
+        taxa = f"{carteira.perc_cdi[i]:.2f}% CDI" if pos_fixado[i] else f"{carteira.taxa_anual[i]:.2f}% a.a."
+        linhas.append([
+            carteira.codigos[i], carteira.tipos[i].replace(" (% do CDI)", ""),
+            carteira.data_aplicacao[i].item().strftime('%d/%m/%Y'), carteira.data_vencimento[i].item().strftime('%d/%m/%Y'),
+            taxa, investido[i], liquido[i],
+        ])
+    larguras = [0.12, 0.18, 0.12, 0.12, 0.14, 0.16, 0.16]
+    t_posicoes = Table(linhas, colWidths=[TOTAL_WIDTH * l for l in larguras], repeatRows=1)
+    t_posicoes.setStyle(tabelas['posicoes'])
+    story.append(t_posicoes)
+
+    story.append(PageBreak())
+
+    # Projeção consolidada
+    story.append(p('secao_projecao_carteira'))
+    story.append(grafico)
+    taxas_cdi = sorted(set(carteira.taxa_cdi.tolist()))
+    nota = (
+        f"Benchmarks: CDI ({', '.join(f'{t:.2f}' for t in taxas_cdi)}% a.a.) e Poupança (Proxy {TAXA_POUPANCA_ANUAL * 100:.2f}% a.a.), "
+        "com os mesmos aportes nas mesmas datas. Posições abertas pelo valor bruto; após o vencimento, pelo valor líquido "
+        "resgatado (sem reaplicação). Rentabilidades dos benchmarks são brutas (sem IR)."
+    )
+    story.append(Paragraph(nota, styles['GraphNote']))
+
+    dados_comparacao = [
+        ["Carteira (Simulada)", "CDI (Benchmark)", "Poupança (Benchmark)"],
+        [Paragraph(f"<b><font size='12'>{brl(v)}</font></b>", styles['CompValue'])
+         for v in (projecao.bruto[-1], projecao.cdi[-1], projecao.poupanca[-1])],
+    ]
+    t_comparacao = Table(dados_comparacao, colWidths=[TOTAL_WIDTH / 3] * 3)
+    t_comparacao.hAlign = 'CENTER'
+    t_comparacao.setStyle(tabelas['comparacao'])
+    story.append(t_comparacao)
+    story.append(Spacer(1, 10*mm))
+
+    story.append(Paragraph(f"Simulação elaborada por <b>{proposta.nome_assessor}</b> em {data_simulacao.strftime('%d/%m/%Y')}", styles['Footer']))
+    story.append(Spacer(1, 5*mm))
+    story.append(p('secao_disclaimer'))
+    story.append(p('disclaimer'))
+
+    with metricas.etapa("pdf.build"):
+        doc.build(story)
+    pdf = buffer.getvalue()
+    metricas.observar("pdf.bytes", len(pdf))
+    return pdf
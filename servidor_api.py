@@ -0,0 +1,272 @@
+# ===================== SERVIÇO HTTP JSON (ASGI) =====================
+# Expõe o motor de cálculo para portais e CRM, sem Streamlit:
+#   POST /simulate        uma simulação (motor_calculo.simular)      -> JSON
+#   POST /simulate/batch  lista de posições (motor_lote.simular_lote) -> JSON
+#   POST /proposal.pdf    proposta premium (proposta_pdf)            -> PDF
+#   GET  /health
+#   GET  /metrics         métricas do processo no formato do Prometheus (CDB_METRICAS=1)
+#
+# O PDF é renderizado em um ProcessPoolExecutor (mesmo worker do
+# lote_propostas), então o event loop nunca fica bloqueado. Requisições
+# idênticas em andamento são agrupadas: só a primeira executa, as demais
+# aguardam o mesmo resultado.
+#
+# App ASGI puro (sem framework). Uso:
+#   uvicorn servidor_api:app --port 8000
+#
+# Variáveis de ambiente:
+#   CDB_API_WORKERS     processos para renderizar PDFs (padrão: número de CPUs)
+import asyncio
+import datetime
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+
+import metricas
+from motor_calculo import data_de_json, entrada_de_json as _entrada_de_json, simular
+
+TAMANHO_MAXIMO_CORPO = 10 * 1024 * 1024
+
+
+class ErroRequisicao(Exception):
+    def __init__(self, mensagem, status=400):
+        super().__init__(mensagem)
+        self.status = status
+
+
+# ===================== CONVERSÃO DA ENTRADA =====================
+
+# Mesmo parser da CLI (motor_calculo); erro de conteúdo vira 400
+def _data(dados, campo):
+    try:
+        return data_de_json(dados, campo)
+    except ValueError as e:
+        raise ErroRequisicao(str(e)) from None
+
+
+# cdi_historico sem a curva importada é erro da requisição (422), não do servidor
+def entrada_de_json(dados):
+    from curva_cdi import caminho_curva, curva_disponivel
+
+    try:
+        entrada = _entrada_de_json(dados)
+    except ValueError as e:
+        raise ErroRequisicao(str(e)) from None
+    if entrada.cdi_historico and not curva_disponivel():
+        raise ErroRequisicao(f"cdi_historico requer a curva do CDI importada (curva_cdi.py); não encontrada em {caminho_curva()}",
+                             status=422)
+    return entrada
+
+
+# ===================== HANDLERS =====================
+
+def _simular(dados):
+    try:
+        return asdict(simular(entrada_de_json(dados)))
+    except ValueError as e:
+        raise ErroRequisicao(str(e)) from None
+
+
+def _simular_lote(dados):
+    import numpy as np
+    from motor_lote import simular_lote
+
+    posicoes = dados.get("posicoes") if isinstance(dados, dict) else None
+    if not isinstance(posicoes, list):
+        raise ErroRequisicao("Esperado {\"posicoes\": [...]}")
+    entradas = [entrada_de_json(p) for p in posicoes]
+    # cdi_historico vale por posição: o lote é simulado em um grupo por valor do campo
+    campos = {}
+    historico = np.array([e.cdi_historico for e in entradas], dtype=bool)
+    for flag in np.unique(historico) if entradas else (False,):
+        indices = np.flatnonzero(historico == flag)
+        grupo = [entradas[i] for i in indices]
+        try:
+            resultado = simular_lote(
+                [e.valor_investido for e in grupo],
+                [e.tipo_investimento for e in grupo],
+                [e.data_aplicacao for e in grupo],
+                [e.data_vencimento for e in grupo],
+                taxa_anual=[e.taxa_anual for e in grupo],
+                perc_cdi=[e.perc_cdi for e in grupo],
+                taxa_cdi=[e.taxa_cdi for e in grupo],
+                cdi_historico=bool(flag),
+            )
+        except ValueError as e:
+            raise ErroRequisicao(str(e)) from None
+        for nome, valores in asdict(resultado).items():
+            if nome not in campos:
+                campos[nome] = np.empty(len(entradas), dtype=valores.dtype)
+            campos[nome][indices] = valores
+    # NaN (linhas inválidas) vira null no JSON
+    return {
+        nome: [None if isinstance(v, float) and v != v else v for v in valores.tolist()]
+        for nome, valores in campos.items()
+    }
+
+
+# Valida tudo o que o worker vai usar (inclusive a simulação) antes de ocupar o pool:
+# erros de entrada voltam como 400, não como falha do worker
+def _dados_proposta(dados):
+    entrada = entrada_de_json(dados)
+    try:
+        simular(entrada)
+    except ValueError as e:
+        raise ErroRequisicao(str(e)) from None
+    data_simulacao = _data(dados, "data_simulacao") if dados.get("data_simulacao") else datetime.date.today()
+    return (str(dados.get("codigo_cliente", "")), str(dados.get("nome_cliente", "")),
+            str(dados.get("nome_assessor", "")), data_simulacao, entrada)
+
+
+def _renderizar_proposta(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada):
+    from proposta_pdf import criar_pdf_perfeito, montar_proposta, nome_arquivo_proposta
+
+    proposta = montar_proposta(codigo_cliente, nome_cliente, nome_assessor, data_simulacao, entrada)
+    return criar_pdf_perfeito(proposta), nome_arquivo_proposta(proposta)
+
+
+# ===================== POOL DE PDF E COALESCÊNCIA =====================
+
+_pool = None
+_em_andamento = {}  # chave -> asyncio.Future
+
+
+def _obter_pool():
+    global _pool
+    if _pool is None:
+        from lote_propostas import _inicializar_worker
+        workers = int(os.environ.get("CDB_API_WORKERS", 0)) or os.cpu_count() or 1
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker)
+    return _pool
+
+
+def _encerrar_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# Executa corotina_fabrica() uma vez por chave; chamadas concorrentes com a mesma chave aguardam o mesmo futuro
+async def _coalescer(chave, corotina_fabrica):
+    futuro = _em_andamento.get(chave)
+    if futuro is not None:
+        metricas.contar("api.coalescidas")
+        return await asyncio.shield(futuro)
+
+    futuro = asyncio.get_running_loop().create_future()
+    _em_andamento[chave] = futuro
+    try:
+        resultado = await corotina_fabrica()
+    except asyncio.CancelledError:
+        futuro.cancel()
+        raise
+    except Exception as e:
+        futuro.set_exception(e)
+        futuro.exception()  # evita o aviso de exceção não recuperada quando não há outros aguardando
+        raise
+    else:
+        futuro.set_result(resultado)
+        return resultado
+    finally:
+        del _em_andamento[chave]
+
+
+async def _rota_simular(dados):
+    return 200, _json(_simular(dados)), "application/json", {}
+
+
+async def _rota_lote(dados):
+    loop = asyncio.get_running_loop()
+    resultado = await loop.run_in_executor(None, _simular_lote, dados)
+    return 200, _json(resultado), "application/json", {}
+
+
+async def _rota_proposta(dados):
+    argumentos = _dados_proposta(dados)
+    loop = asyncio.get_running_loop()
+    pdf, nome_arq = await loop.run_in_executor(_obter_pool(), _renderizar_proposta, *argumentos)
+    return 200, pdf, "application/pdf", {"content-disposition": f'attachment; filename="{nome_arq}"'}
+
+
+ROTAS = {
+    ("POST", "/simulate"): _rota_simular,
+    ("POST", "/simulate/batch"): _rota_lote,
+    ("POST", "/proposal.pdf"): _rota_proposta,
+}
+
+
+# ===================== ASGI =====================
+
+def _json(dados):
+    return json.dumps(dados, ensure_ascii=False).encode("utf-8")
+
+
+async def _ler_corpo(receive):
+    partes, tamanho = [], 0
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "http.disconnect":
+            raise ErroRequisicao("Conexão encerrada pelo cliente", status=499)
+        corpo = mensagem.get("body", b"")
+        tamanho += len(corpo)
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroRequisicao("Corpo da requisição muito grande", status=413)
+        partes.append(corpo)
+        if not mensagem.get("more_body", False):
+            return b"".join(partes)
+
+
+async def _responder(send, status, corpo, tipo, cabecalhos=None):
+    headers = [(b"content-type", tipo.encode()), (b"content-length", str(len(corpo)).encode())]
+    headers += [(nome.encode(), valor.encode("latin-1", "replace")) for nome, valor in (cabecalhos or {}).items()]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": corpo})
+
+
+async def _lifespan(receive, send):
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif mensagem["type"] == "lifespan.shutdown":
+            _encerrar_pool()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    metodo, caminho = scope["method"], scope["path"]
+    if (metodo, caminho) == ("GET", "/health"):
+        return await _responder(send, 200, b'{"status": "ok"}', "application/json")
+    if (metodo, caminho) == ("GET", "/metrics"):
+        return await _responder(send, 200, metricas.prometheus().encode(), "text/plain; version=0.0.4")
+
+    rota = ROTAS.get((metodo, caminho))
+    if rota is None:
+        status = 405 if any(c == caminho for _, c in ROTAS) else 404
+        return await _responder(send, status, _json({"erro": "Rota não encontrada"}), "application/json")
+
+    try:
+        corpo = await _ler_corpo(receive)
+        try:
+            dados = json.loads(corpo or b"null")
+        except ValueError:
+            raise ErroRequisicao("JSON inválido") from None
+        # Chave canônica: mesmo JSON (independente da ordem dos campos) = mesma requisição
+        chave = (caminho, json.dumps(dados, sort_keys=True, ensure_ascii=False))
+        with metricas.etapa(f"api.{caminho}"):
+            status, resposta, tipo, cabecalhos = await _coalescer(chave, lambda: rota(dados))
+    except ErroRequisicao as e:
+        if e.status == 499:
+            return
+        return await _responder(send, e.status, _json({"erro": str(e)}), "application/json")
+    except Exception as e:
+        return await _responder(send, 500, _json({"erro": f"{type(e).__name__}: {e}"}), "application/json")
+    await _responder(send, status, resposta, tipo, cabecalhos)
@@ -0,0 +1,73 @@
+# ===================== TABELAS DE IR E IOF (VERSIONADAS) =====================
+# As faixas legais ficam em tributacao.json, uma entrada por versão; mudar a
+# tabela é uma alteração de dados, não de código. motor_calculo lê a versão
+# vigente; motor_lote compila a mesma tabela em arrays densos por dia.
+#
+# Formato de cada versão:
+#   ir.limites_dias / ir.aliquotas   prazo <= limites_dias[i] usa aliquotas[i];
+#                                     acima do último limite, a última alíquota
+#   iof.aliquotas_por_dia            alíquota do dia 1 em diante (index 0 é o dia 1);
+#                                     após o fim da lista, IOF zero
+#   isentos                          tipos isentos de IR e IOF (Pessoa Física)
+#
+# O arquivo padrão fica ao lado deste módulo (repositório / pip install -e .);
+# em uma instalação normal (pip install .) ele vai para o diretório de dados
+# do ambiente: <prefixo>/share/calculadora-cdb/tributacao.json.
+#
+# Variáveis de ambiente:
+#   CDB_TABELA_TRIBUTOS   arquivo JSON alternativo (mesmo formato)
+import json
+import os
+import sysconfig
+from dataclasses import dataclass
+from functools import lru_cache
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tributacao.json")
+CAMINHO_INSTALADO = os.path.join(sysconfig.get_path("data"), "share", "calculadora-cdb", "tributacao.json")
+
+
+@dataclass(frozen=True)
+class TabelaTributos:
+    versao: str
+    descricao: str
+    limites_ir: tuple
+    aliquotas_ir: tuple
+    iof_por_dia: tuple
+    isentos: tuple
+
+
+def _caminho():
+    caminho = os.environ.get("CDB_TABELA_TRIBUTOS")
+    if caminho:
+        return caminho
+    return CAMINHO_PADRAO if os.path.exists(CAMINHO_PADRAO) else CAMINHO_INSTALADO
+
+
+@lru_cache(maxsize=None)
+def _ler_arquivo(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def versoes_disponiveis():
+    return tuple(_ler_arquivo(_caminho())["versoes"])
+
+
+@lru_cache(maxsize=None)
+def carregar_tabela(versao=None):
+    dados = _ler_arquivo(_caminho())
+    versao = versao or dados["vigente"]
+    try:
+        v = dados["versoes"][versao]
+    except KeyError:
+        raise ValueError(f"Versão de tabela de tributos desconhecida: {versao!r}") from None
+    if len(v["ir"]["aliquotas"]) != len(v["ir"]["limites_dias"]) + 1:
+        raise ValueError(f"Tabela {versao}: ir.aliquotas deve ter uma alíquota a mais que ir.limites_dias")
+    return TabelaTributos(
+        versao=versao,
+        descricao=v.get("descricao", ""),
+        limites_ir=tuple(v["ir"]["limites_dias"]),
+        aliquotas_ir=tuple(v["ir"]["aliquotas"]),
+        iof_por_dia=tuple(v["iof"]["aliquotas_por_dia"]),
+        isentos=tuple(v["isentos"]),
+    )
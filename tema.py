@@ -0,0 +1,15 @@
+# ===================== CONFIGURAÇÃO DE CORES (TEMA CLARO PADRÃO) =====================
+# Compartilhado pela página Streamlit, pelo gráfico e pelo PDF
+TEXTO_PRINCIPAL_ST = "#222222"  # Preto/Escuro para títulos no Streamlit
+TEXTO_SECUNDARIO_ST = "#666666" # Cinza escuro para textos menores
+FUNDO_GRAFICO = "white"         # Fundo Gráfico Claro
+COR_EIXO_GRAFICO = "#333333"    # Cor de Eixo Gráfico Claro
+
+VERDE_DESTAQUE = '#2E8B57'      # Cor de destaque (Verde)
+# COR SOLICITADA PARA O TÍTULO DA TABELA DE RESULTADO FINAL
+AZUL_TABELA_PDF = "#864df4"
+
+# Cores das séries do gráfico
+COR_ATIVO = "#6B48FF"
+COR_CDI = "#FF5733"
+COR_POUPANCA = "#337AFF"
@@ -0,0 +1,34 @@
+import pytest
+
+
+# Logo local: as propostas em PDF não dependem da rede nos testes
+@pytest.fixture
+def logo_local(tmp_path, monkeypatch):
+    from PIL import Image
+
+    caminho = tmp_path / "logo.png"
+    Image.new("RGBA", (200, 60), (36, 99, 235, 255)).save(caminho)
+    monkeypatch.setenv("CDB_LOGO_PATH", str(caminho))
+    return caminho
+
+
+# Curva do CDI pequena (taxa diária constante em 2025) importada em diretório temporário
+@pytest.fixture
+def curva_cdi_local(tmp_path, monkeypatch):
+    import datetime
+
+    import curva_cdi
+
+    linhas = ["data;valor"]
+    dia = datetime.date(2025, 1, 2)
+    while dia < datetime.date(2026, 1, 1):
+        if dia.weekday() < 5:
+            linhas.append(f"{dia:%d/%m/%Y};0,050000")
+        dia += datetime.timedelta(days=1)
+    csv_cdi = tmp_path / "cdi.csv"
+    csv_cdi.write_text("\n".join(linhas), encoding="utf-8")
+    monkeypatch.setenv("CDB_CURVA_CDI", str(tmp_path / "cdi.npy"))
+    curva_cdi.importar_csv(str(csv_cdi))
+    curva_cdi.carregar_curva.cache_clear()
+    yield
+    curva_cdi.carregar_curva.cache_clear()
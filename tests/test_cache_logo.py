@@ -0,0 +1,130 @@
+import io
+import json
+import threading
+import time
+
+import pytest
+import requests
+from PIL import Image
+
+import cache_logo
+
+URL = "https://exemplo.invalid/logo.png"
+
+
+def _png(largura, altura):
+    buffer = io.BytesIO()
+    Image.new("RGB", (largura, altura)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class _Resposta:
+    def __init__(self, status_code, content=b"", etag=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {"ETag": etag} if etag else {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+
+# Servidor falso: registra as requisições e responde com a função dada
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    monkeypatch.delenv("CDB_LOGO_PATH", raising=False)
+    monkeypatch.setenv("CDB_LOGO_CACHE_DIR", str(tmp_path / "cache"))
+    cache_logo.limpar_cache_memoria()
+    pedidos = []
+    estado = {"responder": lambda headers: _Resposta(200, _png(200, 50), etag='"v1"')}
+
+    def get(url, headers=None, timeout=None):
+        pedidos.append({"headers": headers or {}, "timeout": timeout})
+        return estado["responder"](headers or {})
+
+    monkeypatch.setattr(requests, "get", get)
+    yield pedidos, estado
+    _aguardar_revalidacao()
+    cache_logo.limpar_cache_memoria()
+
+
+def _aguardar_revalidacao():
+    for thread in threading.enumerate():
+        if thread.name == "revalida-logo":
+            thread.join()
+
+
+def _envelhecer(segundos):
+    for url, (asset, etag, buscado_em) in list(cache_logo._memoria.items()):
+        cache_logo._memoria[url] = (asset, etag, buscado_em - segundos)
+
+
+def test_dentro_do_ttl_nao_acessa_a_rede(servidor):
+    pedidos, _ = servidor
+    primeiro = cache_logo.obter_logo(URL)
+    assert cache_logo.obter_logo(URL) is primeiro
+    assert primeiro.proporcao == 0.25
+    assert len(pedidos) == 1
+
+
+def test_vencido_revalida_com_etag_e_304_renova_a_validade(servidor):
+    pedidos, estado = servidor
+    asset = cache_logo.obter_logo(URL)
+    estado["responder"] = lambda headers: _Resposta(304)
+    _envelhecer(cache_logo.TTL_PADRAO + 1)
+
+    assert cache_logo.obter_logo(URL) is asset  # cópia vencida servida sem esperar a rede
+    _aguardar_revalidacao()
+    assert pedidos[-1]["headers"] == {"If-None-Match": '"v1"'}
+    assert time.time() - cache_logo._memoria[URL][2] < 60
+    assert cache_logo._memoria[URL][0] is asset
+
+
+def test_sem_rede_usa_a_copia_em_disco(servidor):
+    pedidos, estado = servidor
+    asset = cache_logo.obter_logo(URL)
+    cache_logo.limpar_cache_memoria()
+
+    def offline(headers):
+        raise requests.ConnectionError("sem rede")
+    estado["responder"] = offline
+    # Cópia em disco vencida: servida mesmo com a revalidação falhando
+    caminho_meta = cache_logo._caminhos(URL)[1]
+    with open(caminho_meta, encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["buscado_em"] = 0.0
+    with open(caminho_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    assert cache_logo.obter_logo(URL).dados == asset.dados
+    _aguardar_revalidacao()
+    assert len(pedidos) == 2
+    assert cache_logo.pre_carregar_logo(URL).dados == asset.dados
+
+
+def test_metadados_sem_proporcao_contam_como_sem_cache(servidor):
+    pedidos, _ = servidor
+    cache_logo.obter_logo(URL)
+    cache_logo.limpar_cache_memoria()
+    caminho_meta = cache_logo._caminhos(URL)[1]
+    with open(caminho_meta, "w", encoding="utf-8") as f:
+        json.dump({"url": URL, "etag": '"v1"'}, f)
+
+    assert cache_logo.obter_logo(URL).proporcao == 0.25
+    assert len(pedidos) == 2
+
+
+@pytest.mark.parametrize("variavel, funcao, padrao", [
+    ("CDB_LOGO_TTL", cache_logo._ttl, cache_logo.TTL_PADRAO),
+    ("CDB_LOGO_TIMEOUT", cache_logo._timeout, cache_logo.TIMEOUT_PADRAO),
+])
+def test_variavel_invalida_usa_o_padrao(monkeypatch, variavel, funcao, padrao):
+    monkeypatch.setenv(variavel, "cinco")
+    assert funcao() == padrao
+
+
+def test_timeout_invalido_nao_impede_o_download(servidor, monkeypatch):
+    pedidos, _ = servidor
+    monkeypatch.setenv("CDB_LOGO_TIMEOUT", "cinco")
+    cache_logo.obter_logo(URL)
+    assert pedidos[0]["timeout"] == cache_logo.TIMEOUT_PADRAO
@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = pathlib.Path(__file__).resolve().parent.parent
+
+POSICOES = [
+    ("C1", "10000,00", "LCI", "12", "2025-01-02", "2026-01-02"),
+    ("C2", "25000,00", "CDB Pré-fixado", "13,5", "2025-01-02", "2027-01-04"),
+]
+
+
+def _cli(*argumentos, entrada=""):
+    return subprocess.run([sys.executable, str(RAIZ / "calculadora_cli.py"), *argumentos], input=entrada,
+                          capture_output=True, text=True, cwd=RAIZ, check=True).stdout
+
+
+def _csv(separador):
+    linhas = [separador.join(("codigo", "valor", "ativo", "taxa", "data_aplicacao", "data_vencimento"))]
+    linhas += [separador.join(p) for p in POSICOES] if separador == ";" else [
+        separador.join(f'"{c}"' if "," in c else c for c in p) for p in POSICOES]
+    return "\n".join(linhas) + "\n"
+
+
+def test_batch_da_entrada_padrao_detecta_o_separador(tmp_path):
+    arquivo = tmp_path / "posicoes.csv"
+    arquivo.write_text(_csv(";"), encoding="utf-8")
+    pelo_arquivo = _cli("batch", str(arquivo), "-", "--workers", "1")
+    for separador in (";", ","):
+        saida = _cli("batch", "-", "-", "--workers", "1", entrada=_csv(separador))
+        assert saida == pelo_arquivo
+    linhas = list(csv.DictReader(io.StringIO(pelo_arquivo)))
+    assert [linha["codigo"] for linha in linhas] == ["C1", "C2"]
+    assert float(linhas[0]["valor_investido"]) == 10000.0
+
+
+def test_simulate_json_sem_importar_o_servidor():
+    entrada = json.dumps({"valor_investido": 10000, "tipo_investimento": "LCI", "data_aplicacao": "2025-01-02",
+                          "data_vencimento": "2026-01-02", "taxa_anual": 12})
+    resposta = json.loads(_cli("simulate", entrada=entrada + "\n"))
+    assert resposta["prazo_dias"] == 365
+    # O parser JSON vem do motor_calculo: a CLI não carrega o serviço ASGI
+    codigo = ("import io, sys, calculadora_cli; sys.stdin = io.StringIO(sys.argv[1]); "
+              "calculadora_cli.main(['simulate']); print('servidor_api' in sys.modules, file=sys.stderr)")
+    carregado = subprocess.run([sys.executable, "-c", codigo, entrada], capture_output=True, text=True, cwd=RAIZ, check=True)
+    assert carregado.stderr.strip().endswith("False")
+
+
+def test_batch_ignora_linha_com_ativo_desconhecido(tmp_path):
+    arquivo = tmp_path / "posicoes.csv"
+    texto = _csv(";")
+    arquivo.write_text(texto + "C3;1000,00;CDB Pre;12;2025-01-02;2026-01-02\n" + texto.splitlines()[1] + "\n",
+                       encoding="utf-8")
+    processo = subprocess.run([sys.executable, str(RAIZ / "calculadora_cli.py"), "batch", str(arquivo), "-", "--workers", "1"],
+                              capture_output=True, text=True, cwd=RAIZ)
+    assert processo.returncode == 0
+    assert [linha["codigo"] for linha in csv.DictReader(io.StringIO(processo.stdout))] == ["C1", "C2", "C1"]
+    assert "linha 3 ignorada" in processo.stderr
+
+
+def test_batch_parquet_na_saida_padrao(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    arquivo = tmp_path / "posicoes.csv"
+    arquivo.write_text(_csv(";"), encoding="utf-8")
+    processo = subprocess.run([sys.executable, str(RAIZ / "calculadora_cli.py"), "batch", str(arquivo), "-",
+                               "--formato", "parquet", "--workers", "1"], capture_output=True, cwd=RAIZ)
+    assert processo.returncode == 0, processo.stderr
+    tabela = pq.read_table(io.BytesIO(processo.stdout))
+    assert tabela.column("codigo").to_pylist() == ["C1", "C2"]
+
+
+@pytest.mark.parametrize("argumentos, mensagem", [
+    (["batch", "nao_existe.csv", "-"], "FileNotFoundError"),
+    (["simulate", "--tipo", "LCI", "--valor", "0", "--vencimento", "2030-01-02", "--taxa", "12"], "maior que zero"),
+])
+def test_erro_de_entrada_sem_traceback(tmp_path, argumentos, mensagem):
+    processo = subprocess.run([sys.executable, str(RAIZ / "calculadora_cli.py"), *argumentos],
+                              capture_output=True, text=True, cwd=tmp_path)
+    assert processo.returncode == 2
+    assert mensagem in processo.stderr
+    assert "Traceback" not in processo.stderr
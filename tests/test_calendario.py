@@ -0,0 +1,76 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import calendario
+from motor_calculo import EntradaSimulacao, simular
+from motor_lote import dias_uteis_lote
+
+d = datetime.date
+
+
+# Dias úteis do ano civil no calendário ANBIMA (20/11 nacional a partir de 2024)
+@pytest.mark.parametrize("ano, esperado", [(2023, 249), (2024, 253), (2025, 252)])
+def test_dias_uteis_do_ano(ano, esperado):
+    assert calendario.dias_uteis(d(ano, 1, 1), d(ano + 1, 1, 1)) == esperado
+
+
+@pytest.mark.parametrize("ano, pascoa", [(2000, d(2000, 4, 23)), (2024, d(2024, 3, 31)), (2025, d(2025, 4, 20)),
+                                         (2026, d(2026, 4, 5)), (2038, d(2038, 4, 25))])
+def test_domingo_pascoa(ano, pascoa):
+    assert calendario.domingo_pascoa(ano) == pascoa
+
+
+@pytest.mark.parametrize("data, nome", [
+    (d(2025, 3, 3), "Carnaval (segunda-feira)"),
+    (d(2025, 3, 4), "Carnaval (terça-feira)"),
+    (d(2025, 4, 18), "Sexta-feira Santa"),
+    (d(2025, 6, 19), "Corpus Christi"),
+    (d(2024, 5, 30), "Corpus Christi"),
+    (d(2024, 11, 20), "Dia Nacional de Zumbi e da Consciência Negra"),
+    (d(2025, 4, 21), "Tiradentes"),
+])
+def test_feriados(data, nome):
+    assert calendario.feriados_nacionais()[data] == nome
+    assert not calendario.eh_dia_util(data)
+
+
+def test_consciencia_negra_so_a_partir_de_2024():
+    assert d(2023, 11, 20) not in calendario.feriados_nacionais()
+    assert calendario.eh_dia_util(d(2023, 11, 20))
+
+
+def test_dias_uteis_convencao_inicio_inclusive_fim_exclusivo():
+    # sexta 2025-03-28 até segunda 2025-03-31: só a sexta conta
+    assert calendario.dias_uteis(d(2025, 3, 28), d(2025, 3, 31)) == 1
+    assert calendario.dias_uteis(d(2025, 3, 31), d(2025, 3, 31)) == 0
+    # semana do Carnaval: segunda e terça são feriados
+    assert calendario.dias_uteis(d(2025, 3, 3), d(2025, 3, 10)) == 3
+
+
+def test_dias_uteis_fora_do_calendario():
+    with pytest.raises(ValueError, match="fora do calendário"):
+        calendario.dias_uteis(d(1999, 12, 31), d(2000, 1, 10))
+
+
+def test_dias_uteis_lote_igual_ao_escalar():
+    inicios = [d(2024, 1, 1), d(2025, 3, 1), d(2030, 6, 15)]
+    fins = [d(2025, 1, 1), d(2025, 3, 10), d(2040, 1, 1)]
+    lote = dias_uteis_lote(np.array(inicios, dtype="datetime64[D]"), np.array(fins, dtype="datetime64[D]"))
+    assert lote.tolist() == [calendario.dias_uteis(a, b) for a, b in zip(inicios, fins)]
+
+
+# Pós-fixado capitaliza 252 dias úteis em 2025: 100% de um CDI de 12% rende exatamente 12%
+def test_pos_fixado_capitaliza_em_dias_uteis():
+    entrada = EntradaSimulacao(10_000.0, "CDB Pós-fixado (% do CDI)", d(2025, 1, 1), d(2026, 1, 1),
+                               perc_cdi=100.0, taxa_cdi=12.0)
+    resultado = simular(entrada)
+    assert resultado.dias_capitalizacao == 252
+    assert resultado.prazo_dias == 365
+    assert resultado.montante_bruto == pytest.approx(11_200.0, abs=1e-6)
+
+
+def test_pre_fixado_capitaliza_em_dias_corridos():
+    entrada = EntradaSimulacao(10_000.0, "CDB Pré-fixado", d(2025, 1, 1), d(2026, 1, 1), taxa_anual=12.0)
+    assert simular(entrada).dias_capitalizacao == 365
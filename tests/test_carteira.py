@@ -0,0 +1,87 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from carteira import fluxos_carteira, montar_carteira, projetar_carteira, simular_carteira
+from motor_calculo import EntradaSimulacao, simular
+
+d = datetime.date
+
+# Escada com tipos diferentes, aplicações e vencimentos escalonados (dois aportes no mesmo dia)
+POSICOES = [
+    ("C1", EntradaSimulacao(10_000.0, "LCI", d(2025, 1, 2), d(2025, 7, 2), taxa_anual=11.0)),
+    ("C2", EntradaSimulacao(20_000.0, "CDB Pré-fixado", d(2025, 1, 2), d(2026, 1, 2), taxa_anual=13.0)),
+    ("C3", EntradaSimulacao(15_000.0, "CDB Pós-fixado (% do CDI)", d(2025, 3, 10), d(2027, 3, 10),
+                            perc_cdi=105.0, taxa_cdi=14.0)),
+    ("C4", EntradaSimulacao(5_000.0, "LCA", d(2025, 6, 16), d(2025, 12, 15), taxa_anual=10.5)),
+]
+
+
+@pytest.fixture(scope="module")
+def resultado():
+    return simular_carteira(montar_carteira(POSICOES))
+
+
+def _valor_em(entrada, data):
+    if data < entrada.data_aplicacao:
+        return 0.0
+    if data >= entrada.data_vencimento:
+        return simular(entrada).montante_liquido
+    if data == entrada.data_aplicacao:
+        return entrada.valor_investido
+    aberta = EntradaSimulacao(entrada.valor_investido, entrada.tipo_investimento, entrada.data_aplicacao, data,
+                              entrada.taxa_anual, entrada.perc_cdi, entrada.taxa_cdi)
+    return simular(aberta).montante_bruto
+
+
+def test_totais_da_carteira(resultado):
+    resultados = [simular(e) for _, e in POSICOES]
+    assert resultado.valor_investido == 50_000.0
+    assert resultado.montante_liquido == pytest.approx(sum(r.montante_liquido for r in resultados), rel=1e-12)
+    assert resultado.data_aplicacao == d(2025, 1, 2) and resultado.data_vencimento == d(2027, 3, 10)
+
+
+@pytest.mark.parametrize("granularidade", ["mensal", "diaria"])
+def test_projecao_soma_posicoes_abertas_e_resgatadas(resultado, granularidade):
+    projecao = projetar_carteira(resultado, granularidade)
+    datas = [data.item() for data in projecao.datas]
+    # Toda aplicação e todo vencimento são degraus da curva
+    for _, entrada in POSICOES:
+        assert entrada.data_aplicacao in datas and entrada.data_vencimento in datas
+    assert datas[0] == d(2025, 1, 2) and datas[-1] == d(2027, 3, 10)
+
+    for i in range(0, len(datas), max(1, len(datas) // 40)):
+        data = datas[i]
+        esperado = sum(_valor_em(e, data) for _, e in POSICOES)
+        assert projecao.patrimonio[i] == pytest.approx(esperado, rel=1e-9), data
+        aplicado = sum(e.valor_investido for _, e in POSICOES if e.data_aplicacao <= data)
+        assert projecao.aplicado[i] == aplicado
+    assert projecao.patrimonio[-1] == pytest.approx(resultado.montante_liquido, rel=1e-12)
+    # Benchmarks recebem os mesmos aportes e só crescem
+    assert projecao.cdi[0] == projecao.poupanca[0] == 30_000.0
+    assert (np.diff(projecao.cdi) >= 0).all() and (np.diff(projecao.poupanca) >= 0).all()
+
+
+def test_como_projecao_no_formato_do_grafico(resultado):
+    projecao = projetar_carteira(resultado).como_projecao()
+    assert len(projecao.datas) == len(projecao.bruto) == len(projecao.cdi) == len(projecao.poupanca)
+
+
+def test_fluxos_agregados_por_data(resultado):
+    fluxos = fluxos_carteira(resultado)
+    datas = [data.item() for data in fluxos["data"]]
+    assert datas == sorted({e.data_aplicacao for _, e in POSICOES} | {e.data_vencimento for _, e in POSICOES})
+    por_data = dict(zip(datas, zip(fluxos["aplicacoes"], fluxos["resgates_liquidos"])))
+    assert por_data[d(2025, 1, 2)] == (30_000.0, 0.0)   # C1 + C2 no mesmo dia
+    assert por_data[d(2025, 7, 2)][1] == pytest.approx(simular(POSICOES[0][1]).montante_liquido, rel=1e-12)
+    assert fluxos["saldo"][0] == -30_000.0
+    assert fluxos["saldo"][-1] == pytest.approx(resultado.montante_liquido - resultado.valor_investido, rel=1e-12)
+
+
+def test_carteira_vazia_ou_invalida():
+    with pytest.raises(ValueError, match="sem posições"):
+        montar_carteira([])
+    invalida = EntradaSimulacao(1_000.0, "LCI", d(2025, 1, 2), d(2025, 1, 2), taxa_anual=10.0)
+    with pytest.raises(ValueError, match="C9"):
+        simular_carteira(montar_carteira([POSICOES[0], ("C9", invalida)]))
@@ -0,0 +1,102 @@
+import datetime
+import math
+
+import numpy as np
+import pytest
+
+import curva_cdi
+from calendario import dias_uteis, eh_dia_util
+
+d = datetime.date
+INICIO, FIM = d(2025, 1, 2), d(2025, 1, 31)
+
+
+# Taxas diárias distintas por dia útil de janeiro/2025 (em %)
+def _taxas():
+    taxas, dia = {}, INICIO
+    while dia <= FIM:
+        if eh_dia_util(dia):
+            taxas[dia] = 0.04 + 0.001 * dia.day
+        dia += datetime.timedelta(days=1)
+    return taxas
+
+
+@pytest.fixture
+def curva(tmp_path, monkeypatch):
+    csv_cdi = tmp_path / "cdi.csv"
+    csv_cdi.write_text("data;valor\n" + "\n".join(f"{dia:%d/%m/%Y};{taxa:.6f}".replace(".", ",")
+                                                  for dia, taxa in _taxas().items()), encoding="utf-8")
+    monkeypatch.setenv("CDB_CURVA_CDI", str(tmp_path / "cdi.npy"))
+    meta = curva_cdi.importar_csv(str(csv_cdi))
+    assert meta["data_inicial"] == INICIO.isoformat() and meta["data_final"] == FIM.isoformat()
+    yield curva_cdi.carregar_curva()
+    curva_cdi.carregar_curva.cache_clear()
+
+
+def _esperado(inicio, fim, perc=100.0):
+    return math.prod(1 + taxa / 100 * perc / 100 for dia, taxa in _taxas().items() if inicio <= dia < fim)
+
+
+def test_importacao_recarrega_em_memmap(curva):
+    assert curva_cdi.curva_disponivel()
+    assert isinstance(curva._taxas, np.memmap)
+    assert curva.data_inicial == INICIO and curva.data_final == FIM
+    assert curva._taxas[0] == pytest.approx(0.00042)
+
+
+@pytest.mark.parametrize("inicio, fim, perc", [
+    (INICIO, d(2025, 2, 1), 100.0),
+    (d(2025, 1, 6), d(2025, 1, 20), 100.0),
+    (d(2025, 1, 4), d(2025, 1, 5), 100.0),   # fim de semana: fator 1
+    (INICIO, d(2025, 1, 15), 112.5),
+])
+def test_fator_dentro_da_serie(curva, inicio, fim, perc):
+    assert curva.fator(inicio, fim, perc) == pytest.approx(_esperado(inicio, fim, perc), rel=1e-12)
+
+
+def test_fator_alem_da_serie_projeta_com_taxa_cdi(curva):
+    fim = d(2025, 3, 10)
+    projetado = (1 + 12.0 * 1.1 / 100) ** (dias_uteis(d(2025, 2, 1), fim) / 252)
+    assert curva.fator(d(2025, 1, 10), fim, 110.0, taxa_cdi=12.0) == pytest.approx(
+        _esperado(d(2025, 1, 10), fim, 110.0) * projetado, rel=1e-12)
+    # Aplicação depois do fim da série: só a projeção
+    assert curva.fator(d(2025, 2, 3), fim, 100.0, taxa_cdi=12.0) == pytest.approx(
+        1.12 ** (dias_uteis(d(2025, 2, 3), fim) / 252), rel=1e-12)
+
+
+def test_fator_alem_da_serie_sem_taxa_cdi(curva):
+    with pytest.raises(ValueError, match="informe taxa_cdi"):
+        curva.fator(INICIO, d(2025, 3, 10))
+
+
+def test_fator_antes_da_serie(curva):
+    with pytest.raises(ValueError, match="anterior"):
+        curva.fator(d(2024, 12, 30), FIM)
+    with pytest.raises(ValueError, match="anterior"):
+        curva.fator_lote(np.array(["2024-12-30"], dtype="datetime64[D]"), np.array(["2025-01-10"], dtype="datetime64[D]"),
+                         100.0, 12.0)
+
+
+def test_fator_lote_igual_ao_escalar(curva):
+    casos = [(INICIO, d(2025, 1, 15), 100.0), (d(2025, 1, 6), d(2025, 3, 10), 110.0),
+             (d(2025, 1, 20), d(2025, 2, 1), 95.0), (d(2025, 2, 3), d(2025, 6, 2), 100.0)]
+    inicios, fins, percs = zip(*casos)
+    lote = curva.fator_lote(np.array(inicios, dtype="datetime64[D]"), np.array(fins, dtype="datetime64[D]"),
+                            np.array(percs), 12.0)
+    np.testing.assert_allclose(lote, [curva.fator(a, b, p, 12.0) for a, b, p in casos], rtol=1e-12)
+
+
+def test_csv_com_virgula_e_taxa_anual(tmp_path):
+    csv_cdi = tmp_path / "cdi.csv"
+    csv_cdi.write_text("data,valor\n2025-01-02,12.0\n2025-01-03,12.0\n", encoding="utf-8")
+    saida = tmp_path / "anual.npy"
+    curva_cdi.importar_csv(str(csv_cdi), saida=str(saida), anual=True)
+    curva = curva_cdi.CurvaCDI(str(saida))
+    assert curva.fator(d(2025, 1, 2), d(2025, 1, 4)) == pytest.approx(1.12 ** (2 / 252), rel=1e-12)
+
+
+def test_csv_sem_taxas(tmp_path):
+    csv_cdi = tmp_path / "vazio.csv"
+    csv_cdi.write_text("data;valor\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Nenhuma taxa"):
+        curva_cdi.importar_csv(str(csv_cdi), saida=str(tmp_path / "vazio.npy"))
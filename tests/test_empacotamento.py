@@ -0,0 +1,14 @@
+import pathlib
+
+import pytest
+
+tomllib = pytest.importorskip("tomllib")  # Python 3.11+
+
+RAIZ = pathlib.Path(__file__).resolve().parent.parent
+
+
+# pip install . (não editável) só leva os módulos listados: um módulo novo fora da lista quebra o comando instalado
+def test_todos_os_modulos_da_raiz_estao_no_pacote():
+    configuracao = tomllib.loads((RAIZ / "pyproject.toml").read_text(encoding="utf-8"))["tool"]["setuptools"]
+    assert set(configuracao["py-modules"]) == {caminho.stem for caminho in RAIZ.glob("*.py")}
+    assert "tributacao.json" in configuracao["data-files"]["share/calculadora-cdb"]
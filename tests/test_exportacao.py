@@ -0,0 +1,31 @@
+import datetime
+import io
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from exportacao import tabela_carteira  # noqa: E402
+
+CABECALHO = "codigo;valor;ativo;taxa;data_aplicacao;data_vencimento\n"
+
+
+def _arquivo(texto):
+    return io.BytesIO(texto.encode("utf-8"))
+
+
+def test_tabela_carteira_converte_datas():
+    tabela = tabela_carteira(_arquivo(CABECALHO + "C1;1000;LCI;12;02/01/2025;02/01/2026\n"), "carteira.csv")
+    assert tabela["codigo"].tolist() == ["C1"]
+    assert tabela["data_aplicacao"].tolist() == [datetime.date(2025, 1, 2)]
+
+
+@pytest.mark.parametrize("texto, mensagem", [
+    ("", "vazio|ilegível"),
+    (CABECALHO, "nenhuma posição"),
+    ("codigo;valor;ativo;taxa\nC1;1000;LCI;12\n", "data_aplicacao, data_vencimento"),
+    (CABECALHO + "C1;1000;LCI;12;ontem;amanhã\n", None),
+])
+def test_tabela_carteira_invalida(texto, mensagem):
+    with pytest.raises(ValueError, match=mensagem):
+        tabela_carteira(_arquivo(texto), "carteira.csv")
@@ -0,0 +1,71 @@
+import datetime
+import gc
+import threading
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from grafico import grafico_png, grafico_png_tela  # noqa: E402
+from motor_calculo import TIPOS_INVESTIMENTO, EntradaSimulacao, projetar_rentabilidade, simular  # noqa: E402
+
+SESSOES = 6
+
+
+def _sessoes(n):
+    sessoes = []
+    for i in range(n):
+        aplicacao = datetime.date(2025, 1, 2) + datetime.timedelta(days=7 * i)
+        entrada = EntradaSimulacao(
+            valor_investido=10_000.0 * (i + 1),
+            tipo_investimento=TIPOS_INVESTIMENTO[i % len(TIPOS_INVESTIMENTO)],
+            data_aplicacao=aplicacao,
+            data_vencimento=aplicacao + datetime.timedelta(days=365 + 90 * i),
+            taxa_anual=10.0 + i % 7,
+            perc_cdi=95.0 + i,
+            taxa_cdi=12.0 + (i % 5) / 2,
+        )
+        resultado = simular(entrada)
+        sessoes.append((entrada, resultado, projetar_rentabilidade(entrada, resultado)))
+    return sessoes
+
+
+# Página (fundo do tema) e PDF (título preto) alternados entre as sessões
+def _renderizar(i, sessao):
+    if i % 2:
+        return grafico_png(*sessao, dpi=60).getvalue()
+    return grafico_png_tela(*sessao, dpi=60)
+
+
+def _figuras_vivas():
+    from matplotlib.figure import Figure
+    gc.collect()
+    return sum(isinstance(objeto, Figure) for objeto in gc.get_objects())
+
+
+# Sessões simultâneas (uma thread cada, liberadas juntas) geram os mesmos bytes que em série
+def test_sessoes_simultaneas_geram_as_mesmas_imagens_que_em_serie():
+    sessoes = _sessoes(SESSOES)
+    referencia = [_renderizar(i, s) for i, s in enumerate(sessoes)]
+    assert len(set(referencia)) == SESSOES
+
+    barreira = threading.Barrier(SESSOES)
+    imagens = [None] * SESSOES
+    erros = []
+
+    def sessao(i):
+        barreira.wait()
+        try:
+            imagens[i] = _renderizar(i, sessoes[i])
+        except Exception as exc:  # noqa: BLE001
+            erros.append((i, exc))
+
+    threads = [threading.Thread(target=sessao, args=(i,)) for i in range(SESSOES)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert erros == []
+    assert imagens == referencia
+    assert _figuras_vivas() == 0
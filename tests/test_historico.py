@@ -0,0 +1,95 @@
+import datetime
+import os
+import pathlib
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from historico import Historico, chave_simulacao
+from motor_calculo import EntradaSimulacao, simular
+
+RAIZ = pathlib.Path(__file__).resolve().parent.parent
+HOJE = datetime.date(2025, 1, 2)
+ENTRADA = EntradaSimulacao(10000.0, "LCI", datetime.date(2025, 1, 2), datetime.date(2026, 1, 2), taxa_anual=12.0)
+POS = EntradaSimulacao(50000.0, "CDB Pós-fixado (% do CDI)", datetime.date(2025, 1, 2), datetime.date(2027, 1, 4),
+                       perc_cdi=110.0)
+
+
+@pytest.fixture
+def historico(tmp_path):
+    return Historico(str(tmp_path / "historico.sqlite3"))
+
+
+def _salvar(historico, codigo, assessor, entrada=ENTRADA, modo="rapido", pdf=None):
+    return historico.salvar(codigo, f"Cliente {codigo}", assessor, HOJE, entrada, simular(entrada), modo, pdf=pdf)
+
+
+def _contar(historico, tabela):
+    with sqlite3.connect(historico.caminho) as conexao:
+        return conexao.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+
+def test_salvar_buscar_e_obter(historico):
+    chave = _salvar(historico, "C1", "Ana", pdf=b"%PDF-1")
+    _salvar(historico, "C2", "Ana", entrada=POS)
+    _salvar(historico, "C3", "Bruno")
+    historico.descarregar()
+
+    assert {r.codigo_cliente for r in historico.buscar(assessor="Ana")} == {"C1", "C2"}
+    assert [r.codigo_cliente for r in historico.buscar(codigo_cliente="C3")] == ["C3"]
+    assert len(historico.buscar(limite=2)) == 2
+    assert historico.buscar(desde=datetime.date.today() + datetime.timedelta(days=1)) == []
+
+    registro = historico.obter(chave)
+    assert registro.entrada == ENTRADA
+    assert registro.data_simulacao == HOJE
+    assert registro.resultado["montante_bruto"] == pytest.approx(simular(ENTRADA).montante_bruto)
+    assert registro.tem_pdf
+    assert historico.pdf(chave) == b"%PDF-1"
+    assert historico.tem_pdf(chave)
+
+    # Pós-fixado volta com o perc_cdi; sem PDF gravado
+    (registro,) = historico.buscar(codigo_cliente="C2")
+    assert registro.entrada == POS
+    assert not registro.tem_pdf
+    assert historico.pdf(registro.chave) is None
+    assert not historico.tem_pdf(registro.chave)
+    assert historico.obter("nao-existe") is None
+
+
+def test_chave_deduplica_a_mesma_simulacao(historico):
+    chave = _salvar(historico, "C1", "Ana")
+    assert _salvar(historico, "C1", "Ana") == chave
+    historico.descarregar()
+    assert _contar(historico, "simulacoes") == 1
+
+    assert chave_simulacao("C1", "Cliente C1", "Ana", HOJE, ENTRADA, "preciso") != chave
+    assert chave_simulacao("C2", "Cliente C1", "Ana", HOJE, ENTRADA) != chave
+    assert chave_simulacao("C1", "Cliente C1", "Ana", HOJE + datetime.timedelta(days=1), ENTRADA) != chave
+    assert chave_simulacao("C1", "Cliente C1", "Ana", HOJE, POS) != chave
+
+
+def test_registrar_sem_pdf_mantem_o_blob(historico):
+    chave = _salvar(historico, "C1", "Ana", pdf=b"%PDF-1")
+    historico.descarregar()
+    # Downloads seguintes só registram a simulação
+    _salvar(historico, "C1", "Ana")
+    historico.descarregar()
+    assert historico.pdf(chave) == b"%PDF-1"
+    assert _contar(historico, "pdfs") == 1
+
+
+def test_fila_e_gravada_no_encerramento(tmp_path):
+    caminho = tmp_path / "historico.sqlite3"
+    # Sem descarregar(): o atexit de abrir_historico grava o que ficou na fila
+    codigo = ("import datetime, historico, motor_calculo as m; "
+              "e = m.EntradaSimulacao(10000.0, 'LCI', datetime.date(2025, 1, 2), datetime.date(2026, 1, 2), taxa_anual=12.0); "
+              "h = historico.abrir_historico(); "
+              "[h.salvar(f'C{i}', 'Cliente', 'Ana', datetime.date(2025, 1, 2), e, m.simular(e), pdf=b'%PDF') for i in range(200)]")
+    subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True,
+                   env={**os.environ, "CDB_HISTORICO": str(caminho)})
+    historico = Historico(str(caminho))
+    assert _contar(historico, "simulacoes") == 200
+    assert _contar(historico, "pdfs") == 200
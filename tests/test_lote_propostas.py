@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+import lote_propostas
+
+CABECALHO = "codigo,nome,assessor,valor,ativo,taxa,data_aplicacao,data_vencimento\n"
+LINHA = "C1,Maria Souza,Assessor,10000,LCI,12,2025-01-02,2026-01-02\n"
+
+
+def _linha_dict():
+    return dict(zip(CABECALHO.strip().split(","), LINHA.strip().split(",")))
+
+
+def test_nome_arquivo_lote_distingue_linhas_repetidas():
+    nomes = {lote_propostas.nome_arquivo_lote(n, "C1", "Proposta_LCI_Maria_Souza.pdf") for n in (1, 2)}
+    assert nomes == {"C1_Proposta_LCI_Maria_Souza_linha1.pdf", "C1_Proposta_LCI_Maria_Souza_linha2.pdf"}
+
+
+@pytest.mark.parametrize("saida", ["propostas.zip", "propostas"])
+def test_clientes_repetidos_geram_arquivos_distintos(tmp_path, logo_local, saida):
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text(CABECALHO + LINHA + LINHA, encoding="utf-8")
+    destino = tmp_path / saida
+
+    resumo = lote_propostas.gerar_propostas(str(entrada), str(destino), workers=1)
+
+    assert resumo["propostas"] == 2 and resumo["erros"] == 0
+    if saida.endswith(".zip"):
+        with zipfile.ZipFile(destino) as arquivo:
+            nomes = arquivo.namelist()
+    else:
+        nomes = [caminho.name for caminho in destino.iterdir()]
+    assert len(set(nomes)) == 2
+
+
+def test_parquet_sem_pyarrow_levanta_erro_de_biblioteca(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        next(lote_propostas.ler_clientes(str(tmp_path / "clientes.parquet")))
+    assert lote_propostas.main([str(tmp_path / "clientes.parquet"), str(tmp_path / "saida")]) == 2
+
+
+def test_worker_nao_importa_matplotlib(logo_local):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = "import sys, lote_propostas; lote_propostas._inicializar_worker(); print('matplotlib' in sys.modules)"
+    saida = subprocess.run([sys.executable, "-c", script], cwd=raiz, capture_output=True, text=True, check=True).stdout
+    assert saida.strip() == "False"
+
+
+def test_ativo_desconhecido_rejeitado_na_leitura():
+    with pytest.raises(ValueError, match="desconhecido"):
+        lote_propostas.linha_para_entrada({**_linha_dict(), "ativo": "CDB Pre"})
+
+
+def test_posicoes_ignora_linha_com_ativo_desconhecido(caplog):
+    from exportacao import posicoes
+
+    linhas = [_linha_dict(), {**_linha_dict(), "codigo": "C2", "ativo": "CDB Pre"}, {**_linha_dict(), "codigo": "C3"}]
+    assert [codigo for codigo, _ in posicoes(linhas)] == ["C1", "C3"]
+    assert "linha 2 ignorada" in caplog.text
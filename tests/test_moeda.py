@@ -0,0 +1,59 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from moeda import brl, brl_lote, ler_brl, mascara_brl, numero_br
+
+# Casos de borda e magnitudes de centavos a trilhões, com sinal
+BORDAS = [0.0, -0.0, 0.01, -0.01, 0.005, 999.995, 1e15, -1234567.891]
+
+
+def _valores(n, seed=0):
+    rng = random.Random(seed)
+    valores = list(BORDAS)
+    while len(valores) < n:
+        valores.append(round(rng.uniform(-1, 1) * 10 ** rng.randint(0, 12), rng.choice((0, 1, 2, 3, 6))))
+    return valores
+
+
+def _digitados(n, seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("0123456789,.R$ -abc") for _ in range(rng.randint(0, 16))) for _ in range(n)]
+
+
+VALORES = _valores(20000)
+
+
+def test_brl_ler_brl_ida_e_volta():
+    for v in VALORES:
+        assert ler_brl(brl(v)) == round(v, 2), brl(v)
+
+
+def test_brl_ler_brl_ida_e_volta_decimal():
+    for v in VALORES:
+        d = Decimal(round(v * 100)) / 100
+        assert ler_brl(brl(d), decimal=True) == d, brl(d)
+
+
+def test_mascara_aceita_o_texto_formatado():
+    for v in VALORES:
+        assert mascara_brl(brl(v)) == numero_br(abs(v)), brl(v)
+
+
+def test_brl_lote_igual_a_brl():
+    assert brl_lote(VALORES) == [brl(v) for v in VALORES]
+
+
+def test_mascara_de_texto_digitado_em_centavos_exatos():
+    for texto in _digitados(20000):
+        mascarado = mascara_brl(texto)
+        valor = ler_brl(mascarado, decimal=True)
+        assert valor.as_tuple().exponent == -2 and valor >= 0, (texto, mascarado)
+        assert mascara_brl(mascarado) == mascarado, (texto, mascarado)
+
+
+@pytest.mark.parametrize("texto", ["", "R$", "abc", "1,2,3", "nan", "inf"])
+def test_ler_brl_rejeita_texto_invalido(texto):
+    with pytest.raises(ValueError, match="inválido"):
+        ler_brl(texto)
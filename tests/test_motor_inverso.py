@@ -0,0 +1,33 @@
+import datetime
+
+from motor_calculo import EntradaSimulacao, simular
+from motor_inverso import prazo_para_alvo, taxa_para_alvo
+
+POS = "CDB Pós-fixado (% do CDI)"
+
+
+def test_taxa_para_alvo_reproduz_o_liquido():
+    aplicacao, vencimento = datetime.date(2025, 1, 2), datetime.date(2027, 1, 4)
+    taxa = float(taxa_para_alvo(10000.0, POS, aplicacao, vencimento, 12000.0, taxa_cdi=14.9))
+    resultado = simular(EntradaSimulacao(10000.0, POS, aplicacao, vencimento, perc_cdi=taxa, taxa_cdi=14.9))
+    assert abs(resultado.montante_liquido - 12000.0) < 1e-6
+
+
+def test_prazo_para_alvo_e_o_menor_prazo():
+    aplicacao = datetime.date(2025, 1, 2)
+    prazo = int(prazo_para_alvo(10000.0, "LCI", aplicacao, 11000.0, taxa_anual=12.0)[()])
+
+    def liquido(dias):
+        entrada = EntradaSimulacao(10000.0, "LCI", aplicacao, aplicacao + datetime.timedelta(days=dias), taxa_anual=12.0)
+        return simular(entrada).montante_liquido
+
+    assert liquido(prazo) >= 11000.0 > liquido(prazo - 1)
+
+
+def test_prazo_para_alvo_limitado_ao_fim_do_calendario():
+    # Pós-fixado perto do fim do calendário (2099): a busca para na última data em vez de falhar
+    aplicacao = datetime.date(2075, 1, 1)
+    prazos = prazo_para_alvo([10000.0, 10000.0, 10000.0], ["LCI", POS, POS], aplicacao,
+                             [1e9, 20000.0, 1e9], taxa_anual=12.0, perc_cdi=100.0)
+    assert prazos[0] == -1 and prazos[2] == -1
+    assert 0 < prazos[1] <= (datetime.date(2100, 1, 1) - aplicacao).days
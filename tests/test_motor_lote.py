@@ -0,0 +1,72 @@
+import datetime
+import random
+
+import numpy as np
+import pytest
+
+from motor_calculo import TIPOS_INVESTIMENTO, EntradaSimulacao, simular
+from motor_lote import simular_lote
+
+CAMPOS = ("montante_bruto", "rendimento_bruto", "iof", "aliquota_ir", "ir", "impostos_totais",
+          "montante_liquido", "rendimento_liquido")
+
+
+def _entradas(n, seed=0):
+    rng = random.Random(seed)
+    entradas = []
+    for _ in range(n):
+        aplicacao = datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randrange(730))
+        # prazos curtos (faixa do IOF) e longos (todas as faixas de IR)
+        prazo = rng.randint(1, 30) if rng.random() < 0.2 else rng.randint(31, 3650)
+        entradas.append(EntradaSimulacao(
+            valor_investido=rng.randrange(100_000, 500_000_000) / 100,
+            tipo_investimento=rng.choice(TIPOS_INVESTIMENTO),
+            data_aplicacao=aplicacao,
+            data_vencimento=aplicacao + datetime.timedelta(days=prazo),
+            taxa_anual=rng.randrange(500, 2000) / 100,
+            perc_cdi=rng.randrange(8000, 15000) / 100,
+            taxa_cdi=rng.randrange(800, 1600) / 100,
+        ))
+    return entradas
+
+
+def _lote(entradas, **kwargs):
+    return simular_lote(
+        [e.valor_investido for e in entradas],
+        [e.tipo_investimento for e in entradas],
+        [e.data_aplicacao for e in entradas],
+        [e.data_vencimento for e in entradas],
+        taxa_anual=[e.taxa_anual for e in entradas],
+        perc_cdi=[e.perc_cdi for e in entradas],
+        taxa_cdi=[e.taxa_cdi for e in entradas],
+        **kwargs,
+    )
+
+
+def test_lote_igual_a_simular_posicao_a_posicao():
+    entradas = _entradas(2000)
+    lote = _lote(entradas)
+    assert lote.validos.all()
+    np.testing.assert_array_equal(lote.prazo_dias, [(e.data_vencimento - e.data_aplicacao).days for e in entradas])
+    resultados = [simular(e) for e in entradas]
+    for campo in CAMPOS:
+        esperado = np.array([getattr(r, campo) for r in resultados])
+        np.testing.assert_allclose(getattr(lote, campo), esperado, rtol=1e-9, atol=1e-6, err_msg=campo)
+
+
+def test_linhas_invalidas_viram_nan():
+    aplicacao = datetime.date(2025, 1, 2)
+    lote = simular_lote([1000.0, 0.0, 1000.0], ["LCI"] * 3, [aplicacao] * 3,
+                        [aplicacao + datetime.timedelta(days=d) for d in (100, 100, 0)], taxa_anual=10.0)
+    assert lote.validos.tolist() == [True, False, False]
+    assert not np.isnan(lote.montante_liquido[0])
+    assert np.isnan(lote.montante_liquido[1:]).all()
+
+
+def test_tipo_desconhecido_rejeitado_nos_dois_caminhos():
+    aplicacao = datetime.date(2025, 1, 2)
+    entrada = EntradaSimulacao(1000.0, "CDB XYZ", aplicacao, aplicacao + datetime.timedelta(days=365), taxa_anual=10.0)
+    with pytest.raises(ValueError, match="desconhecido"):
+        simular(entrada)
+    with pytest.raises(ValueError, match="desconhecido"):
+        _lote([entrada])
@@ -0,0 +1,73 @@
+import datetime
+import importlib
+
+import numpy as np
+import pytest
+
+import motor_preciso
+from motor_calculo import EntradaSimulacao
+from motor_preciso import simular_decimal
+from test_motor_lote import _entradas, _lote
+
+CAMPOS = ("montante_bruto", "rendimento_bruto", "iof", "ir", "impostos_totais", "montante_liquido", "rendimento_liquido")
+
+
+def _centavos(valores):
+    return np.round(np.asarray(valores, dtype=np.float64) * 100).astype(np.int64)
+
+
+def _comparar(entradas, **kwargs):
+    lote = _lote(entradas, modo="preciso", **kwargs)
+    referencia = [simular_decimal(e) for e in entradas]
+    for campo in CAMPOS:
+        esperado = np.array([int(getattr(r, campo) * 100) for r in referencia])
+        np.testing.assert_array_equal(_centavos(getattr(lote, campo)), esperado, err_msg=campo)
+
+
+def test_lote_preciso_igual_ao_decimal_no_centavo():
+    _comparar(_entradas(20000, seed=1))
+
+
+# Posições em que a potência em float64 caía no centavo errado (montante a
+# menos de 1e-5 centavo da fronteira)
+@pytest.mark.parametrize("valor, tipo, aplicacao, prazo, taxa_anual, perc_cdi, taxa_cdi", [
+    (2155231.71, "LCI", datetime.date(2025, 10, 23), 2540, 9.6, 90.36, 11.22),
+    (4541539.70, "LCA", datetime.date(2025, 10, 23), 3644, 14.59, 117.79, 15.46),
+    (4085858.49, "LCA", datetime.date(2025, 4, 28), 2759, 12.73, 91.81, 13.61),
+    (2342644.61, "CDB Pós-fixado (% do CDI)", datetime.date(2025, 3, 6), 1050, 10.35, 113.2, 15.43),
+])
+def test_lote_preciso_casos_de_fronteira(valor, tipo, aplicacao, prazo, taxa_anual, perc_cdi, taxa_cdi):
+    _comparar([EntradaSimulacao(valor, tipo, aplicacao, aplicacao + datetime.timedelta(days=prazo),
+                                taxa_anual=taxa_anual, perc_cdi=perc_cdi, taxa_cdi=taxa_cdi)])
+
+
+def test_lote_preciso_igual_ao_decimal_com_cdi_historico(curva_cdi_local):
+    aplicacao = datetime.date(2025, 1, 2)
+    entradas = [
+        EntradaSimulacao(v, "CDB Pós-fixado (% do CDI)", aplicacao, aplicacao + datetime.timedelta(days=d),
+                         perc_cdi=p, cdi_historico=True)
+        for v, d, p in ((1000.0, 100, 100.0), (123456.78, 300, 110.0), (5_000_000.0, 363, 97.5))
+    ]
+    _comparar(entradas, cdi_historico=True)
+
+
+@pytest.mark.parametrize("valor, esperado", [("preciso", "preciso"), (" Preciso ", "preciso"), ("rapido", "rapido")])
+def test_modo_padrao_pela_variavel(monkeypatch, caplog, valor, esperado):
+    monkeypatch.setenv("CDB_MODO_NUMERICO", valor)
+    try:
+        assert importlib.reload(motor_preciso).MODO_PADRAO == esperado
+    finally:
+        monkeypatch.delenv("CDB_MODO_NUMERICO")
+        importlib.reload(motor_preciso)
+    assert "CDB_MODO_NUMERICO" not in caplog.text
+
+
+def test_modo_padrao_invalido_avisa_e_cai_no_rapido(monkeypatch, caplog):
+    monkeypatch.setenv("CDB_MODO_NUMERICO", "precise")
+    try:
+        with caplog.at_level("WARNING", logger="calculadora_cdb.motor_preciso"):
+            assert importlib.reload(motor_preciso).MODO_PADRAO == "rapido"
+    finally:
+        monkeypatch.delenv("CDB_MODO_NUMERICO")
+        importlib.reload(motor_preciso)
+    assert "CDB_MODO_NUMERICO='precise' desconhecido" in caplog.text
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("streamlit.testing.v1")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Processo novo: sys.modules reflete só o que a execução da página importou
+SCRIPT = """
+import sys
+from streamlit.testing.v1 import AppTest
+
+pagina = AppTest.from_file("calculadora_cdb.py", default_timeout=60).run()
+assert not pagina.exception, [e.value for e in pagina.exception]
+print("reportlab" in sys.modules)
+"""
+
+
+def _executar_pagina(tmp_path, logo_local, **env):
+    ambiente = dict(os.environ, CDB_HISTORICO=str(tmp_path / "historico.db"), CDB_LOGO_PATH=str(logo_local), **env)
+    return subprocess.run([sys.executable, "-c", SCRIPT], cwd=RAIZ, env=ambiente,
+                          capture_output=True, text=True, check=True).stdout
+
+
+def test_pagina_nao_importa_reportlab_sem_gerar_pdf(tmp_path, logo_local):
+    assert _executar_pagina(tmp_path, logo_local).strip() == "False"
+
+
+def test_pagina_abre_com_modo_numerico_invalido(tmp_path, logo_local):
+    _executar_pagina(tmp_path, logo_local, CDB_MODO_NUMERICO="exato")
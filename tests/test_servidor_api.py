@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+import pytest
+
+import servidor_api
+from motor_calculo import simular
+
+POSICAO = {"valor_investido": 10000, "tipo_investimento": "CDB Pós-fixado (% do CDI)",
+           "data_aplicacao": "2025-01-02", "data_vencimento": "2026-01-02", "perc_cdi": 100, "taxa_cdi": 14.9}
+
+
+# Uma requisição pelo app ASGI, sem servidor: devolve (status, corpo)
+def _chamar(metodo, caminho, dados):
+    async def executar():
+        enviado = []
+        corpo = json.dumps(dados).encode()
+
+        async def receive():
+            return {"type": "http.request", "body": corpo, "more_body": False}
+
+        async def send(mensagem):
+            enviado.append(mensagem)
+
+        await servidor_api.app({"type": "http", "method": metodo, "path": caminho}, receive, send)
+        return enviado[0]["status"], enviado[1]["body"]
+
+    return asyncio.run(executar())
+
+
+def test_cdi_historico_vale_por_posicao(curva_cdi_local):
+    posicoes = [POSICAO, {**POSICAO, "cdi_historico": True}]
+    status, corpo = _chamar("POST", "/simulate/batch", {"posicoes": posicoes})
+    assert status == 200
+    brutos = json.loads(corpo)["montante_bruto"]
+    for bruto, dados in zip(brutos, posicoes):
+        esperado = simular(servidor_api.entrada_de_json(dados)).montante_bruto
+        assert bruto == pytest.approx(esperado, rel=1e-9)
+    assert brutos[0] != pytest.approx(brutos[1], rel=1e-6)
+
+
+def test_lote_vazio():
+    status, corpo = _chamar("POST", "/simulate/batch", {"posicoes": []})
+    assert status == 200
+    assert json.loads(corpo)["montante_bruto"] == []
+
+
+@pytest.mark.parametrize("alteracao, mensagem", [
+    ({"valor_investido": 0}, "maior que zero"),
+    ({"data_vencimento": "2024-01-02"}, "posterior"),
+    ({"tipo_investimento": "CDB XYZ"}, "desconhecido"),
+    ({"data_simulacao": "02/01/2025"}, "data_simulacao"),
+])
+def test_proposta_invalida_responde_400_sem_usar_o_pool(monkeypatch, alteracao, mensagem):
+    monkeypatch.setattr(servidor_api, "_obter_pool", lambda: pytest.fail("pool não deveria ser usado"))
+    status, corpo = _chamar("POST", "/proposal.pdf", {**POSICAO, **alteracao})
+    assert status == 400
+    assert mensagem in json.loads(corpo)["erro"]
+
+
+def test_simulate_tipo_desconhecido_responde_400():
+    status, corpo = _chamar("POST", "/simulate", {**POSICAO, "tipo_investimento": "CDB XYZ"})
+    assert status == 400
+    assert "desconhecido" in json.loads(corpo)["erro"]
+
+
+@pytest.mark.parametrize("caminho, dados", [
+    ("/simulate", {**POSICAO, "cdi_historico": True}),
+    ("/simulate/batch", {"posicoes": [POSICAO, {**POSICAO, "cdi_historico": True}]}),
+    ("/proposal.pdf", {**POSICAO, "cdi_historico": True}),
+])
+def test_cdi_historico_sem_curva_responde_422(tmp_path, monkeypatch, caminho, dados):
+    import curva_cdi
+
+    monkeypatch.setenv("CDB_CURVA_CDI", str(tmp_path / "sem_curva.npy"))
+    curva_cdi.carregar_curva.cache_clear()
+    monkeypatch.setattr(servidor_api, "_obter_pool", lambda: pytest.fail("pool não deveria ser usado"))
+    status, corpo = _chamar("POST", caminho, dados)
+    assert status == 422
+    assert "curva do CDI" in json.loads(corpo)["erro"]